@@ -0,0 +1,232 @@
+"""
+Asyncio Interface for AWS Bedrock Integration
+Runs blocking Bedrock calls on a bounded worker pool so several AI calls
+can be gathered concurrently inside one Lambda invocation
+"""
+
+import os
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+import bedrock_integration
+from singleflight import singleflight
+
+# Maximum number of Bedrock calls in flight at once
+MAX_CONCURRENCY = int(os.environ.get('BEDROCK_MAX_CONCURRENCY', '8'))
+
+
+class AsyncBedrockClient:
+    """
+    Awaitable wrapper around the blocking boto3 Bedrock calls
+    Concurrency is bounded by a per-event-loop semaphore and a shared thread pool
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY):
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Lambda handlers typically call asyncio.run() per invocation, so each
+        # event loop gets its own semaphore
+        self._semaphores: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency,
+                        thread_name_prefix='bedrock'
+                    )
+        return self._executor
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking Bedrock function without blocking the event loop"""
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def invoke(self, prompt: str, **kwargs: Any) -> str:
+        """Awaitable equivalent of invoke_bedrock_model"""
+        return await self.run(bedrock_integration.invoke_bedrock_model, prompt, **kwargs)
+
+    async def stream(self, open_stream: Callable[[], Iterator[str]]) -> AsyncIterator[str]:
+        """
+        Consume a blocking text stream on the worker pool and yield its chunks
+        Use contextlib.aclosing() when breaking out early so the Bedrock stream
+        is closed immediately rather than at garbage collection
+        """
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            queue: asyncio.Queue = asyncio.Queue()
+            stopped = threading.Event()
+            done = object()
+
+            def produce() -> None:
+                stream = open_stream()
+                try:
+                    for chunk in stream:
+                        if stopped.is_set():
+                            break
+                        loop.call_soon_threadsafe(queue.put_nowait, chunk)
+                except Exception as e:
+                    loop.call_soon_threadsafe(queue.put_nowait, e)
+                finally:
+                    close = getattr(stream, 'close', None)
+                    if close:
+                        close()
+                    loop.call_soon_threadsafe(queue.put_nowait, done)
+
+            producer = loop.run_in_executor(self.executor, produce)
+            try:
+                while True:
+                    item = await queue.get()
+                    if item is done:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                stopped.set()
+                await producer
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+default_client = AsyncBedrockClient()
+
+
+async def invoke_bedrock_model_async(prompt: str, **kwargs: Any) -> str:
+    """Invoke the Bedrock model without blocking the event loop"""
+    return await default_client.invoke(prompt, **kwargs)
+
+
+def invoke_bedrock_model_stream_async(prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+    """Async iterator over text chunks of a streamed Bedrock completion"""
+    return default_client.stream(
+        lambda: bedrock_integration.invoke_bedrock_model_stream(prompt, **kwargs)
+    )
+
+
+def stream_resume_analysis_async(resume_text: str) -> AsyncIterator[str]:
+    """Async iterator variant of stream_resume_analysis"""
+    return default_client.stream(lambda: bedrock_integration.stream_resume_analysis(resume_text))
+
+
+def stream_career_roadmap_async(current_role: str, target_role: str, current_skills: List[str]) -> AsyncIterator[str]:
+    """Async iterator variant of stream_career_roadmap"""
+    return default_client.stream(
+        lambda: bedrock_integration.stream_career_roadmap(current_role, target_role, current_skills)
+    )
+
+
+async def get_job_recommendations_async(user_profile: Dict) -> List[Dict]:
+    """Awaitable variant of get_job_recommendations"""
+    return await default_client.run(bedrock_integration.get_job_recommendations, user_profile)
+
+
+async def calculate_job_score_async(user_id: str, job_id: str) -> int:
+    """Awaitable variant of calculate_job_score"""
+    return await default_client.run(bedrock_integration.calculate_job_score, user_id, job_id)
+
+
+async def score_jobs_batch_async(user_profile: Dict, jobs: List[Dict]) -> Dict[str, int]:
+    """
+    Awaitable variant of score_jobs_batch
+    Each batch of JOB_SCORE_BATCH_SIZE jobs is scored concurrently
+    """
+    size = bedrock_integration.JOB_SCORE_BATCH_SIZE
+    chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+    results = await asyncio.gather(*(
+        default_client.run(bedrock_integration.score_jobs_batch, user_profile, chunk) for chunk in chunks
+    ))
+    scores: Dict[str, int] = {}
+    for chunk_scores in results:
+        scores.update(chunk_scores)
+    return scores
+
+
+async def analyze_resume_async(resume_text: str, job_description: Optional[str] = None,
+                              keywords: Optional[List[str]] = None, role: Optional[str] = None) -> Dict:
+    """Awaitable variant of analyze_resume"""
+    return await default_client.run(bedrock_integration.analyze_resume, resume_text, job_description, keywords, role)
+
+
+async def tailor_resume_for_job_async(resume_text: str, job_description: str) -> Dict:
+    """Awaitable variant of tailor_resume_for_job"""
+    return await default_client.run(bedrock_integration.tailor_resume_for_job, resume_text, job_description)
+
+
+async def generate_career_roadmap_async(current_role: str, target_role: str, current_skills: List[str]) -> Dict:
+    """Awaitable variant of generate_career_roadmap"""
+    return await default_client.run(
+        bedrock_integration.generate_career_roadmap, current_role, target_role, current_skills
+    )
+
+
+async def _run_coalesced(func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a @coalesced Bedrock function, sharing one in-flight call between tasks
+    on this event loop before a worker thread is taken; the undecorated function
+    runs on the worker so the call is not coalesced (and counted) a second time
+    """
+    return await singleflight.do_async(
+        func.key_for(*args, **kwargs),
+        lambda: default_client.run(func.__wrapped__, *args, **kwargs),
+        func.function_name
+    )
+
+
+async def get_market_insights_async(role: str, location: str) -> Dict:
+    """Awaitable variant of get_market_insights"""
+    return await _run_coalesced(bedrock_integration.get_market_insights, role, location)
+
+
+async def generate_interview_questions_async(job_description: str) -> List[str]:
+    """Awaitable variant of generate_interview_questions"""
+    return await default_client.run(bedrock_integration.generate_interview_questions, job_description)
+
+
+async def get_salary_trends_async(role: str, location: str) -> Dict:
+    """Awaitable variant of get_salary_trends"""
+    return await _run_coalesced(bedrock_integration.get_salary_trends, role, location)
+
+
+async def get_skill_demand_forecast_async(skills: List[str]) -> List[Dict]:
+    """Awaitable variant of get_skill_demand_forecast"""
+    return await _run_coalesced(bedrock_integration.get_skill_demand_forecast, skills)
+
+
+async def analyze_email_for_interview_async(email_content: str, prefilter: bool = True) -> Dict:
+    """Awaitable variant of analyze_email_for_interview"""
+    return await default_client.run(bedrock_integration.analyze_email_for_interview, email_content, prefilter)
+
+
+def gather_ai_calls(**calls: Any) -> Dict[str, Any]:
+    """
+    Run several awaitable AI calls concurrently from synchronous code
+    Returns a dict mapping each keyword to its result, e.g.
+    gather_ai_calls(trends=get_salary_trends_async(role, loc), insights=get_market_insights_async(role, loc))
+    """
+    async def _gather() -> Dict[str, Any]:
+        results = await asyncio.gather(*calls.values())
+        return dict(zip(calls.keys(), results))
+
+    return asyncio.run(_gather())
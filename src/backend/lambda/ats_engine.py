@@ -0,0 +1,294 @@
+"""
+Local ATS Keyword-Match Engine
+Deterministic keyword coverage, section presence and formatting signals for
+resumes against a job description or a role keyword set. Scores for many
+resumes are computed together as arrays; the LLM is only asked for the
+qualitative part of an analysis (see bedrock_integration.assess_resume).
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from job_ranker import tokenize
+from prompt_compression import split_sections, RESUME, JOB
+
+# Score composition when a keyword target is available, and when it is not
+KEYWORD_WEIGHT = 0.5
+SECTION_WEIGHT = 0.25
+FORMAT_WEIGHT = 0.25
+
+# Upper bound on keywords taken from a job description
+MAX_KEYWORDS = 25
+
+# Longest keyword phrase matched, in tokens
+MAX_PHRASE_TOKENS = 3
+
+# Expected resume sections and their share of the section score
+SECTION_WEIGHTS = {'experience': 0.4, 'skills': 0.3, 'education': 0.2, 'summary': 0.1}
+
+# Formatting signals and their share of the format score
+FORMAT_WEIGHTS = {
+    'hasEmail': 0.15,
+    'hasPhone': 0.10,
+    'usesBullets': 0.15,
+    'quantifiedAchievements': 0.20,
+    'reasonableLength': 0.15,
+    'noTables': 0.10,
+    'hasDates': 0.10,
+    'plainCharacters': 0.05,
+}
+
+# Keyword weight of job-description terms by section; 0 ignores the section
+JOB_SECTION_WEIGHTS = {
+    'requirements': 2.0, 'preferred': 1.5, 'responsibilities': 1.0, 'role': 1.0, 'header': 1.0,
+    'about': 0.0, 'benefits': 0.0, 'eeo': 0.0, 'apply': 0.0,
+}
+
+# Keyword sets for common target roles, used when no job description is given
+ROLE_KEYWORDS = {
+    'software engineer': ['python', 'java', 'javascript', 'sql', 'git', 'rest api', 'microservices', 'aws',
+                          'docker', 'unit testing', 'ci/cd', 'agile', 'system design', 'algorithms'],
+    'frontend engineer': ['javascript', 'typescript', 'react', 'html', 'css', 'redux', 'webpack',
+                          'accessibility', 'responsive design', 'jest', 'rest api', 'git'],
+    'backend engineer': ['python', 'java', 'go', 'sql', 'postgresql', 'rest api', 'microservices', 'aws',
+                         'docker', 'kubernetes', 'redis', 'kafka', 'unit testing', 'ci/cd'],
+    'data engineer': ['python', 'sql', 'spark', 'airflow', 'kafka', 'aws', 'etl', 'data modeling',
+                      'data warehouse', 'snowflake', 'dbt', 'scala', 'data pipelines'],
+    'data scientist': ['python', 'r', 'sql', 'machine learning', 'statistics', 'pandas', 'scikit-learn',
+                       'a/b testing', 'deep learning', 'tensorflow', 'pytorch', 'data visualization'],
+    'machine learning engineer': ['python', 'machine learning', 'deep learning', 'pytorch', 'tensorflow',
+                                  'mlops', 'kubernetes', 'aws', 'model deployment', 'feature engineering',
+                                  'sql', 'docker'],
+    'devops engineer': ['aws', 'terraform', 'kubernetes', 'docker', 'ci/cd', 'linux', 'python', 'bash',
+                        'monitoring', 'ansible', 'jenkins', 'infrastructure as code'],
+    'product manager': ['roadmap', 'stakeholder management', 'user research', 'agile', 'a/b testing',
+                        'metrics', 'sql', 'product strategy', 'requirements', 'go-to-market', 'jira'],
+}
+
+# Frequent job-description words that say nothing about fit
+GENERIC_TERMS = frozenset([
+    'experience', 'years', 'year', 'team', 'teams', 'ability', 'strong', 'skills', 'work', 'working',
+    'knowledge', 'including', 'new', 'using', 'role', 'join', 'help', 'build', 'across', 'other', 'who',
+    'what', 'more', 'all', 'can', 'not', 'this', 'that', 'their', 'they', 'them', 'us', 'is', 'must',
+    'should', 'plus', 'preferred', 'required', 'requirements', 'responsibilities', 'excellent', 'good',
+    'great', 'environment', 'company', 'candidate', 'candidates', 'opportunity', 'position', 'job',
+    'about', 'within', 'well', 'such', 'etc', 'e.g', 'i.e', 'like', 'related', 'equivalent', 'degree',
+    'bachelor', "bachelor's", 'field', 'least', 'minimum', 'similar', 'highly', 'communication',
+    'senior', 'junior', 'lead', 'staff', 'principal', 'ii', 'iii',
+])
+
+_EMAIL = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+')
+_PHONE = re.compile(r'(\+?\d[\d\s().-]{7,}\d)')
+_BULLET_LINE = re.compile('^\\s*[-*\u2022\u25aa\u25cf\u2023\u2043]\\s+')
+_QUANTIFIED = re.compile('\\d+(\\.\\d+)?\\s*(%|percent|x\\b|k\\b|m\\b)|[$\u00a3\u20ac]\\s?\\d')
+_YEAR = re.compile(r'\b(19|20)\d{2}\b')
+_TABLE_LINE = re.compile(r'\t|\s\|\s|\|.*\|')
+
+
+def _phrase(keyword: str) -> Tuple[str, ...]:
+    return tuple(tokenize(keyword))
+
+
+def _ngrams(tokens: List[str]) -> set:
+    grams = set()
+    for n in range(1, MAX_PHRASE_TOKENS + 1):
+        grams.update(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return grams
+
+
+def role_keywords(role: Optional[str]) -> List[str]:
+    """Keyword set for the closest known role (longest name contained in the role), or []"""
+    folded = ' '.join(tokenize(role or ''))
+    matches = [name for name in ROLE_KEYWORDS if name in folded]
+    return list(ROLE_KEYWORDS[max(matches, key=len)]) if matches else []
+
+
+def extract_keywords(job_description: str, limit: int = MAX_KEYWORDS) -> List[Tuple[str, float]]:
+    """
+    Weighted keywords of a job description: known multi-word skills found in the
+    text, then single terms ranked by section-weighted frequency
+    """
+    known_phrases = {_phrase(k) for keywords in ROLE_KEYWORDS.values() for k in keywords}
+    scores: Dict[Tuple[str, ...], float] = {}
+    for section, _, lines in split_sections(job_description or '', JOB):
+        weight = JOB_SECTION_WEIGHTS.get(section, 1.0)
+        if weight <= 0:
+            continue
+        for line in lines:
+            tokens = tokenize(line)
+            for gram in _ngrams(tokens):
+                if len(gram) > 1 and gram not in known_phrases:
+                    continue
+                word = gram[0]
+                if len(gram) == 1 and (word in GENERIC_TERMS or len(word) < 2 or not any(c.isalpha() for c in word)):
+                    if gram not in known_phrases:
+                        continue
+                scores[gram] = scores.get(gram, 0.0) + weight
+
+    # Words of a matched phrase should not also count on their own
+    for gram in [g for g in scores if len(g) > 1]:
+        for word in gram:
+            scores.pop((word,), None)
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [(' '.join(gram), score) for gram, score in ranked]
+
+
+class KeywordTarget:
+    """
+    Compiled keyword set: phrase tuples, their weights and a reverse index
+    from n-gram to keyword column
+    """
+
+    def __init__(self, keywords: Sequence[Any]):
+        self.names: List[str] = []
+        weights: List[float] = []
+        self._columns: Dict[Tuple[str, ...], int] = {}
+        for keyword in keywords:
+            name, weight = keyword if isinstance(keyword, tuple) else (keyword, 1.0)
+            phrase = _phrase(str(name))
+            if not phrase or phrase in self._columns or len(phrase) > MAX_PHRASE_TOKENS:
+                continue
+            self._columns[phrase] = len(self.names)
+            self.names.append(' '.join(str(name).lower().split()))
+            weights.append(float(weight))
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def presence(self, token_lists: List[List[str]]) -> np.ndarray:
+        """Boolean (resumes x keywords) matrix of keyword occurrence"""
+        matrix = np.zeros((len(token_lists), len(self.names)), dtype=bool)
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, tokens in enumerate(token_lists):
+            for gram in _ngrams(tokens):
+                col = self._columns.get(gram)
+                if col is not None:
+                    rows.append(row)
+                    cols.append(col)
+        if rows:
+            matrix[np.asarray(rows), np.asarray(cols)] = True
+        return matrix
+
+
+def _section_matrix(texts: List[str]) -> np.ndarray:
+    names = list(SECTION_WEIGHTS)
+    matrix = np.zeros((len(texts), len(names)), dtype=bool)
+    for row, text in enumerate(texts):
+        present = {section for section, _, _ in split_sections(text, RESUME)}
+        matrix[row] = [name in present for name in names]
+    return matrix
+
+
+def _format_matrix(texts: List[str]) -> np.ndarray:
+    """(resumes x FORMAT_WEIGHTS) boolean signal matrix"""
+    matrix = np.zeros((len(texts), len(FORMAT_WEIGHTS)), dtype=bool)
+    for row, text in enumerate(texts):
+        lines = [line for line in text.splitlines() if line.strip()]
+        words = len(text.split())
+        non_ascii = sum(1 for ch in text if ord(ch) > 127)
+        signals = {
+            'hasEmail': bool(_EMAIL.search(text)),
+            'hasPhone': bool(_PHONE.search(text)),
+            'usesBullets': sum(1 for line in lines if _BULLET_LINE.match(line)) >= 3,
+            'quantifiedAchievements': sum(1 for line in lines if _QUANTIFIED.search(line)) >= 2,
+            'reasonableLength': 250 <= words <= 1200,
+            'noTables': not lines or sum(1 for line in lines if _TABLE_LINE.search(line)) / len(lines) < 0.1,
+            'hasDates': bool(_YEAR.search(text)),
+            'plainCharacters': not text or non_ascii / len(text) < 0.03,
+        }
+        matrix[row] = [signals[name] for name in FORMAT_WEIGHTS]
+    return matrix
+
+
+def score_resumes(resumes: List[str], keywords: Optional[Sequence[Any]] = None) -> List[Dict[str, Any]]:
+    """
+    ATS scores for many resumes against one keyword target
+    keywords: names or (name, weight) pairs; None or empty scores sections and
+    formatting only (keywordMatch is then None)
+    """
+    texts = [text or '' for text in resumes]
+    target = KeywordTarget(keywords or [])
+    sections = _section_matrix(texts)
+    formatting = _format_matrix(texts)
+
+    section_scores = sections @ np.asarray(list(SECTION_WEIGHTS.values()))
+    format_scores = formatting @ np.asarray(list(FORMAT_WEIGHTS.values()))
+    if len(target):
+        presence = target.presence([tokenize(text) for text in texts])
+        keyword_scores = presence @ target.weights / target.weights.sum()
+        ats = KEYWORD_WEIGHT * keyword_scores + SECTION_WEIGHT * section_scores + FORMAT_WEIGHT * format_scores
+    else:
+        presence = np.zeros((len(texts), 0), dtype=bool)
+        keyword_scores = None
+        ats = 0.5 * section_scores + 0.5 * format_scores
+
+    def percent(values: np.ndarray) -> np.ndarray:
+        return np.clip(np.round(values * 100), 0, 100).astype(int)
+
+    ats_pct, section_pct, format_pct = percent(ats), percent(section_scores), percent(format_scores)
+    keyword_pct = percent(keyword_scores) if keyword_scores is not None else None
+    section_names = list(SECTION_WEIGHTS)
+    format_names = list(FORMAT_WEIGHTS)
+    names = np.asarray(target.names, dtype=object)
+
+    results = []
+    for row in range(len(texts)):
+        results.append({
+            'atsScore': int(ats_pct[row]),
+            'keywordMatch': int(keyword_pct[row]) if keyword_pct is not None else None,
+            'formatScore': int(format_pct[row]),
+            'sectionScore': int(section_pct[row]),
+            'matchedKeywords': names[presence[row]].tolist(),
+            'missingKeywords': names[~presence[row]].tolist(),
+            'sections': [name for name, present in zip(section_names, sections[row]) if present],
+            'formatting': {name: bool(value) for name, value in zip(format_names, formatting[row])},
+        })
+    return results
+
+
+def _explicit_keywords(keywords: Any) -> List[Any]:
+    if isinstance(keywords, str):
+        return [name.strip() for name in keywords.split(',') if name.strip()]
+    if not isinstance(keywords, (list, tuple)):
+        return []
+    out: List[Any] = []
+    for keyword in keywords:
+        if isinstance(keyword, str):
+            out.append(keyword)
+        elif (isinstance(keyword, (list, tuple)) and len(keyword) == 2 and isinstance(keyword[0], str)
+              and isinstance(keyword[1], (int, float)) and not isinstance(keyword[1], bool)):
+            out.append((keyword[0], float(keyword[1])))
+    return out
+
+
+def resolve_keywords(job_description: Optional[str] = None, keywords: Optional[Sequence[Any]] = None,
+                     role: Optional[str] = None) -> List[Any]:
+    """
+    Keyword target from explicit keywords, else a job description, else a role keyword set
+    keywords may be a comma-separated string or a list of names and [name, weight]
+    pairs; other values and malformed items are ignored
+    """
+    keywords = _explicit_keywords(keywords)
+    if keywords:
+        return keywords
+    if job_description:
+        return extract_keywords(job_description)
+    return role_keywords(role)
+
+
+def score_resume(resume_text: str, job_description: Optional[str] = None,
+                 keywords: Optional[Sequence[Any]] = None, role: Optional[str] = None) -> Dict[str, Any]:
+    """ATS scores for one resume"""
+    return score_resumes([resume_text], resolve_keywords(job_description, keywords, role))[0]
+
+
+def merge_analysis(local: Dict[str, Any], qualitative: Dict[str, Any]) -> Dict[str, Any]:
+    """Local scores plus the model's qualitative fields; local scores win on overlap"""
+    merged = {key: value for key, value in (qualitative or {}).items() if key not in local}
+    merged.update(local)
+    return merged
@@ -0,0 +1,220 @@
+"""
+Shared AWS Client Registry
+Creates boto3 clients and resources lazily on first use, once per
+(service, region), and shares them between index.py and bedrock_integration.py.
+Every client is built from one botocore configuration read from the environment
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger()
+
+# Region configuration
+DEFAULT_REGION = os.environ.get('AWS_REGION') or os.environ.get('AWS_DEFAULT_REGION') or 'us-east-1'
+BEDROCK_REGION = os.environ.get('BEDROCK_REGION', DEFAULT_REGION)
+
+# Client configuration defaults; each can be overridden per service with the
+# service prefix, e.g. BEDROCK_READ_TIMEOUT or DYNAMODB_MAX_ATTEMPTS
+CLIENT_DEFAULTS = {
+    'MAX_POOL_CONNECTIONS': os.environ.get('AWS_MAX_POOL_CONNECTIONS', '50'),
+    'TCP_KEEPALIVE': os.environ.get('AWS_TCP_KEEPALIVE', 'true'),
+    'CONNECT_TIMEOUT': os.environ.get('AWS_CONNECT_TIMEOUT', '3'),
+    'READ_TIMEOUT': os.environ.get('AWS_READ_TIMEOUT', '30'),
+    'RETRY_MODE': os.environ.get('AWS_RETRY_MODE', 'standard'),
+    'MAX_ATTEMPTS': os.environ.get('AWS_MAX_ATTEMPTS', '3'),
+}
+
+# Long generations need a longer read timeout than table and bucket calls
+SERVICE_DEFAULTS = {
+    'bedrock-runtime': {'READ_TIMEOUT': '120'},
+}
+
+SERVICE_PREFIXES = {
+    'bedrock-runtime': 'BEDROCK',
+}
+
+# Log connection reuse stats every N invocations (0 disables)
+CONNECTION_STATS_INTERVAL = int(os.environ.get('AWS_CONNECTION_STATS_INTERVAL', '0'))
+
+_lock = threading.Lock()
+_session: Any = None
+_instances: Dict[Tuple[str, str, str], Any] = {}
+_creation_ms: Dict[Tuple[str, str, str], float] = {}
+
+
+def _get_session() -> Any:
+    # boto3 is imported here so requests that never touch AWS (e.g. CORS
+    # preflights) do not pay for importing it
+    global _session
+    if _session is None:
+        import boto3
+        _session = boto3.session.Session()
+    return _session
+
+
+def _service_setting(service: str, name: str) -> str:
+    prefix = SERVICE_PREFIXES.get(service, service.upper().replace('-', '_'))
+    override = os.environ.get(f"{prefix}_{name}")
+    if override is not None:
+        return override
+    return SERVICE_DEFAULTS.get(service, {}).get(name, CLIENT_DEFAULTS[name])
+
+
+def client_settings(service: str) -> Dict[str, Any]:
+    """Resolved connection settings for a service (environment overrides applied)"""
+    return {
+        'max_pool_connections': int(_service_setting(service, 'MAX_POOL_CONNECTIONS')),
+        'tcp_keepalive': _service_setting(service, 'TCP_KEEPALIVE').lower() == 'true',
+        'connect_timeout': float(_service_setting(service, 'CONNECT_TIMEOUT')),
+        'read_timeout': float(_service_setting(service, 'READ_TIMEOUT')),
+        'retries': {
+            'mode': _service_setting(service, 'RETRY_MODE'),
+            'max_attempts': int(_service_setting(service, 'MAX_ATTEMPTS'))
+        }
+    }
+
+
+def build_config(service: str) -> Any:
+    """botocore Config for a service"""
+    from botocore.config import Config
+    return Config(**client_settings(service))
+
+
+def _get(kind: str, service: str, region_name: Optional[str]) -> Any:
+    key = (kind, service, region_name or DEFAULT_REGION)
+    instance = _instances.get(key)
+    if instance is not None:
+        return instance
+
+    with _lock:
+        instance = _instances.get(key)
+        if instance is None:
+            start = time.perf_counter()
+            session = _get_session()
+            factory = session.client if kind == 'client' else session.resource
+            instance = factory(service, region_name=key[2], config=build_config(service))
+            _creation_ms[key] = (time.perf_counter() - start) * 1000
+            _instances[key] = instance
+    return instance
+
+
+def get_client(service: str, region_name: Optional[str] = None) -> Any:
+    """Shared boto3 client for a service and region, created on first use"""
+    return _get('client', service, region_name)
+
+
+def get_resource(service: str, region_name: Optional[str] = None) -> Any:
+    """Shared boto3 resource for a service and region, created on first use"""
+    return _get('resource', service, region_name)
+
+
+class LazyClient:
+    """
+    Module-level stand-in for a boto3 client that is only created when an
+    attribute (e.g. invoke_model) is first accessed
+    """
+
+    def __init__(self, service: str, region_name: Optional[str] = None):
+        self._service = service
+        self._region_name = region_name
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_client(self._service, self._region_name), name)
+
+    def __repr__(self) -> str:
+        return f"LazyClient({self._service!r}, region_name={self._region_name!r})"
+
+
+class LazyResource:
+    """
+    Module-level stand-in for a boto3 service resource that is only created
+    when an attribute (e.g. Table) is first accessed
+    """
+
+    def __init__(self, service: str, region_name: Optional[str] = None):
+        self._service = service
+        self._region_name = region_name
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_resource(self._service, self._region_name), name)
+
+    def __repr__(self) -> str:
+        return f"LazyResource({self._service!r}, region_name={self._region_name!r})"
+
+
+def creation_report() -> List[Dict[str, Any]]:
+    """Time spent creating each client/resource in this container, slowest first"""
+    report = [
+        {'kind': kind, 'service': service, 'region': region, 'ms': round(ms, 2)}
+        for (kind, service, region), ms in _creation_ms.items()
+    ]
+    return sorted(report, key=lambda entry: entry['ms'], reverse=True)
+
+
+def _pools(instance: Any) -> List[Any]:
+    client = getattr(getattr(instance, 'meta', None), 'client', instance)
+    try:
+        manager = client._endpoint.http_session._manager
+        container = manager.pools
+        with container.lock:
+            return list(container._container.values())
+    except AttributeError:
+        return []
+
+
+def _idle_connections(pool: Any) -> int:
+    # urllib3 pre-fills the pool queue with None placeholders
+    queue = getattr(getattr(pool, 'pool', None), 'queue', None)
+    return sum(1 for conn in list(queue) if conn is not None) if queue is not None else 0
+
+
+def connection_stats() -> List[Dict[str, Any]]:
+    """
+    Connection reuse per client, from its urllib3 pools
+    connectionsOpened counts new connections (each one a TCP + TLS handshake);
+    a reuseRate close to 1 means requests are riding on kept-alive connections
+    """
+    stats = []
+    for (kind, service, region), instance in list(_instances.items()):
+        pools = _pools(instance)
+        opened = sum(getattr(pool, 'num_connections', 0) for pool in pools)
+        requests = sum(getattr(pool, 'num_requests', 0) for pool in pools)
+        stats.append({
+            'kind': kind,
+            'service': service,
+            'region': region,
+            'hosts': len(pools),
+            'connectionsOpened': opened,
+            'requests': requests,
+            'idleConnections': sum(_idle_connections(pool) for pool in pools),
+            'reuseRate': round(1 - opened / requests, 4) if requests else None
+        })
+    return stats
+
+
+_invocations = 0
+
+
+def log_connection_stats(interval: int = CONNECTION_STATS_INTERVAL) -> None:
+    """Log connection reuse stats every `interval` invocations"""
+    global _invocations
+    if interval <= 0:
+        return
+    _invocations += 1
+    if _invocations % interval == 0:
+        logger.info(f"AWS connection stats after {_invocations} invocations: {json.dumps(connection_stats())}")
+
+
+def reset() -> None:
+    """Drop all cached clients (tests only)"""
+    global _session, _invocations
+    with _lock:
+        _invocations = 0
+        _instances.clear()
+        _creation_ms.clear()
+        _session = None
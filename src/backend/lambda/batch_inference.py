@@ -0,0 +1,416 @@
+"""
+Offline Batch Inference for Per-User Results
+Precomputes get_job_recommendations and generate_career_roadmap for active
+users: builds Bedrock batch-inference JSONL ({"recordId", "modelInput"} per
+line), runs it through a pluggable executor, parses the outputs and
+bulk-writes them onto the user items. Request handlers serve a stored result
+(see lookup) while its input hash still matches the prompt a live call would
+send, so profile edits fall back to live generation automatically.
+
+Run layout under a run URI (s3://bucket/prefix/<runId> or a local directory):
+    records.json     recordId -> [userId, function, inputHash]
+    input.jsonl      batch input, one record per line
+    output/          executor output (*.jsonl.out), Bedrock batch format
+    progress.json    completed stage, batch job ARN and lines written per output file
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import logging
+
+from aws_clients import get_client
+from dynamo_batch import plain_numbers, update_items
+from json_stream import extract_json
+from market_store import read_object, write_object
+import bedrock_integration
+
+logger = logging.getLogger()
+
+# Environment configuration
+MAX_AGE_SECONDS = int(float(os.environ.get('PRECOMPUTED_MAX_AGE_HOURS', '48')) * 3600)
+REFRESH_AFTER_SECONDS = int(float(os.environ.get('PRECOMPUTED_REFRESH_HOURS', '20')) * 3600)
+BATCH_ROLE_ARN = os.environ.get('BEDROCK_BATCH_ROLE_ARN', '')
+
+# Bedrock rejects batch jobs below this many records; smaller runs go on-demand
+BEDROCK_BATCH_MIN_RECORDS = 100
+
+# Records per local output part and per bulk-write step (the resume granularity)
+CHUNK_SIZE = 500
+
+RECORDS = 'records.json'
+INPUT = 'input.jsonl'
+OUTPUT_PREFIX = 'output'
+PROGRESS = 'progress.json'
+OUTPUT_SUFFIX = '.jsonl.out'
+
+# Stages in order; progress.json records the last one completed
+PREPARED = 'prepared'
+EXECUTED = 'executed'
+WRITTEN = 'written'
+
+
+def _roadmap_prompt(user: Dict) -> Optional[str]:
+    if not user.get('currentRole') or not user.get('targetRole'):
+        return None
+    return bedrock_integration.build_career_roadmap_prompt(
+        user['currentRole'], user['targetRole'], list(user.get('skills') or [])
+    )
+
+
+def _recommendations_prompt(user: Dict) -> Optional[str]:
+    if not user.get('skills') and not user.get('targetRole'):
+        return None
+    return bedrock_integration.build_job_recommendations_prompt(user)
+
+
+class BatchFunction(NamedTuple):
+    attribute: str
+    max_tokens: int
+    expect: str
+    prompt: Callable[[Dict], Optional[str]]
+
+
+# Functions that can be precomputed: user item attribute holding the stored
+# result, output ceiling, expected JSON kind and prompt builder from a user item
+FUNCTIONS: Dict[str, BatchFunction] = {
+    'get_job_recommendations': BatchFunction('precomputedRecommendations', 2000, 'array',
+                                             _recommendations_prompt),
+    'generate_career_roadmap': BatchFunction('precomputedRoadmap', 3000, 'object', _roadmap_prompt),
+}
+
+
+def input_hash(function_name: str, prompt: str) -> str:
+    """Identity of one generation: model, function, output ceiling and exact prompt"""
+    max_tokens = FUNCTIONS[function_name].max_tokens
+    data = f"{bedrock_integration.MODEL_ID}\n{function_name}\n{max_tokens}\n{prompt}"
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:32]
+
+
+class LookupStats:
+    """Request-time lookups by outcome (hit, miss, changed inputs, expired)"""
+
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, function_name: str, outcome: str) -> None:
+        with self._lock:
+            key = f"{function_name}.{outcome}"
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def report(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+lookup_stats = LookupStats()
+
+
+def lookup(user: Optional[Dict], function_name: str, prompt: str,
+           max_age_seconds: int = MAX_AGE_SECONDS) -> Optional[Any]:
+    """
+    Stored result for the prompt a live call would send, or None
+    Results are served only while their input hash matches and they are
+    younger than max_age_seconds
+    """
+    entry = (user or {}).get(FUNCTIONS[function_name].attribute)
+    if not entry or 'result' not in entry:
+        outcome = 'miss'
+    elif entry.get('inputHash') != input_hash(function_name, prompt):
+        outcome = 'changed'
+    elif time.time() - int(entry.get('generatedAt', 0)) > max_age_seconds:
+        outcome = 'expired'
+    else:
+        lookup_stats.record(function_name, 'hit')
+        return plain_numbers(entry['result'])
+    lookup_stats.record(function_name, outcome)
+    return None
+
+
+def iter_users(table: Any, active_since: Optional[str] = None, segment: int = 0,
+               total_segments: int = 1) -> Iterator[Dict]:
+    """
+    Scan the users table (one parallel-scan segment), optionally keeping only
+    users whose updatedAt is at or after active_since (ISO timestamp)
+    """
+    attributes = ['userId', 'skills', 'currentRole', 'targetRole', 'careerStage', 'preferences', 'updatedAt']
+    attributes += [fn.attribute for fn in FUNCTIONS.values()]
+    params: Dict[str, Any] = {
+        'ProjectionExpression': ', '.join(f"#a{i}" for i in range(len(attributes))),
+        'ExpressionAttributeNames': {f"#a{i}": name for i, name in enumerate(attributes)},
+    }
+    if total_segments > 1:
+        params.update(Segment=segment, TotalSegments=total_segments)
+    if active_since:
+        from boto3.dynamodb.conditions import Attr
+        params['FilterExpression'] = Attr('updatedAt').gte(active_since)
+    while True:
+        page = table.scan(**params)
+        yield from page.get('Items', [])
+        if 'LastEvaluatedKey' not in page:
+            return
+        params['ExclusiveStartKey'] = page['LastEvaluatedKey']
+
+
+def build_records(users: Iterable[Dict], function_names: Iterable[str] = tuple(FUNCTIONS),
+                  refresh_after_seconds: int = REFRESH_AFTER_SECONDS
+                  ) -> Tuple[Dict[str, List[str]], List[Dict], Dict[str, int]]:
+    """
+    Batch records for every user and function
+    Users without the inputs a function needs are skipped, as are stored
+    results whose inputs are unchanged and which are younger than
+    refresh_after_seconds. Returns (recordId -> [userId, function, inputHash],
+    JSONL records, counts)
+    """
+    function_names = list(function_names)
+    records: Dict[str, List[str]] = {}
+    lines: List[Dict] = []
+    counts = {'users': 0, 'records': 0, 'missingInputs': 0, 'fresh': 0}
+    now = time.time()
+    for user in users:
+        counts['users'] += 1
+        for function_name in function_names:
+            fn = FUNCTIONS[function_name]
+            prompt = fn.prompt(user)
+            if prompt is None:
+                counts['missingInputs'] += 1
+                continue
+            digest = input_hash(function_name, prompt)
+            stored = user.get(fn.attribute) or {}
+            if stored.get('inputHash') == digest and now - int(stored.get('generatedAt', 0)) < refresh_after_seconds:
+                counts['fresh'] += 1
+                continue
+            # Bedrock batch record IDs are 11 alphanumeric characters
+            record_id = f"R{len(lines):010d}"
+            tuned_prompt, _, stop_sequences = bedrock_integration.token_budget.apply(function_name, prompt,
+                                                                                     fn.max_tokens)
+            records[record_id] = [str(user['userId']), function_name, digest]
+            lines.append({
+                'recordId': record_id,
+                'modelInput': bedrock_integration.build_request_body(tuned_prompt, fn.max_tokens,
+                                                                     stop_sequences=stop_sequences)
+            })
+    counts['records'] = len(lines)
+    return records, lines, counts
+
+
+def _dump_jsonl(rows: Iterable[Dict]) -> bytes:
+    return ''.join(json.dumps(row, separators=(',', ':')) + '\n' for row in rows).encode('utf-8')
+
+
+def _load_jsonl(data: bytes) -> Iterator[Dict]:
+    for line in data.decode('utf-8').splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+
+def list_objects(uri: str, prefix: str) -> List[str]:
+    """Names (relative to uri) of objects under prefix, sorted"""
+    if uri.startswith('s3://'):
+        bucket, _, base = uri[len('s3://'):].partition('/')
+        base = base.strip('/')
+        full = f"{base}/{prefix}" if base else prefix
+        names = []
+        for page in get_client('s3').get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=full):
+            names.extend(obj['Key'][len(base) + 1 if base else 0:] for obj in page.get('Contents', []))
+        return sorted(names)
+    names = []
+    for root, _, files in os.walk(os.path.join(uri, prefix)):
+        names.extend(os.path.relpath(os.path.join(root, name), uri).replace(os.sep, '/') for name in files)
+    return sorted(names)
+
+
+def _write(uri: str, name: str, data: bytes) -> None:
+    if not uri.startswith('s3://'):
+        os.makedirs(os.path.dirname(os.path.join(uri, name)), exist_ok=True)
+    write_object(uri, name, data)
+
+
+def load_progress(uri: str) -> Dict[str, Any]:
+    try:
+        return json.loads(read_object(uri, PROGRESS))
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        if getattr(e, 'response', {}).get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+            return {}
+        raise
+
+
+def save_progress(uri: str, progress: Dict[str, Any]) -> None:
+    write_object(uri, PROGRESS, json.dumps(progress, separators=(',', ':')).encode('utf-8'))
+
+
+class LocalExecutor:
+    """
+    Runs batch records one by one on a thread pool
+    invoke maps a request body to a response body; the default is an on-demand
+    Bedrock call (for runs below BEDROCK_BATCH_MIN_RECORDS), tests pass a stub
+    model. Output is written in CHUNK_SIZE parts, so a rerun skips finished parts
+    """
+
+    def __init__(self, invoke: Optional[Callable[[Dict], Dict]] = None, concurrency: int = 8):
+        self.invoke = invoke
+        self.concurrency = concurrency
+
+    def _one(self, record: Dict) -> Dict:
+        invoke = self.invoke or (lambda body: bedrock_integration._invoke_model(body, 'batch_inference'))
+        try:
+            return {'recordId': record['recordId'], 'modelOutput': invoke(record['modelInput'])}
+        except Exception as e:
+            return {'recordId': record['recordId'], 'error': {'errorMessage': str(e)}}
+
+    def run(self, uri: str, progress: Dict[str, Any]) -> None:
+        records = list(_load_jsonl(read_object(uri, INPUT)))
+        done = set(list_objects(uri, OUTPUT_PREFIX))
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as pool:
+            for start in range(0, len(records), CHUNK_SIZE):
+                name = f"{OUTPUT_PREFIX}/part-{start // CHUNK_SIZE:05d}{OUTPUT_SUFFIX}"
+                if name in done:
+                    continue
+                _write(uri, name, _dump_jsonl(pool.map(self._one, records[start:start + CHUNK_SIZE])))
+
+
+class BedrockBatchExecutor:
+    """
+    Runs the input as a Bedrock batch inference job (model invocation job)
+    The run URI must be on S3; role_arn is the service role Bedrock assumes to
+    read the input and write the output. The job ARN is kept in progress, so a
+    rerun waits for the submitted job instead of starting another
+    """
+
+    TERMINAL = ('Completed', 'PartiallyCompleted', 'Failed', 'Stopped', 'Expired')
+
+    def __init__(self, role_arn: str = BATCH_ROLE_ARN, model_id: Optional[str] = None,
+                 poll_seconds: float = 60, timeout_hours: int = 24):
+        if not role_arn:
+            raise ValueError('A Bedrock batch service role ARN is required (BEDROCK_BATCH_ROLE_ARN)')
+        self.role_arn = role_arn
+        self.model_id = model_id or bedrock_integration.MODEL_ID
+        self.poll_seconds = poll_seconds
+        self.timeout_hours = timeout_hours
+
+    def run(self, uri: str, progress: Dict[str, Any]) -> None:
+        if not uri.startswith('s3://'):
+            raise ValueError('Bedrock batch jobs need an s3:// run URI')
+        bedrock = get_client('bedrock')
+        if not progress.get('jobArn'):
+            run_id = uri.rstrip('/').rsplit('/', 1)[-1]
+            progress['jobArn'] = bedrock.create_model_invocation_job(
+                jobName=f"career-agent-{run_id}"[:63],
+                roleArn=self.role_arn,
+                modelId=self.model_id,
+                inputDataConfig={'s3InputDataConfig': {'s3Uri': f"{uri}/{INPUT}", 's3InputFormat': 'JSONL'}},
+                outputDataConfig={'s3OutputDataConfig': {'s3Uri': f"{uri}/{OUTPUT_PREFIX}/"}},
+                timeoutDurationInHours=self.timeout_hours
+            )['jobArn']
+            save_progress(uri, progress)
+            logger.info(f"Submitted batch inference job {progress['jobArn']}")
+
+        while True:
+            job = bedrock.get_model_invocation_job(jobIdentifier=progress['jobArn'])
+            if job['status'] in self.TERMINAL:
+                break
+            time.sleep(self.poll_seconds)
+        if job['status'] not in ('Completed', 'PartiallyCompleted'):
+            raise RuntimeError(f"Batch inference job {job['status']}: {job.get('message', '')}")
+
+
+def output_names(uri: str) -> List[str]:
+    """Executor output files of a run (Bedrock adds a manifest.json.out, which is skipped)"""
+    return [name for name in list_objects(uri, OUTPUT_PREFIX) if name.endswith(OUTPUT_SUFFIX)]
+
+
+def parse_output(row: Dict, function_name: str) -> Optional[Any]:
+    """JSON result from one output record, or None if it failed or did not parse"""
+    if row.get('error') or not row.get('modelOutput'):
+        return None
+    text = ''.join(block.get('text', '') for block in row['modelOutput'].get('content', [])
+                   if block.get('type', 'text') == 'text')
+    return extract_json(text, expect=FUNCTIONS[function_name].expect)
+
+
+def update_request(user_id: str, function_name: str, digest: str, result: Any, run_id: str) -> Dict:
+    """UpdateItem arguments storing one result on an existing user item"""
+    return {
+        'Key': {'userId': user_id},
+        'UpdateExpression': 'SET #attr = :value',
+        'ConditionExpression': 'attribute_exists(userId)',
+        'ExpressionAttributeNames': {'#attr': FUNCTIONS[function_name].attribute},
+        'ExpressionAttributeValues': {':value': {
+            # DynamoDB needs Decimal rather than float for numbers
+            'result': json.loads(json.dumps(result), parse_float=Decimal),
+            'inputHash': digest,
+            'generatedAt': int(time.time()),
+            'runId': run_id
+        }}
+    }
+
+
+def run_batch(uri: str, users: Optional[Iterable[Dict]], executor: Any, client: Any, table_name: str,
+              function_names: Iterable[str] = tuple(FUNCTIONS),
+              refresh_after_seconds: int = REFRESH_AFTER_SECONDS) -> Dict[str, Any]:
+    """
+    Prepare, execute and write one run, resuming from progress.json
+    users is only consumed when the run has not been prepared yet. client is
+    the low-level DynamoDB client used for the bulk UpdateItem writes. Returns
+    run counts
+    """
+    progress = load_progress(uri)
+    counts = progress.setdefault('counts', {})
+    run_id = uri.rstrip('/').rsplit('/', 1)[-1]
+
+    if not progress.get('stage'):
+        records, lines, build_counts = build_records(users or [], function_names, refresh_after_seconds)
+        write_object(uri, RECORDS, json.dumps(records, separators=(',', ':')).encode('utf-8'))
+        write_object(uri, INPUT, _dump_jsonl(lines))
+        counts.update(build_counts)
+        progress['stage'] = PREPARED
+        save_progress(uri, progress)
+        logger.info(f"Prepared batch run {run_id}: {json.dumps(build_counts)}")
+
+    if progress['stage'] == PREPARED:
+        if counts.get('records'):
+            executor.run(uri, progress)
+        progress['stage'] = EXECUTED
+        save_progress(uri, progress)
+
+    if progress['stage'] == EXECUTED:
+        records = json.loads(read_object(uri, RECORDS))
+        written = progress.setdefault('linesWritten', {})
+        for name in output_names(uri):
+            rows = list(_load_jsonl(read_object(uri, name)))
+            for start in range(written.get(name, 0), len(rows), CHUNK_SIZE):
+                requests = []
+                for row in rows[start:start + CHUNK_SIZE]:
+                    meta = records.get(row.get('recordId'))
+                    if not meta:
+                        continue
+                    user_id, function_name, digest = meta
+                    result = parse_output(row, function_name)
+                    if result is None:
+                        counts['failed'] = counts.get('failed', 0) + 1
+                        continue
+                    requests.append(update_request(user_id, function_name, digest, result, run_id))
+                for error in update_items(client, table_name, requests):
+                    outcome = 'written' if error is None else (
+                        'userDeleted' if error == 'ConditionalCheckFailed' else 'writeErrors')
+                    counts[outcome] = counts.get(outcome, 0) + 1
+                # Saved per chunk so an interrupted write resumes after the last finished chunk
+                written[name] = min(len(rows), start + CHUNK_SIZE)
+                save_progress(uri, progress)
+        progress['stage'] = WRITTEN
+        save_progress(uri, progress)
+        logger.info(f"Batch run {run_id} written: {json.dumps(counts)}")
+
+    return dict(counts, stage=progress['stage'])
@@ -4,58 +4,220 @@ Uses Claude 3.5 Haiku for intelligent analysis and recommendations
 """
 
 import json
-import boto3
-from typing import Dict, List, Any
+import os
+import re
+import copy
+import time
+from typing import Dict, List, Any, Iterator, Optional
 import logging
 
+from aws_clients import LazyClient, BEDROCK_REGION
+from response_cache import response_cache, make_cache_key, ttl_for
+from json_stream import extract_json, iter_json_items, collect_json
+from token_budget import token_budget, JSON_END_MARKER
+from resilience import bedrock_caller, bedrock_breaker, is_failure
+from singleflight import coalesced
+from prompt_compression import compress, terms, RESUME, JOB
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize Bedrock Runtime client
-bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-east-1')
+# Bedrock Runtime client, created on first use (shared via aws_clients)
+bedrock_runtime = LazyClient('bedrock-runtime', region_name=BEDROCK_REGION)
 
 # Model ID for Claude 3.5 Haiku
 MODEL_ID = "anthropic.claude-3-5-haiku-20241022-v1:0"
 
+# Default sampling parameters
+TEMPERATURE = 0.7
+TOP_P = 0.9
+
+# Number of jobs packed into a single batch scoring prompt
+JOB_SCORE_BATCH_SIZE = int(os.environ.get('JOB_SCORE_BATCH_SIZE', '40'))
+
+
+def build_request_body(prompt: str, max_tokens: int, temperature: float = TEMPERATURE,
+                       top_p: float = TOP_P, stop_sequences: Optional[List[str]] = None) -> Dict:
+    """
+    Build the Anthropic messages request body for a single-turn prompt
+    """
+    request_body = {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": max_tokens,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "temperature": temperature,
+        "top_p": top_p
+    }
+    if stop_sequences:
+        request_body["stop_sequences"] = stop_sequences
+    return request_body
+
 
-def invoke_bedrock_model(prompt: str, max_tokens: int = 2000) -> str:
+def _invoke_model(request_body: Dict, function_name: Optional[str] = None) -> Dict:
     """
-    Invoke AWS Bedrock Claude model with a prompt
+    Send one invoke_model request and return the parsed response body
+    Runs behind the Bedrock circuit breaker and may be hedged (see resilience.py)
     """
-    try:
-        request_body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": max_tokens,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.7,
-            "top_p": 0.9
-        }
-        
+    body = json.dumps(request_body)
+
+    def attempt() -> Dict:
         response = bedrock_runtime.invoke_model(
             modelId=MODEL_ID,
             contentType="application/json",
             accept="application/json",
-            body=json.dumps(request_body)
+            body=body
+        )
+        return json.loads(response['body'].read())
+
+    return bedrock_caller.call(function_name, attempt)
+
+
+def _record_usage(function_name: Optional[str], response_body: Dict) -> None:
+    """Feed the usage block of a response into the token budget tracker"""
+    usage = response_body.get('usage') or {}
+    token_budget.record(function_name, usage.get('output_tokens'), response_body.get('stop_reason'))
+
+
+def _has_number(text: str) -> bool:
+    return re.search(r'\d', text) is not None
+
+
+def _has_json(text: str) -> bool:
+    return extract_json(text) is not None
+
+
+# How a cacheable function's response is checked before it is cached; functions
+# not listed must return JSON
+RESPONSE_VALIDATORS = {
+    'calculate_job_score': _has_number,
+}
+
+
+def invoke_bedrock_model(prompt: str, max_tokens: int = 2000, temperature: float = TEMPERATURE,
+                         top_p: float = TOP_P, function_name: Optional[str] = None,
+                         use_cache: bool = True) -> str:
+    """
+    Invoke AWS Bedrock Claude model with a prompt
+    Responses are served from the response cache when function_name has a cache TTL
+    (use_cache=False for callers that cache parsed results themselves); only
+    complete responses that pass the function's RESPONSE_VALIDATORS check
+    (JSON by default) are stored.
+    max_tokens is the ceiling; the request uses the function's adaptive token budget
+    and stop sequences from token_budget.
+    """
+    ttl = ttl_for(function_name) if use_cache else 0
+    cache_key = None
+    if ttl > 0:
+        cache_key = make_cache_key(MODEL_ID, prompt, max_tokens, temperature, top_p)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    tuned_prompt, budget, stop_sequences = token_budget.apply(function_name, prompt, max_tokens)
+    
+    try:
+        response_body = _invoke_model(
+            build_request_body(tuned_prompt, budget, temperature, top_p, stop_sequences),
+            function_name
         )
+        _record_usage(function_name, response_body)
         
-        response_body = json.loads(response['body'].read())
-        return response_body['content'][0]['text']
+        if response_body.get('stop_reason') == 'max_tokens' and budget < max_tokens:
+            # The adaptive budget was too tight for this request; retry once at the ceiling
+            logger.warning(f"{function_name} truncated at adaptive budget {budget}, retrying with {max_tokens}")
+            token_budget.record_retry(function_name)
+            response_body = _invoke_model(
+                build_request_body(tuned_prompt, max_tokens, temperature, top_p, stop_sequences),
+                function_name
+            )
+            _record_usage(function_name, response_body)
+        
+        text = response_body['content'][0]['text'].split(JSON_END_MARKER)[0]
         
     except Exception as e:
         logger.error(f"Error invoking Bedrock model: {str(e)}", exc_info=True)
         raise
+    
+    # Only complete responses that parse are cached; a truncated or malformed
+    # one is returned to this caller (which falls back) but not replayed
+    if cache_key:
+        if response_body.get('stop_reason') == 'max_tokens':
+            logger.warning(f"{function_name} response truncated at {max_tokens} tokens, not cached")
+        elif not RESPONSE_VALIDATORS.get(function_name, _has_json)(text):
+            logger.warning(f"{function_name} response is not in the expected format, not cached")
+        else:
+            response_cache.set(cache_key, text, ttl)
+    return text
 
 
-def get_job_recommendations(user_profile: Dict) -> List[Dict]:
+def invoke_bedrock_model_stream(prompt: str, max_tokens: int = 2000, temperature: float = TEMPERATURE,
+                                top_p: float = TOP_P, function_name: Optional[str] = None) -> Iterator[str]:
     """
-    Get AI-powered job recommendations based on user profile
+    Stream a completion from AWS Bedrock, yielding text deltas as they arrive
+    Closing the generator early closes the underlying event stream
     """
-    prompt = f"""
+    start = time.perf_counter()
+    first_token_logged = False
+    tuned_prompt, budget, stop_sequences = token_budget.apply(function_name, prompt, max_tokens)
+    
+    # Streams are not hedged, but they share the circuit breaker with invoke_model
+    bedrock_breaker.before_call()
+    try:
+        response = bedrock_runtime.invoke_model_with_response_stream(
+            modelId=MODEL_ID,
+            contentType="application/json",
+            accept="application/json",
+            body=json.dumps(build_request_body(tuned_prompt, budget, temperature, top_p, stop_sequences))
+        )
+    except Exception as e:
+        if is_failure(e):
+            bedrock_breaker.record_failure()
+        logger.error(f"Error invoking Bedrock model stream: {str(e)}", exc_info=True)
+        raise
+    bedrock_breaker.record_success()
+    
+    stream = response['body']
+    try:
+        for event in stream:
+            if 'chunk' not in event:
+                # Modeled stream errors arrive as events, e.g. throttlingException
+                error_name, error = next(iter(event.items()))
+                bedrock_breaker.record_failure()
+                raise RuntimeError(f"Bedrock stream error {error_name}: {error.get('message', error)}")
+            
+            payload = json.loads(event['chunk']['bytes'])
+            if payload.get('type') == 'message_delta':
+                # Final usage and stop reason for the streamed message
+                token_budget.record(
+                    function_name,
+                    payload.get('usage', {}).get('output_tokens'),
+                    payload.get('delta', {}).get('stop_reason')
+                )
+            if payload.get('type') != 'content_block_delta':
+                continue
+            
+            text = payload.get('delta', {}).get('text')
+            if not text:
+                continue
+            
+            if not first_token_logged:
+                logger.info(f"Bedrock stream first token after {(time.perf_counter() - start) * 1000:.0f}ms")
+                first_token_logged = True
+            yield text
+    finally:
+        close = getattr(stream, 'close', None)
+        if close:
+            close()
+
+
+def build_job_recommendations_prompt(user_profile: Dict) -> str:
+    """Build the get_job_recommendations prompt"""
+    return f"""
     You are an expert career advisor. Based on the following user profile, recommend suitable jobs:
     
     User Profile:
@@ -69,15 +231,21 @@ def get_job_recommendations(user_profile: Dict) -> List[Dict]:
     Provide a JSON array of 5 recommended job titles with brief descriptions.
     Format: [{{"title": "...", "description": "...", "match_score": 0-100}}]
     """
+
+
+def get_job_recommendations(user_profile: Dict) -> List[Dict]:
+    """
+    Get AI-powered job recommendations based on user profile
+    """
+    prompt = build_job_recommendations_prompt(user_profile)
     
     try:
-        response = invoke_bedrock_model(prompt)
+        response = invoke_bedrock_model(prompt, function_name='get_job_recommendations')
         # Parse JSON from response
-        start = response.find('[')
-        end = response.rfind(']') + 1
-        if start != -1 and end > start:
-            jobs_data = json.loads(response[start:end])
+        jobs_data = extract_json(response, expect='array')
+        if jobs_data is not None:
             return jobs_data
+        logger.warning("No JSON array found in get_job_recommendations output, using fallback")
         return []
     except Exception as e:
         logger.error(f"Error getting job recommendations: {str(e)}")
@@ -102,7 +270,7 @@ def calculate_job_score(user_id: str, job_id: str) -> int:
     """
     
     try:
-        response = invoke_bedrock_model(prompt, max_tokens=50)
+        response = invoke_bedrock_model(prompt, max_tokens=50, function_name='calculate_job_score')
         # Extract number from response
         score = int(''.join(filter(str.isdigit, response)))
         return min(100, max(0, score))
@@ -111,24 +279,99 @@ def calculate_job_score(user_id: str, job_id: str) -> int:
         return 0
 
 
-def analyze_resume(resume_text: str) -> Dict:
+def _describe_job(job: Dict) -> str:
+    """Render the job attributes used for scoring as one prompt line"""
+    skills = job.get('requiredSkills') or job.get('skills') or []
+    salary = job.get('salaryRange') or job.get('salary') or 'N/A'
+    return (
+        f"jobId: {job.get('jobId')} | Title: {job.get('title', 'N/A')} | "
+        f"Company: {job.get('company', 'N/A')} | Location: {job.get('location', 'N/A')} | "
+        f"Experience Level: {job.get('experienceLevel', 'N/A')} | Salary: {salary} | "
+        f"Skills: {', '.join(skills) if skills else 'N/A'}"
+    )
+
+
+def score_jobs_batch(user_profile: Dict, jobs: List[Dict]) -> Dict[str, int]:
     """
-    Analyze resume using AWS Bedrock AI
-    Returns strengths, weaknesses, suggestions, and ATS score
+    Calculate AI compatibility scores (0-100) for many jobs against one user profile
+    Packs up to JOB_SCORE_BATCH_SIZE jobs into each model call
+    Returns a dict mapping jobId to score; jobs the model did not score are omitted
     """
-    prompt = f"""
-    You are an expert resume reviewer and ATS (Applicant Tracking System) specialist.
-    Analyze the following resume and provide detailed feedback.
+    scores: Dict[str, int] = {}
+    
+    for start in range(0, len(jobs), JOB_SCORE_BATCH_SIZE):
+        chunk = jobs[start:start + JOB_SCORE_BATCH_SIZE]
+        job_lines = '\n'.join(f"    {i + 1}. {_describe_job(job)}" for i, job in enumerate(chunk))
+        
+        prompt = f"""
+    Calculate a job compatibility score (0-100) for each job below based on:
+    - Skills match: 40%
+    - Experience level: 30%
+    - Location preference: 15%
+    - Salary expectations: 15%
+    
+    Candidate Profile:
+    - Skills: {', '.join(user_profile.get('skills', []))}
+    - Current Role: {user_profile.get('currentRole', 'N/A')}
+    - Target Role: {user_profile.get('targetRole', 'N/A')}
+    - Career Stage: {user_profile.get('careerStage', 'N/A')}
+    - Preferred Locations: {', '.join(user_profile.get('preferences', {}).get('locations', []))}
+    - Salary Expectation: {user_profile.get('preferences', {}).get('salaryExpectation', 'N/A')}
+    
+    Jobs:
+{job_lines}
+    
+    Return only a JSON array with one entry per job:
+    [{{"jobId": "...", "score": <0-100>}}]
+    """
+        
+        try:
+            response = invoke_bedrock_model(
+                prompt,
+                max_tokens=30 * len(chunk) + 100,
+                function_name='score_jobs_batch'
+            )
+            entries = extract_json(response, expect='array')
+            if entries is None:
+                logger.warning("No JSON array found in score_jobs_batch output")
+                continue
+        except Exception as e:
+            logger.error(f"Error scoring job batch: {str(e)}")
+            continue
+        
+        # Entries are validated one by one so a malformed one only loses its own score
+        chunk_ids = {str(job.get('jobId')) for job in chunk}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            job_id = str(entry.get('jobId'))
+            if job_id not in chunk_ids:
+                continue
+            try:
+                scores[job_id] = min(100, max(0, int(float(str(entry.get('score')).strip().rstrip('%')))))
+            except (TypeError, ValueError, OverflowError):
+                logger.warning(f"Unusable score {entry.get('score')!r} for job {job_id}")
+    
+    return scores
+
+
+def build_resume_analysis_prompt(resume_text: str) -> str:
+    """
+    Build the analyze_resume prompt from the section-packed resume
+    Only the qualitative review is requested; keyword, section and format
+    scores come from ats_engine
+    """
+    resume = compress(resume_text, RESUME, 'analyze_resume').text
+    return f"""
+    You are an expert resume reviewer.
+    Review the content of the following resume and provide detailed feedback.
     
     Resume:
-    {resume_text}
+    {resume}
     
-    Provide your analysis in the following JSON format:
+    Provide your review in the following JSON format:
     {{
-        "atsScore": <number 0-100>,
-        "formatScore": <number 0-100>,
-        "contentScore": <number 0-100>,
-        "keywordMatch": <number 0-100>,
+        "contentScore": <number 0-100 for the strength of the content>,
         "strengths": [<list of 4-5 strengths>],
         "weaknesses": [<list of 4-5 weaknesses>],
         "suggestions": [<list of 5-7 specific improvement suggestions>]
@@ -136,46 +379,100 @@ def analyze_resume(resume_text: str) -> Dict:
     
     Be specific and actionable in your feedback.
     """
+
+
+# Placeholder results returned when the model output cannot be used; callers
+# that persist results (e.g. resume_dedup) must not store these
+RESUME_ANALYSIS_FALLBACK = {
+    "contentScore": 75,
+    "strengths": ["Clear structure", "Quantifiable achievements"],
+    "weaknesses": ["Could add more keywords", "Needs stronger action verbs"],
+    "suggestions": ["Add measurable outcomes", "Include relevant certifications"]
+}
+TAILOR_FALLBACK = {
+    "suggestions": ["Align experience with job requirements"],
+    "keywords_to_add": [],
+    "skills_to_highlight": []
+}
+TAILOR_ERROR_RESULT = {"suggestions": [], "keywords_to_add": [], "skills_to_highlight": []}
+MARKET_INSIGHTS_FALLBACK = {
+    "demandLevel": "high",
+    "averageSalary": 120000,
+    "growthTrend": "15%",
+    "topCompaniesHiring": [],
+    "inDemandSkills": [],
+    "insights": []
+}
+SALARY_TRENDS_FALLBACK = {
+    "currentAverage": 120000,
+    "range": {"min": 90000, "max": 160000},
+    "yearOverYearChange": "8.5%",
+    "experienceLevels": []
+}
+FALLBACK_RESULTS = (RESUME_ANALYSIS_FALLBACK, TAILOR_FALLBACK, TAILOR_ERROR_RESULT,
+                    MARKET_INSIGHTS_FALLBACK, SALARY_TRENDS_FALLBACK)
+
+
+def is_placeholder(result: Any) -> bool:
+    """True for empty results and the fallback placeholders above"""
+    return not result or result in FALLBACK_RESULTS
+
+
+def assess_resume(resume_text: str) -> Dict:
+    """
+    Qualitative resume review from AWS Bedrock
+    Returns contentScore, strengths, weaknesses and suggestions
+    """
+    prompt = build_resume_analysis_prompt(resume_text)
     
     try:
-        response = invoke_bedrock_model(prompt, max_tokens=3000)
+        response = invoke_bedrock_model(prompt, max_tokens=1500, function_name='analyze_resume')
         
         # Extract JSON from response
-        start = response.find('{')
-        end = response.rfind('}') + 1
-        if start != -1 and end > start:
-            analysis = json.loads(response[start:end])
-            return analysis
+        assessment = extract_json(response, expect='object')
+        if assessment is not None:
+            return assessment
         
         # Fallback response if JSON parsing fails
-        return {
-            "atsScore": 75,
-            "formatScore": 80,
-            "contentScore": 75,
-            "keywordMatch": 70,
-            "strengths": ["Clear structure", "Quantifiable achievements"],
-            "weaknesses": ["Could add more keywords", "Needs stronger action verbs"],
-            "suggestions": ["Add measurable outcomes", "Include relevant certifications"]
-        }
+        logger.warning("No JSON object found in analyze_resume output, using fallback")
+        return copy.deepcopy(RESUME_ANALYSIS_FALLBACK)
         
     except Exception as e:
         logger.error(f"Error analyzing resume: {str(e)}", exc_info=True)
         raise
 
 
+def analyze_resume(resume_text: str, job_description: Optional[str] = None,
+                   keywords: Optional[List[str]] = None, role: Optional[str] = None) -> Dict:
+    """
+    Analyze resume: deterministic ATS scores from ats_engine against the job
+    description, keywords or role keyword set, plus the model's qualitative review
+    Returns atsScore, keywordMatch, formatScore, contentScore, strengths,
+    weaknesses and suggestions
+    """
+    # Imported here: ats_engine loads NumPy, which the other calls don't need
+    import ats_engine
+    
+    local = ats_engine.score_resume(resume_text, job_description, keywords, role)
+    return ats_engine.merge_analysis(local, assess_resume(resume_text))
+
+
 def tailor_resume_for_job(resume_text: str, job_description: str) -> Dict:
     """
     Tailor resume for a specific job using AI
+    Resume lines that overlap the job description are kept first
     """
+    resume = compress(resume_text, RESUME, 'tailor_resume_for_job', focus=terms(job_description)).text
+    job = compress(job_description, JOB, 'tailor_resume_for_job').text
     prompt = f"""
     You are a resume optimization expert. Given the resume and job description below,
     provide specific suggestions to tailor the resume for this job.
     
     Resume:
-    {resume_text[:1000]}...
+    {resume}
     
     Job Description:
-    {job_description[:1000]}...
+    {job}
     
     Provide 5-7 specific, actionable suggestions in JSON format:
     {{
@@ -186,29 +483,23 @@ def tailor_resume_for_job(resume_text: str, job_description: str) -> Dict:
     """
     
     try:
-        response = invoke_bedrock_model(prompt, max_tokens=2000)
+        response = invoke_bedrock_model(prompt, max_tokens=2000, function_name='tailor_resume_for_job')
         
-        start = response.find('{')
-        end = response.rfind('}') + 1
-        if start != -1 and end > start:
-            return json.loads(response[start:end])
+        parsed = extract_json(response, expect='object')
+        if parsed is not None:
+            return parsed
         
-        return {
-            "suggestions": ["Align experience with job requirements"],
-            "keywords_to_add": [],
-            "skills_to_highlight": []
-        }
+        logger.warning("No JSON object found in tailor_resume_for_job output, using fallback")
+        return copy.deepcopy(TAILOR_FALLBACK)
         
     except Exception as e:
         logger.error(f"Error tailoring resume: {str(e)}")
-        return {"suggestions": [], "keywords_to_add": [], "skills_to_highlight": []}
+        return copy.deepcopy(TAILOR_ERROR_RESULT)
 
 
-def generate_career_roadmap(current_role: str, target_role: str, current_skills: List[str]) -> Dict:
-    """
-    Generate personalized career roadmap using AI
-    """
-    prompt = f"""
+def build_career_roadmap_prompt(current_role: str, target_role: str, current_skills: List[str]) -> str:
+    """Build the generate_career_roadmap prompt"""
+    return f"""
     You are a senior career counselor. Create a detailed career roadmap for someone who:
     - Currently works as: {current_role}
     - Target role: {target_role}
@@ -238,15 +529,22 @@ def generate_career_roadmap(current_role: str, target_role: str, current_skills:
         "experiences": [<types of experience to gain>]
     }}
     """
+
+
+def generate_career_roadmap(current_role: str, target_role: str, current_skills: List[str]) -> Dict:
+    """
+    Generate personalized career roadmap using AI
+    """
+    prompt = build_career_roadmap_prompt(current_role, target_role, current_skills)
     
     try:
-        response = invoke_bedrock_model(prompt, max_tokens=3000)
+        response = invoke_bedrock_model(prompt, max_tokens=3000, function_name='generate_career_roadmap')
         
-        start = response.find('{')
-        end = response.rfind('}') + 1
-        if start != -1 and end > start:
-            return json.loads(response[start:end])
+        parsed = extract_json(response, expect='object')
+        if parsed is not None:
+            return parsed
         
+        logger.warning("No JSON object found in generate_career_roadmap output, using fallback")
         return {
             "timeline": "18-24 months",
             "requiredSkills": [],
@@ -260,6 +558,51 @@ def generate_career_roadmap(current_role: str, target_role: str, current_skills:
         return {}
 
 
+def stream_resume_analysis(resume_text: str) -> Iterator[str]:
+    """
+    Stream the qualitative analyze_resume review as raw text chunks
+    (ATS scores are local; see ats_engine.score_resume)
+    """
+    return invoke_bedrock_model_stream(
+        build_resume_analysis_prompt(resume_text),
+        max_tokens=1500,
+        function_name='analyze_resume'
+    )
+
+
+def stream_job_recommendations(user_profile: Dict) -> Iterator[Dict]:
+    """
+    Stream job recommendations, yielding each job as soon as its JSON closes
+    Generation is cut off once the recommendations array is complete
+    """
+    return iter_json_items(
+        invoke_bedrock_model_stream(
+            build_job_recommendations_prompt(user_profile),
+            function_name='get_job_recommendations'
+        )
+    )
+
+
+def generate_career_roadmap_streamed(current_role: str, target_role: str, current_skills: List[str]) -> Optional[Dict]:
+    """
+    Generate a career roadmap over the streaming API, stopping generation as soon
+    as the roadmap JSON object closes. Returns None if no JSON object was produced.
+    """
+    return collect_json(stream_career_roadmap(current_role, target_role, current_skills), expect='object')
+
+
+def stream_career_roadmap(current_role: str, target_role: str, current_skills: List[str]) -> Iterator[str]:
+    """
+    Stream the generate_career_roadmap completion as raw text chunks
+    """
+    return invoke_bedrock_model_stream(
+        build_career_roadmap_prompt(current_role, target_role, current_skills),
+        max_tokens=3000,
+        function_name='generate_career_roadmap'
+    )
+
+
+@coalesced('get_market_insights')
 def get_market_insights(role: str, location: str) -> Dict:
     """
     Get AI-generated market insights for a role/location
@@ -281,21 +624,14 @@ def get_market_insights(role: str, location: str) -> Dict:
     """
     
     try:
-        response = invoke_bedrock_model(prompt, max_tokens=1500)
+        response = invoke_bedrock_model(prompt, max_tokens=1500, function_name='get_market_insights')
         
-        start = response.find('{')
-        end = response.rfind('}') + 1
-        if start != -1 and end > start:
-            return json.loads(response[start:end])
+        parsed = extract_json(response, expect='object')
+        if parsed is not None:
+            return parsed
         
-        return {
-            "demandLevel": "high",
-            "averageSalary": 120000,
-            "growthTrend": "15%",
-            "topCompaniesHiring": [],
-            "inDemandSkills": [],
-            "insights": []
-        }
+        logger.warning("No JSON object found in get_market_insights output, using fallback")
+        return copy.deepcopy(MARKET_INSIGHTS_FALLBACK)
         
     except Exception as e:
         logger.error(f"Error getting market insights: {str(e)}")
@@ -306,24 +642,25 @@ def generate_interview_questions(job_description: str) -> List[str]:
     """
     Generate likely interview questions based on job description
     """
+    job = compress(job_description, JOB, 'generate_interview_questions').text
     prompt = f"""
     Based on this job description, generate 10 likely interview questions
     that candidates should prepare for:
     
     Job Description:
-    {job_description[:1500]}
+    {job}
     
     Return as a JSON array of strings.
     """
     
     try:
-        response = invoke_bedrock_model(prompt, max_tokens=1500)
+        response = invoke_bedrock_model(prompt, max_tokens=1500, function_name='generate_interview_questions')
         
-        start = response.find('[')
-        end = response.rfind(']') + 1
-        if start != -1 and end > start:
-            return json.loads(response[start:end])
+        parsed = extract_json(response, expect='array')
+        if parsed is not None:
+            return parsed
         
+        logger.warning("No JSON array found in generate_interview_questions output, using fallback")
         return [
             "Tell me about yourself",
             "Why are you interested in this role?",
@@ -335,6 +672,7 @@ def generate_interview_questions(job_description: str) -> List[str]:
         return []
 
 
+@coalesced('get_salary_trends')
 def get_salary_trends(role: str, location: str) -> Dict:
     """
     Get salary trend data using AI analysis
@@ -356,34 +694,40 @@ def get_salary_trends(role: str, location: str) -> Dict:
     """
     
     try:
-        response = invoke_bedrock_model(prompt, max_tokens=1000)
+        response = invoke_bedrock_model(prompt, max_tokens=1000, function_name='get_salary_trends')
         
-        start = response.find('{')
-        end = response.rfind('}') + 1
-        if start != -1 and end > start:
-            return json.loads(response[start:end])
+        parsed = extract_json(response, expect='object')
+        if parsed is not None:
+            return parsed
         
-        return {
-            "currentAverage": 120000,
-            "range": {"min": 90000, "max": 160000},
-            "yearOverYearChange": "8.5%",
-            "experienceLevels": []
-        }
+        logger.warning("No JSON object found in get_salary_trends output, using fallback")
+        return copy.deepcopy(SALARY_TRENDS_FALLBACK)
         
     except Exception as e:
         logger.error(f"Error getting salary trends: {str(e)}")
         return {}
 
 
-def get_skill_demand_forecast(skills: List[str]) -> List[Dict]:
-    """
-    Forecast demand for specific skills
-    """
-    prompt = f"""
+# Bump when the skill forecast prompt or item shape changes
+SKILL_FORECAST_CACHE_VERSION = 'v1'
+
+
+def _skill_key(skill: str) -> str:
+    return ' '.join(skill.split()).lower()
+
+
+def skill_forecast_cache_key(skill: str) -> str:
+    """Response cache key for one skill's forecast"""
+    return f"skill-forecast:{SKILL_FORECAST_CACHE_VERSION}:{_skill_key(skill)}"
+
+
+def build_skill_demand_prompt(skills: List[str]) -> str:
+    """Build the get_skill_demand_forecast prompt"""
+    return f"""
     Analyze the demand and growth forecast for these skills:
     {', '.join(skills)}
     
-    Return JSON array:
+    Return JSON array with one entry per skill, using the skill names exactly as given:
     [
         {{
             "skill": "<skill name>",
@@ -394,32 +738,107 @@ def get_skill_demand_forecast(skills: List[str]) -> List[Dict]:
         }}
     ]
     """
+
+
+def _forecast_missing_skills(skills: List[str]) -> Dict[str, Dict]:
+    """
+    One model call for the given skills; returns forecasts keyed by skill key
+    Items are matched by name, or by position when the model renamed skills
+    but returned one item per skill
+    """
+    response = invoke_bedrock_model(
+        build_skill_demand_prompt(skills),
+        max_tokens=min(4000, 150 * len(skills) + 300),
+        function_name='get_skill_demand_forecast',
+        use_cache=False
+    )
+    parsed = extract_json(response, expect='array')
+    if parsed is None:
+        logger.warning("No JSON array found in get_skill_demand_forecast output, using fallback")
+        return {}
     
-    try:
-        response = invoke_bedrock_model(prompt, max_tokens=2000)
-        
-        start = response.find('[')
-        end = response.rfind(']') + 1
-        if start != -1 and end > start:
-            return json.loads(response[start:end])
-        
-        return []
-        
-    except Exception as e:
-        logger.error(f"Error forecasting skill demand: {str(e)}")
+    items = [item for item in parsed if isinstance(item, dict)]
+    requested = {_skill_key(skill) for skill in skills}
+    by_name = {_skill_key(str(item.get('skill', ''))): item for item in items}
+    if requested <= set(by_name):
+        return {key: by_name[key] for key in requested}
+    if len(items) == len(skills):
+        return {_skill_key(skill): item for skill, item in zip(skills, items)}
+    return {key: item for key, item in by_name.items() if key in requested}
+
+
+@coalesced('get_skill_demand_forecast')
+def get_skill_demand_forecast(skills: List[str]) -> List[Dict]:
+    """
+    Forecast demand for specific skills
+    Each skill's forecast is cached on its own, so only skills missing from the
+    cache are sent to the model (in one prompt); results follow request order
+    """
+    # Requested skills by skill key, first spelling wins, in request order
+    requested: Dict[str, str] = {}
+    for skill in skills or []:
+        if skill:
+            requested.setdefault(_skill_key(skill), skill)
+    if not requested:
         return []
+    
+    ttl = ttl_for('get_skill_demand_forecast')
+    forecasts: Dict[str, Dict] = {}
+    if ttl > 0:
+        cached = response_cache.get_many([skill_forecast_cache_key(key) for key in requested])
+        forecasts = {key: cached[skill_forecast_cache_key(key)]
+                     for key in requested if skill_forecast_cache_key(key) in cached}
+    
+    missing = [skill for key, skill in requested.items() if key not in forecasts]
+    if missing:
+        try:
+            generated = _forecast_missing_skills(missing)
+        except Exception as e:
+            logger.error(f"Error forecasting skill demand: {str(e)}")
+            generated = {}
+        for key, item in generated.items():
+            forecasts[key] = item
+            if ttl > 0:
+                response_cache.set(skill_forecast_cache_key(key), item, ttl)
+    
+    return [copy.deepcopy(forecasts[key]) for key in requested if key in forecasts]
 
 
-def analyze_email_for_interview(email_content: str) -> Dict:
+def analyze_email_for_interview(email_content: str, prefilter: bool = True) -> Dict:
     """
     Analyze email to detect interview invitations
+    With prefilter, obvious non-invites (see email_prefilter) are answered
+    locally without a model call; regex-extracted date, time and meeting link
+    are passed to the model as hints and fill any details it leaves empty
     """
+    import email_prefilter
+    
+    screening = None
+    if prefilter and email_prefilter.PREFILTER_ENABLED:
+        screening = email_prefilter.screen(email_content)
+        email_prefilter.prefilter_stats.record(screening)
+        if screening.skip:
+            return {
+                "isInterview": False,
+                "confidence": round((1 - screening.probability) * 100),
+                "interviewDetails": {},
+                "suggestedAction": "No action needed",
+                "prefiltered": screening.reason
+            }
+    
+    hints = ""
+    if screening and any(screening.details[name] for name in ('date', 'time', 'meetingLink')):
+        hints = f"""
+    Candidate details found in the email (verify against the text):
+    {json.dumps({k: v for k, v in screening.details.items() if v and k != 'interviewType'})}
+    """
+    
     prompt = f"""
     Analyze this email to determine if it's an interview invitation.
     
     Email:
     {email_content[:1000]}
-    
+    {hints}
     Return JSON:
     {{
         "isInterview": <true/false>,
@@ -436,20 +855,29 @@ def analyze_email_for_interview(email_content: str) -> Dict:
     """
     
     try:
-        response = invoke_bedrock_model(prompt, max_tokens=1000)
+        response = invoke_bedrock_model(prompt, max_tokens=1000, function_name='analyze_email_for_interview')
         
-        start = response.find('{')
-        end = response.rfind('}') + 1
-        if start != -1 and end > start:
-            return json.loads(response[start:end])
+        parsed = extract_json(response, expect='object')
+        if parsed is not None:
+            if screening and parsed.get('isInterview'):
+                details = parsed.get('interviewDetails')
+                details = details if isinstance(details, dict) else {}
+                for name, value in screening.details.items():
+                    if value and (not details.get(name) or details.get(name) == 'unknown'):
+                        details[name] = value
+                parsed['interviewDetails'] = details
+            return parsed
         
+        logger.warning("No JSON object found in analyze_email_for_interview output, using fallback")
         return {
             "isInterview": False,
             "confidence": 0,
             "interviewDetails": {},
-            "suggestedAction": "No action needed"
+            "suggestedAction": "No action needed",
+            "error": "No JSON object in model output"
         }
         
     except Exception as e:
         logger.error(f"Error analyzing email: {str(e)}")
-        return {"isInterview": False, "confidence": 0}
+        # Flagged so batch callers (mailbox_scan) retry instead of recording a non-interview
+        return {"isInterview": False, "confidence": 0, "error": str(e)}
@@ -0,0 +1,121 @@
+"""
+Cold-Start Profiling
+When COLD_START_PROFILE=true, times every module imported during Lambda init
+and logs a per-module and per-client cost report on the first invocation
+"""
+
+import os
+import sys
+import json
+import time
+import importlib.abc
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger()
+
+PROFILE_ENABLED = os.environ.get('COLD_START_PROFILE', 'false').lower() == 'true'
+REPORT_TOP_N = int(os.environ.get('COLD_START_PROFILE_TOP_N', '25'))
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a module loader and records how long exec_module takes"""
+
+    def __init__(self, loader: Any, timer: 'ImportTimer'):
+        self._loader = loader
+        self._timer = timer
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._exit(module.__name__)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder that times module execution
+    Self time excludes time spent importing nested modules
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._stack: List[List[Any]] = []
+        self._finding = False
+        self.started = time.perf_counter()
+
+    def find_spec(self, fullname, path, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._finding = False
+
+    def _enter(self, name: str) -> None:
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, name: str) -> None:
+        _, start, children = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        self.timings[name] = {'cumulativeMs': elapsed * 1000, 'selfMs': (elapsed - children) * 1000}
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def report(self, top_n: int = REPORT_TOP_N) -> List[Dict[str, Any]]:
+        ranked = sorted(self.timings.items(), key=lambda item: item[1]['selfMs'], reverse=True)
+        return [
+            {'module': name, 'selfMs': round(t['selfMs'], 2), 'cumulativeMs': round(t['cumulativeMs'], 2)}
+            for name, t in ranked[:top_n]
+        ]
+
+
+_timer: Optional[ImportTimer] = None
+_reported = False
+
+
+def install() -> None:
+    """Start timing imports; a no-op unless COLD_START_PROFILE=true"""
+    global _timer
+    if PROFILE_ENABLED and _timer is None:
+        _timer = ImportTimer()
+        sys.meta_path.insert(0, _timer)
+
+
+def report() -> Dict[str, Any]:
+    """Cold-start cost per imported module and per AWS client created so far"""
+    import aws_clients
+
+    modules = _timer.report() if _timer else []
+    return {
+        'sinceInstallMs': round((time.perf_counter() - _timer.started) * 1000, 2) if _timer else None,
+        'modules': modules,
+        'clients': aws_clients.creation_report(),
+        'connections': aws_clients.connection_stats()
+    }
+
+
+def log_report_once() -> None:
+    """Log the cold-start report after the first invocation of a profiled container"""
+    global _reported
+    if _timer is None or _reported:
+        return
+    _reported = True
+    sys.meta_path.remove(_timer)
+    logger.info(f"Cold start profile: {json.dumps(report())}")
@@ -0,0 +1,169 @@
+"""
+DynamoDB Batch Helpers
+Chunked BatchGetItem / BatchWriteItem with retry of unprocessed keys and items,
+and parallel conditional updates (which BatchWriteItem cannot express)
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger()
+
+# DynamoDB service limits
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+
+# Chunks / updates sent concurrently by the write helpers
+WRITE_CONCURRENCY = int(os.environ.get('DYNAMODB_WRITE_CONCURRENCY', '8'))
+
+# Retry policy for unprocessed keys
+MAX_RETRIES = 5
+BASE_BACKOFF_SECONDS = 0.05
+
+
+def plain_numbers(value: Any) -> Any:
+    """DynamoDB Decimals back to int/float for JSON responses"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {k: plain_numbers(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [plain_numbers(v) for v in value]
+    return value
+
+
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def batch_get_items(dynamodb: Any, table_name: str, key_name: str, key_values: List[str]) -> Dict[str, Dict]:
+    """
+    Load many items from one table with BatchGetItem
+    Returns a dict mapping each found key value to its item; missing keys are omitted
+    """
+    # BatchGetItem rejects duplicate keys within a request
+    unique_values = list(dict.fromkeys(v for v in key_values if v))
+    items: Dict[str, Dict] = {}
+
+    for chunk in _chunks(unique_values, BATCH_GET_LIMIT):
+        request = {table_name: {'Keys': [{key_name: value} for value in chunk]}}
+        attempt = 0
+
+        while request:
+            response = dynamodb.batch_get_item(RequestItems=request)
+            for item in response.get('Responses', {}).get(table_name, []):
+                items[item[key_name]] = item
+
+            request = response.get('UnprocessedKeys') or {}
+            if request:
+                attempt += 1
+                if attempt > MAX_RETRIES:
+                    logger.error(f"Giving up on unprocessed keys for {table_name} after {MAX_RETRIES} retries")
+                    break
+                time.sleep(BASE_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+
+    return items
+
+
+def _serializer() -> Any:
+    from boto3.dynamodb.types import TypeSerializer
+    return TypeSerializer()
+
+
+def _serialize(values: Dict[str, Any]) -> Dict[str, Any]:
+    serializer = _serializer()
+    return {name: serializer.serialize(value) for name, value in values.items()}
+
+
+def _write_chunk(client: Any, table_name: str, key_name: str,
+                 chunk: List[Tuple[str, Dict]]) -> Dict[str, Optional[str]]:
+    """Write one chunk of at most 25 serialized items; returns key -> None (written) or an error"""
+    results: Dict[str, Optional[str]] = {key: None for key, _ in chunk}
+    request = {table_name: [{'PutRequest': {'Item': item}} for _, item in chunk]}
+    attempt = 0
+
+    def key_of(entry: Dict) -> str:
+        # Unprocessed items come back in the low-level format, e.g. {'S': 'app_1'}
+        return next(iter(entry['PutRequest']['Item'][key_name].values()))
+
+    while request:
+        try:
+            response = client.batch_write_item(RequestItems=request)
+        except Exception as e:
+            logger.error(f"BatchWriteItem failed for {table_name}: {str(e)}")
+            for entry in request.get(table_name, []):
+                results[key_of(entry)] = str(e)
+            break
+
+        request = response.get('UnprocessedItems') or {}
+        if request:
+            attempt += 1
+            if attempt > MAX_RETRIES:
+                logger.error(f"Giving up on unprocessed items for {table_name} after {MAX_RETRIES} retries")
+                for entry in request.get(table_name, []):
+                    results[key_of(entry)] = 'Unprocessed after retries'
+                break
+            time.sleep(BASE_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+
+    return results
+
+
+def batch_write_items(client: Any, table_name: str, key_name: str, items: List[Dict],
+                      max_workers: int = WRITE_CONCURRENCY) -> Dict[str, Optional[str]]:
+    """
+    Put many items into one table with BatchWriteItem
+    Items are split into 25-item chunks written in parallel; unprocessed items
+    are retried with backoff. Returns key value -> None when written, or an error
+    message. Key values must be unique (BatchWriteItem rejects duplicates).
+    client is the low-level DynamoDB client, which unlike resources is thread-safe.
+    """
+    results: Dict[str, Optional[str]] = {}
+    serialized = []
+    for item in items:
+        try:
+            serialized.append((item[key_name], _serialize(item)))
+        except (TypeError, ValueError) as e:
+            # e.g. floats, which DynamoDB only accepts as Decimal
+            results[item[key_name]] = f"Invalid item: {str(e)}"
+
+    chunks = _chunks(serialized, BATCH_WRITE_LIMIT)
+    if not chunks:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+        for chunk_results in pool.map(lambda chunk: _write_chunk(client, table_name, key_name, chunk), chunks):
+            results.update(chunk_results)
+    return results
+
+
+def _update_one(client: Any, table_name: str, request: Dict) -> Optional[str]:
+    try:
+        request = dict(request, TableName=table_name, Key=_serialize(request['Key']))
+        if 'ExpressionAttributeValues' in request:
+            request['ExpressionAttributeValues'] = _serialize(request['ExpressionAttributeValues'])
+        client.update_item(**request)
+        return None
+    except Exception as e:
+        code = getattr(e, 'response', {}).get('Error', {}).get('Code')
+        if code == 'ConditionalCheckFailedException':
+            return 'ConditionalCheckFailed'
+        logger.error(f"UpdateItem failed for {table_name}: {str(e)}")
+        return code or str(e)
+
+
+def update_items(client: Any, table_name: str, requests: List[Dict],
+                 max_workers: int = WRITE_CONCURRENCY) -> List[Optional[str]]:
+    """
+    Run many UpdateItem calls concurrently (BatchWriteItem only supports puts/deletes)
+    Each request holds update_item arguments with plain Python Key and
+    ExpressionAttributeValues. Returns one entry per request: None on success,
+    'ConditionalCheckFailed' when its condition did not hold, or an error
+    """
+    if not requests:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(requests)))) as pool:
+        return list(pool.map(lambda request: _update_one(client, table_name, request), requests))
@@ -0,0 +1,298 @@
+"""
+Local Pre-Filter for Interview Email Detection
+Negative rules decide whether an email can skip the Bedrock call in
+analyze_email_for_interview; a small Naive Bayes text classifier (weights
+shipped as email_prefilter_model.json, trained by
+scripts/train_email_prefilter.py) can veto a rule skip. Dates, times and
+meeting links are extracted with regexes up front; they keep an email on the
+model path and are passed to the model as hints.
+"""
+
+import os
+import re
+import json
+import math
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+import logging
+
+logger = logging.getLogger()
+
+# Environment configuration
+PREFILTER_ENABLED = os.environ.get('EMAIL_PREFILTER_ENABLED', 'true').lower() == 'true'
+SKIP_BELOW = float(os.environ.get('EMAIL_PREFILTER_SKIP_BELOW', '0.05'))
+# Let a low classifier score skip an email with no rule hit. Off until the
+# weights are trained on real labelled mail; the seed-trained model only vetoes
+MODEL_SKIP = os.environ.get('EMAIL_PREFILTER_MODEL_SKIP', 'false').lower() == 'true'
+MODEL_PATH = os.environ.get(
+    'EMAIL_PREFILTER_MODEL',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'email_prefilter_model.json')
+)
+
+MODEL_VERSION = 2
+
+# Obvious non-invites; a hit skips the model only when the email has no
+# scheduling signal, no extracted date or time and a low classifier score
+NEGATIVE_RULES = [
+    ('newsletter', re.compile(r'unsubscribe|view (this email )?in (your )?browser|manage (your )?(email )?preferences'
+                              r'|you are receiving this (email|because)', re.IGNORECASE)),
+    ('receipt', re.compile(r'\b(order|invoice|receipt|payment) (#|no\.?|number|confirmation)|has (been )?shipped'
+                           r'|tracking number|your (order|purchase|subscription)', re.IGNORECASE)),
+    ('rejection', re.compile(r'unfortunately,? (we|the team|the hiring team) (will not|won\'t|are not|have decided|'
+                             r'decided|cannot)|not (be )?moving forward with your|decided to (move forward|proceed|pursue)'
+                             r' with other|position has been filled|will not be proceeding', re.IGNORECASE)),
+    ('application_received', re.compile(r'(thank you for applying|(we|we\'ve) (have )?received your application)'
+                                        r'[^.!]*[.!]\s*(we|our (team|recruiters?)) will (review|be in touch|contact you)'
+                                        r'|application (has been )?submitted successfully', re.IGNORECASE)),
+    ('job_alert', re.compile(r'new jobs? (for you|matching)|job alert|jobs you may be interested in', re.IGNORECASE)),
+]
+
+# Any of these keeps an email on the model path regardless of rules or classifier
+SCHEDULING_CUE = re.compile(
+    r'\binterview(s|ing)?\b.*\b(schedule|availability|available|invite|invitation|confirm|reschedul)'
+    r'|\b(schedule|availability|available|invite|invitation|confirm|reschedul)\w*\b.*\binterview'
+    r'|phone screen|screening call|onsite|on-site interview|meet the team|hiring manager',
+    re.IGNORECASE | re.DOTALL
+)
+
+MEETING_LINK = re.compile(
+    r'https?://(?:[\w-]+\.)*(?:zoom\.us/(?:j|my|s)/[\w?=&./-]+|meet\.google\.com/[\w-]+'
+    r'|teams\.microsoft\.com/l/meetup-join/[^\s>"\']+|[\w-]+\.webex\.com/[^\s>"\']+'
+    r'|calendly\.com/[^\s>"\']+|chime\.aws/\d+)',
+    re.IGNORECASE
+)
+_MONTHS = (r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?'
+           r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?')
+_WEEKDAYS = r'mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:rs(?:day)?)?|fri(?:day)?|sat(?:urday)?|sun(?:day)?'
+DATE_PATTERN = re.compile(
+    rf'\b(?:(?:{_WEEKDAYS}),?\s+)?(?:(?:{_MONTHS})\.?\s+\d{{1,2}}(?:st|nd|rd|th)?(?:,?\s+\d{{4}})?'
+    rf'|\d{{1,2}}(?:st|nd|rd|th)?\s+(?:of\s+)?(?:{_MONTHS})(?:,?\s+\d{{4}})?)\b'
+    r'|\b\d{4}-\d{2}-\d{2}\b|\b\d{1,2}/\d{1,2}/\d{2,4}\b'
+    rf'|\b(?:this|next)\s+(?:{_WEEKDAYS})\b|\b(?:{_WEEKDAYS})\b(?=,?\s+(?:at|morning|afternoon))|\btomorrow\b',
+    re.IGNORECASE
+)
+TIME_PATTERN = re.compile(
+    r'\b(?:[01]?\d|2[0-3])(?::[0-5]\d)?\s*(?:a\.?m\.?|p\.?m\.?)(?:\s*(?:[A-Z]{2,4}T|UTC|GMT)(?:[+-]\d{1,2})?)?'
+    r'|\b(?:[01]\d|2[0-3]):[0-5]\d(?:\s*(?:[A-Z]{2,4}T|UTC|GMT)(?:[+-]\d{1,2})?)?\b',
+    re.IGNORECASE
+)
+_PHONE_INTERVIEW = re.compile(r'phone (call|screen|interview)|call you at|we will call', re.IGNORECASE)
+_ONSITE_INTERVIEW = re.compile(r'on-?site|in[- ]person|our office|visit us at', re.IGNORECASE)
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9']+")
+_ADDRESS = re.compile(r'https?://\S+|[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+_URL_HOST = re.compile(r'https?://([\w.-]+)', re.IGNORECASE)
+
+
+class Screening(NamedTuple):
+    skip: bool
+    probability: float
+    reason: str
+    details: Dict[str, Any]
+
+
+def _words(text: str) -> Iterator[Tuple[str, bool]]:
+    """(lowercase word, capitalized mid-sentence) for each word outside links and email addresses"""
+    text = _ADDRESS.sub(' ', text or '')
+    for match in _WORD.finditer(text):
+        word = match.group(0)
+        before = text[:match.start()].rstrip(' \t"\'(')
+        yield word.lower(), word[0].isupper() and bool(before) and before[-1] not in '.!?:\n'
+
+
+def tokenize_email(text: str) -> List[str]:
+    """Distinct lowercase words plus host:<domain> tokens for meeting links"""
+    tokens = {word for word, _ in _words(text)}
+    tokens.update('host:' + '.'.join(_URL_HOST.match(link.group(0)).group(1).lower().split('.')[-2:])
+                  for link in MEETING_LINK.finditer(text or ''))
+    return sorted(tokens)
+
+
+def proper_nouns(texts: Iterable[str]) -> Set[str]:
+    """
+    Words capitalized mid-sentence and never written in lowercase: the names,
+    companies and places of the training mail, which the weights must not learn
+    """
+    capitalized: Set[str] = set()
+    lowercase: Set[str] = set()
+    for text in texts:
+        for word, is_capitalized in _words(text):
+            (capitalized if is_capitalized else lowercase).add(word)
+    return capitalized - lowercase
+
+
+def extract_details(text: str) -> Dict[str, Any]:
+    """Regex-extracted interview details: first date, time and meeting link, and the likely format"""
+    text = text or ''
+    date = DATE_PATTERN.search(text)
+    time_match = TIME_PATTERN.search(text)
+    link = MEETING_LINK.search(text)
+    if link:
+        interview_type = 'video'
+    elif _PHONE_INTERVIEW.search(text):
+        interview_type = 'phone'
+    elif _ONSITE_INTERVIEW.search(text):
+        interview_type = 'in-person'
+    else:
+        interview_type = 'unknown'
+    return {
+        'date': date.group(0).strip() if date else None,
+        'time': time_match.group(0).strip() if time_match else None,
+        'meetingLink': link.group(0).rstrip('.,);') if link else None,
+        'interviewType': interview_type,
+    }
+
+
+def train(examples: Iterable[Tuple[str, bool]], min_df: int = 2, max_features: int = 3000,
+          alpha: float = 1.0) -> Dict[str, Any]:
+    """
+    Binarized multinomial Naive Bayes over tokenize_email tokens, without the
+    training mail's proper nouns
+    Returns the model document: prior log-odds and per-token log-likelihood ratios
+    """
+    examples = list(examples)
+    excluded = proper_nouns(text for text, _ in examples)
+    doc_freq: Dict[str, List[int]] = {}
+    counts = [0, 0]
+    for text, is_interview in examples:
+        label = 1 if is_interview else 0
+        counts[label] += 1
+        for token in tokenize_email(text):
+            doc_freq.setdefault(token, [0, 0])[label] += 1
+
+    vocab = {token: df for token, df in doc_freq.items() if df[0] + df[1] >= min_df and token not in excluded}
+    totals = [sum(df[label] for df in vocab.values()) for label in (0, 1)]
+    size = max(1, len(vocab))
+    ratios = {
+        token: math.log((df[1] + alpha) / (totals[1] + alpha * size))
+        - math.log((df[0] + alpha) / (totals[0] + alpha * size))
+        for token, df in vocab.items()
+    }
+    top = sorted(ratios.items(), key=lambda item: (-abs(item[1]), item[0]))[:max_features]
+    return {
+        'version': MODEL_VERSION,
+        'prior': math.log((counts[1] + alpha) / (counts[0] + alpha)),
+        'weights': {token: round(weight, 5) for token, weight in sorted(top)},
+        'trainedOn': {'interviews': counts[1], 'others': counts[0]},
+    }
+
+
+class EmailClassifier:
+    """Probability that an email is an interview invitation"""
+
+    def __init__(self, model: Dict[str, Any]):
+        if model.get('version') != MODEL_VERSION:
+            raise ValueError(f"Unsupported email prefilter model version: {model.get('version')}")
+        self.prior = float(model['prior'])
+        self.weights: Dict[str, float] = model['weights']
+
+    def probability(self, text: str) -> float:
+        score = self.prior + sum(self.weights.get(token, 0.0) for token in tokenize_email(text))
+        if score >= 0:
+            return 1.0 / (1.0 + math.exp(-score))
+        exp = math.exp(score)
+        return exp / (1.0 + exp)
+
+
+_classifier: Optional[EmailClassifier] = None
+_classifier_loaded = False
+_classifier_lock = threading.Lock()
+
+
+def load_classifier(path: str = MODEL_PATH) -> Optional[EmailClassifier]:
+    """
+    Shipped classifier, loaded once per container; None (rules only) if the
+    weights are missing or invalid, which is not retried on later calls
+    """
+    global _classifier, _classifier_loaded
+    if not _classifier_loaded:
+        with _classifier_lock:
+            if not _classifier_loaded:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        _classifier = EmailClassifier(json.load(f))
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Email prefilter model unavailable, using rules only: {str(e)}")
+                _classifier_loaded = True
+    return _classifier
+
+
+def screen(text: str, classifier: Optional[EmailClassifier] = None, skip_below: float = SKIP_BELOW,
+           model_skip: bool = MODEL_SKIP) -> Screening:
+    """
+    Decide whether an email can skip the model
+    Emails with a scheduling cue, meeting link, date or time always go to the
+    model. A negative rule hit skips only if the classifier (when loaded) also
+    scores the email under skip_below; the classifier alone skips only with
+    model_skip
+    """
+    details = extract_details(text)
+    classifier = classifier or load_classifier()
+    probability = classifier.probability(text) if classifier else 0.5
+    unlikely = classifier is None or probability < skip_below
+
+    if details['meetingLink'] or SCHEDULING_CUE.search(text or ''):
+        return Screening(False, probability, 'scheduling_signal', details)
+    if details['date'] or details['time']:
+        return Screening(False, probability, 'date_or_time', details)
+    for name, pattern in NEGATIVE_RULES:
+        if pattern.search(text or ''):
+            if unlikely:
+                return Screening(True, probability, f'rule:{name}', details)
+            return Screening(False, probability, 'classifier_veto', details)
+    if model_skip and classifier and probability < skip_below:
+        return Screening(True, probability, 'classifier', details)
+    return Screening(False, probability, 'uncertain', details)
+
+
+def evaluate(examples: Sequence[Tuple[str, bool]], thresholds: Sequence[float],
+             classifier: Optional[EmailClassifier], model_skip: bool = MODEL_SKIP) -> List[Dict[str, Any]]:
+    """
+    Skip-decision quality per threshold
+    skipRate: share of emails that never reach the model
+    skipPrecision: share of skipped emails that were not interviews
+    interviewRecall: share of interviews still sent to the model
+    """
+    rows = []
+    interviews = sum(1 for _, label in examples if label)
+    for threshold in thresholds:
+        skipped = [label for text, label in examples if screen(text, classifier, threshold, model_skip).skip]
+        missed = sum(1 for label in skipped if label)
+        rows.append({
+            'threshold': threshold,
+            'skipped': len(skipped),
+            'missedInterviews': missed,
+            'skipRate': round(len(skipped) / len(examples), 4) if examples else 0.0,
+            'skipPrecision': round(1 - missed / len(skipped), 4) if skipped else 1.0,
+            'interviewRecall': round(1 - missed / interviews, 4) if interviews else 1.0,
+        })
+    return rows
+
+
+class PrefilterStats:
+    """Counts of screened emails by outcome"""
+
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, screening: Screening) -> None:
+        with self._lock:
+            self._counts['screened'] = self._counts.get('screened', 0) + 1
+            outcome = 'skipped' if screening.skip else 'sentToModel'
+            self._counts[outcome] = self._counts.get(outcome, 0) + 1
+            self._counts[screening.reason] = self._counts.get(screening.reason, 0) + 1
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            report: Dict[str, Any] = dict(self._counts)
+        screened = report.get('screened', 0)
+        report['skipRate'] = round(report.get('skipped', 0) / screened, 4) if screened else 0.0
+        return report
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+prefilter_stats = PrefilterStats()
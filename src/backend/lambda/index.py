@@ -5,19 +5,41 @@ Handles all API Gateway requests and routes to appropriate functions
 
 import json
 import os
-import boto3
+import base64
+from decimal import Decimal
+import asyncio
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
 import logging
 
+# Must run before the remaining imports so their cost shows up in the profile
+import cold_start
+cold_start.install()
+
+import aws_clients
+import resilience
+from aws_clients import LazyClient, LazyResource
+from router import Router
+from market_store import market_store, log_market_query, SALARY_TRENDS, MARKET_INSIGHTS
+from profile_cache import ProfileCache
+import resume_text as resume_text_stage
+from pagination import (
+    PaginationError,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+    parse_page_size,
+    projection_params,
+    query_fingerprint
+)
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-dynamodb = boto3.resource('dynamodb')
-s3 = boto3.client('s3')
-bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-east-1')
+# AWS clients are created on first use and shared with bedrock_integration
+dynamodb = LazyResource('dynamodb')
+s3 = LazyClient('s3')
 
 # Environment variables
 USERS_TABLE = os.environ.get('USERS_TABLE', 'CareerAgentUsers')
@@ -25,11 +47,53 @@ JOBS_TABLE = os.environ.get('JOBS_TABLE', 'CareerAgentJobs')
 APPLICATIONS_TABLE = os.environ.get('APPLICATIONS_TABLE', 'CareerAgentApplications')
 RESUMES_BUCKET = os.environ.get('RESUMES_BUCKET', 'career-agent-resumes')
 
+# Upper bound on jobs scored in one /api/jobs/score request
+MAX_SCORED_JOBS = int(os.environ.get('MAX_SCORED_JOBS', '500'))
+
+# Number of locally pre-ranked jobs passed on to the LLM for weighted scoring
+LLM_RERANK_TOP_K = int(os.environ.get('LLM_RERANK_TOP_K', '50'))
+
+# Key attributes of UserIdIndex entries, the only ones allowed in an applications cursor
+APPLICATION_INDEX_KEYS = ('applicationId', 'userId', 'appliedAt')
+
+# Upper bound on resumes scored in one /api/resume/ats-score request
+MAX_ATS_BATCH = int(os.environ.get('MAX_ATS_BATCH', '1000'))
+
+# Upper bound on applications created or updated in one bulk request
+MAX_BULK_APPLICATIONS = int(os.environ.get('MAX_BULK_APPLICATIONS', '500'))
+
+# Query parameters that handlers read as lists; given as ?skills=python,aws or repeated keys
+LIST_QUERY_PARAMS = ('skills', 'jobIds', 'keywords')
+
+
+def load_user_profile(user_id: str) -> Any:
+    """Read a user item from DynamoDB (the profile cache's loader)"""
+    return dynamodb.Table(USERS_TABLE).get_item(Key={'userId': user_id}).get('Item')
+
+
+# Read-through cache shared by every handler that reads a user profile;
+# handlers that write a user item must call profile_cache.invalidate
+profile_cache = ProfileCache(load_user_profile)
+
+
+def query_parameters(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Query string parameters, with LIST_QUERY_PARAMS split into lists"""
+    params = dict(event.get('queryStringParameters') or {})
+    multi = event.get('multiValueQueryStringParameters') or {}
+    for name in LIST_QUERY_PARAMS:
+        values = multi.get(name) or ([params[name]] if isinstance(params.get(name), str) else None)
+        if values:
+            params[name] = [item.strip() for value in values for item in value.split(',') if item.strip()]
+    return params
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Main Lambda handler function
     Routes requests based on HTTP method and path
     """
+    # Model calls (including truncation retries) must finish before the Lambda times out
+    resilience.set_request_deadline(context)
     try:
         # Extract request details
         http_method = event.get('httpMethod', '')
@@ -56,25 +120,21 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             }
         
         # Route to appropriate handler
-        if path.startswith('/api/jobs'):
-            return handle_jobs_request(http_method, path, body, response_headers)
-        elif path.startswith('/api/users'):
-            return handle_users_request(http_method, path, body, response_headers)
-        elif path.startswith('/api/resume'):
-            return handle_resume_request(http_method, path, body, response_headers)
-        elif path.startswith('/api/ai'):
-            return handle_ai_request(http_method, path, body, response_headers)
-        elif path.startswith('/api/applications'):
-            return handle_applications_request(http_method, path, body, response_headers)
-        elif path.startswith('/api/market-intelligence'):
-            return handle_market_intelligence_request(http_method, path, body, response_headers)
-        else:
-            return {
-                'statusCode': 404,
-                'headers': response_headers,
-                'body': json.dumps({'error': 'Not found'})
-            }
-            
+        match = router.resolve(http_method, path)
+        if match.status == 404:
+            return error_response(404, 'Not found', response_headers)
+        if match.status == 405:
+            response = error_response(405, 'Method not allowed', response_headers)
+            response['headers'] = {**response_headers, 'Allow': ', '.join(match.allowed_methods)}
+            return response
+        
+        # Query string parameters (filters, cursors) are only read by GET routes;
+        # writes take the JSON body alone so stray parameters never reach an item.
+        # Path parameters (userId, applicationId) take precedence
+        query = query_parameters(event) if http_method == 'GET' else {}
+        body = {**query, **body, **match.params}
+        return match.handler(http_method, match.pattern, body, response_headers)
+    
     except Exception as e:
         logger.error(f"Error in lambda_handler: {str(e)}", exc_info=True)
         return {
@@ -82,11 +142,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'headers': response_headers,
             'body': json.dumps({'error': 'Internal server error', 'message': str(e)})
         }
+    
+    finally:
+        resilience.set_request_deadline(None)
+        cold_start.log_report_once()
+        aws_clients.log_connection_stats()
 
 
 def handle_jobs_request(method: str, path: str, body: Dict, headers: Dict) -> Dict:
     """Handle job-related requests"""
-    from bedrock_integration import get_job_recommendations, calculate_job_score
+    from bedrock_integration import get_job_recommendations, build_job_recommendations_prompt
+    import batch_inference
     
     if method == 'GET':
         # Get job listings with AI scoring
@@ -95,25 +161,53 @@ def handle_jobs_request(method: str, path: str, body: Dict, headers: Dict) -> Di
             return error_response(400, 'User ID required', headers)
         
         # Fetch user profile
-        users_table = dynamodb.Table(USERS_TABLE)
-        user_response = users_table.get_item(Key={'userId': user_id})
-        user = user_response.get('Item', {})
+        user = profile_cache.get(user_id) or {}
         
-        # Get AI-powered job recommendations
-        jobs = get_job_recommendations(user)
+        # Served from the nightly batch run while the profile inputs are unchanged
+        jobs = batch_inference.lookup(user, 'get_job_recommendations', build_job_recommendations_prompt(user))
+        if jobs is None:
+            jobs = get_job_recommendations(user)
         
         return success_response(jobs, headers)
     
-    elif method == 'POST' and '/score' in path:
-        # Calculate AI compatibility score for a specific job
+    elif method == 'POST' and path == '/api/jobs/score':
+        # Calculate AI compatibility scores for one job (jobId) or many (jobIds)
+        from async_bedrock import score_jobs_batch_async
+        from dynamo_batch import batch_get_items
+        from job_ranker import rank_jobs
+        
         user_id = body.get('userId')
-        job_id = body.get('jobId')
+        job_ids = body.get('jobIds') or ([body['jobId']] if body.get('jobId') else [])
         
-        if not user_id or not job_id:
-            return error_response(400, 'User ID and Job ID required', headers)
+        if not user_id or not job_ids:
+            return error_response(400, 'User ID and Job ID(s) required', headers)
+        if len(job_ids) > MAX_SCORED_JOBS:
+            return error_response(400, f'At most {MAX_SCORED_JOBS} jobs can be scored per request', headers)
         
-        score = calculate_job_score(user_id, job_id)
-        return success_response({'score': score}, headers)
+        user = profile_cache.get(user_id)
+        if not user:
+            return error_response(404, 'User not found', headers)
+        # Load every job with BatchGetItem instead of one read per job
+        jobs = batch_get_items(dynamodb, JOBS_TABLE, 'jobId', job_ids)
+        
+        # Rank locally first so only the top candidates cost a model call
+        ranked = rank_jobs(user, list(jobs.values()))
+        llm_candidates = [job for job, _ in ranked[:LLM_RERANK_TOP_K]]
+        # Every job starts from its local score; LLM scores overlay it, so a
+        # top-K job the model failed to score keeps its local score
+        scores = {str(job['jobId']): local_score for job, local_score in ranked}
+        scores.update(asyncio.run(score_jobs_batch_async(user, llm_candidates)))
+        
+        if 'jobIds' not in body:
+            if job_ids[0] not in jobs:
+                return error_response(404, 'Job not found', headers)
+            return success_response({'score': scores.get(job_ids[0], 0)}, headers)
+        
+        return success_response({
+            'scores': {job_id: scores.get(job_id) for job_id in job_ids if job_id in jobs},
+            'llmScoredJobIds': [str(job['jobId']) for job in llm_candidates],
+            'missingJobIds': [job_id for job_id in job_ids if job_id not in jobs]
+        }, headers)
     
     return error_response(405, 'Method not allowed', headers)
 
@@ -123,9 +217,8 @@ def handle_users_request(method: str, path: str, body: Dict, headers: Dict) -> D
     users_table = dynamodb.Table(USERS_TABLE)
     
     if method == 'GET':
-        user_id = path.split('/')[-1]
-        response = users_table.get_item(Key={'userId': user_id})
-        user = response.get('Item')
+        user_id = body.get('userId')
+        user = profile_cache.get(user_id)
         
         if not user:
             return error_response(404, 'User not found', headers)
@@ -138,6 +231,7 @@ def handle_users_request(method: str, path: str, body: Dict, headers: Dict) -> D
         user_data['updatedAt'] = datetime.utcnow().isoformat()
         
         users_table.put_item(Item=user_data)
+        profile_cache.invalidate(user_data.get('userId'))
         return success_response(user_data, headers)
     
     elif method == 'PUT':
@@ -161,53 +255,171 @@ def handle_users_request(method: str, path: str, body: Dict, headers: Dict) -> D
             UpdateExpression=update_expr,
             ExpressionAttributeValues=expr_attr_values
         )
+        profile_cache.invalidate(user_id)
         
         return success_response({'message': 'User updated successfully'}, headers)
     
     return error_response(405, 'Method not allowed', headers)
 
 
+def resume_text_error(error: Exception, headers: Dict) -> Dict:
+    """415 for resume formats without an extractor, 400 for other extraction failures"""
+    status = 415 if isinstance(error, resume_text_stage.UnsupportedFormatError) else 400
+    return error_response(status, str(error), headers)
+
+
+def request_resume_text(body: Dict) -> Any:
+    """
+    Resume text for an analyze/tailor request: resumeText if given, otherwise
+    the extracted text of resumeUrl or of the user's stored upload
+    """
+    if body.get('resumeText'):
+        return body['resumeText']
+    user_id = body.get('userId')
+    resume_url = body.get('resumeUrl')
+    if not resume_url and user_id:
+        resume_url = (profile_cache.get(user_id) or {}).get('resumeUrl')
+    if not resume_url:
+        return None
+    return resume_text_stage.get_resume_text(resume_url, user_id)['text']
+
+
 def handle_resume_request(method: str, path: str, body: Dict, headers: Dict) -> Dict:
     """Handle resume upload and analysis requests"""
-    from bedrock_integration import analyze_resume, tailor_resume_for_job
+    import resume_dedup
+    import resume_upload
     
-    if method == 'POST' and '/analyze' in path:
-        # Analyze resume using AWS Bedrock
-        resume_text = body.get('resumeText')
+    if method == 'POST' and path == '/api/resume/analyze':
+        # ATS scores are computed locally against jobDescription, keywords or the
+        # target role; the model's qualitative review is reused for resubmissions
+        # of the same content (ignoring case and whitespace)
+        import ats_engine
+        
         user_id = body.get('userId')
+        try:
+            resume_text = request_resume_text(body)
+        except resume_text_stage.ResumeTextError as e:
+            return resume_text_error(e, headers)
         
         if not resume_text:
-            return error_response(400, 'Resume text required', headers)
+            return error_response(400, 'Resume text or resumeUrl required', headers)
+        
+        resume_hash = resume_dedup.content_hash(resume_text)
+        user = profile_cache.get(user_id) if user_id else None
+        target = (body.get('jobDescription'), body.get('keywords'),
+                  body.get('targetRole') or (user or {}).get('targetRole'))
+        if user and user.get('resumeHash') == resume_hash and user.get('resumeAnalysis'):
+            # The stored review comes back from DynamoDB with Decimal numbers
+            from dynamo_batch import plain_numbers
+            local = ats_engine.score_resume(resume_text, *target)
+            review = plain_numbers(user['resumeAnalysis'])
+            return success_response(ats_engine.merge_analysis(local, review), headers)
         
-        analysis = analyze_resume(resume_text)
+        analysis, resume_hash, _ = resume_dedup.analyze_resume(resume_text, *target)
         
         # Store analysis results
         if user_id:
             users_table = dynamodb.Table(USERS_TABLE)
             users_table.update_item(
                 Key={'userId': user_id},
-                UpdateExpression="SET resumeAnalysis = :analysis, updatedAt = :updated",
+                UpdateExpression="SET resumeAnalysis = :analysis, resumeHash = :hash, updatedAt = :updated",
                 ExpressionAttributeValues={
                     ':analysis': analysis,
+                    ':hash': resume_hash,
                     ':updated': datetime.utcnow().isoformat()
                 }
             )
+            profile_cache.invalidate(user_id)
         
         return success_response(analysis, headers)
     
-    elif method == 'POST' and '/tailor' in path:
+    elif method == 'POST' and path == '/api/resume/ats-score':
+        # Local keyword/section/format scores only, no model call; accepts a
+        # batch of resume texts under 'resumes'
+        import ats_engine
+        
+        resumes = body.get('resumes')
+        if resumes is not None:
+            if not isinstance(resumes, list) or not resumes or len(resumes) > MAX_ATS_BATCH:
+                return error_response(400, f'resumes must be a list of 1 to {MAX_ATS_BATCH} texts', headers)
+            resumes = [str(text or '') for text in resumes]
+        else:
+            try:
+                resume_text = request_resume_text(body)
+            except resume_text_stage.ResumeTextError as e:
+                return resume_text_error(e, headers)
+            if not resume_text:
+                return error_response(400, 'Resume text, resumeUrl or resumes required', headers)
+            resumes = [resume_text]
+        
+        role = body.get('targetRole')
+        if not role and body.get('userId') and not body.get('jobDescription') and not body.get('keywords'):
+            role = (profile_cache.get(body['userId']) or {}).get('targetRole')
+        keywords = ats_engine.resolve_keywords(body.get('jobDescription'), body.get('keywords'), role)
+        scores = ats_engine.score_resumes(resumes, keywords)
+        
+        if body.get('resumes') is not None:
+            return success_response({'results': scores, 'count': len(scores)}, headers)
+        return success_response(scores[0], headers)
+    
+    elif method == 'POST' and path == '/api/resume/tailor':
         # Tailor resume for specific job
-        resume_text = body.get('resumeText')
         job_description = body.get('jobDescription')
+        try:
+            resume_text = request_resume_text(body)
+        except resume_text_stage.ResumeTextError as e:
+            return resume_text_error(e, headers)
         
         if not resume_text or not job_description:
-            return error_response(400, 'Resume text and job description required', headers)
+            return error_response(400, 'Resume text (or resumeUrl) and job description required', headers)
         
-        tailored_suggestions = tailor_resume_for_job(resume_text, job_description)
+        tailored_suggestions, _ = resume_dedup.tailor_resume_for_job(resume_text, job_description)
         return success_response(tailored_suggestions, headers)
     
-    elif method == 'POST' and '/upload' in path:
-        # Upload resume to S3
+    elif method == 'POST' and path == '/api/resume/upload-url':
+        # Presigned POST form or multipart part URLs; the client sends the file straight to S3
+        try:
+            upload = resume_upload.create_upload(
+                body.get('userId'), body.get('fileName'), body.get('contentType'), body.get('fileSize')
+            )
+        except resume_upload.UploadError as e:
+            return error_response(400, str(e), headers)
+        return success_response(upload, headers)
+    
+    elif method == 'POST' and path == '/api/resume/upload-complete':
+        # Verify the uploaded object and record it on the user
+        user_id = body.get('userId')
+        try:
+            stored = resume_upload.complete_upload(
+                user_id, body.get('key'), body.get('uploadId'), body.get('parts')
+            )
+        except resume_upload.UploadError as e:
+            return error_response(400, str(e), headers)
+        
+        users_table = dynamodb.Table(USERS_TABLE)
+        users_table.update_item(
+            Key={'userId': user_id},
+            UpdateExpression="SET resumeUrl = :url, resumeETag = :etag, updatedAt = :updated",
+            ExpressionAttributeValues={
+                ':url': stored['resumeUrl'],
+                ':etag': stored['eTag'],
+                ':updated': datetime.utcnow().isoformat()
+            }
+        )
+        profile_cache.invalidate(user_id)
+        
+        return success_response(stored, headers)
+    
+    elif method == 'POST' and path == '/api/resume/upload-abort':
+        try:
+            resume_upload.abort_upload(body.get('userId'), body.get('key'), body.get('uploadId'))
+        except resume_upload.UploadError as e:
+            return error_response(400, str(e), headers)
+        return success_response({'aborted': True}, headers)
+    
+    elif method == 'POST' and path == '/api/resume/upload':
+        # Legacy upload of a base64 body through Lambda, kept for older clients;
+        # bounded by the API Gateway and Lambda payload limits, prefer upload-url
         user_id = body.get('userId')
         file_content = body.get('fileContent')  # Base64 encoded
         file_name = body.get('fileName')
@@ -215,13 +427,18 @@ def handle_resume_request(method: str, path: str, body: Dict, headers: Dict) ->
         if not all([user_id, file_content, file_name]):
             return error_response(400, 'User ID, file content, and file name required', headers)
         
+        try:
+            file_bytes = base64.b64decode(file_content, validate=True)
+        except (ValueError, TypeError):
+            return error_response(400, 'fileContent must be base64 encoded', headers)
+        
         # Upload to S3
-        s3_key = f"{user_id}/{file_name}"
+        s3_key = resume_upload.resume_key(user_id, file_name)
         s3.put_object(
             Bucket=RESUMES_BUCKET,
             Key=s3_key,
-            Body=file_content,
-            ContentType='application/pdf'
+            Body=file_bytes,
+            ContentType=body.get('contentType') or 'application/pdf'
         )
         
         # Update user record
@@ -234,6 +451,7 @@ def handle_resume_request(method: str, path: str, body: Dict, headers: Dict) ->
                 ':updated': datetime.utcnow().isoformat()
             }
         )
+        profile_cache.invalidate(user_id)
         
         return success_response({'resumeUrl': s3_key}, headers)
     
@@ -244,26 +462,37 @@ def handle_ai_request(method: str, path: str, body: Dict, headers: Dict) -> Dict
     """Handle AI-powered requests (Bedrock integration)"""
     from bedrock_integration import (
         generate_career_roadmap,
+        build_career_roadmap_prompt,
         get_market_insights,
         generate_interview_questions
     )
+    import batch_inference
     
-    if method == 'POST' and '/career-roadmap' in path:
+    if method == 'POST' and path == '/api/ai/career-roadmap':
         current_role = body.get('currentRole')
         target_role = body.get('targetRole')
         skills = body.get('skills', [])
         
-        roadmap = generate_career_roadmap(current_role, target_role, skills)
+        # A precomputed roadmap applies only if it was built from these exact inputs
+        roadmap = None
+        if body.get('userId'):
+            roadmap = batch_inference.lookup(profile_cache.get(body['userId']), 'generate_career_roadmap',
+                                             build_career_roadmap_prompt(current_role, target_role, skills))
+        if roadmap is None:
+            roadmap = generate_career_roadmap(current_role, target_role, skills)
         return success_response(roadmap, headers)
     
-    elif method == 'POST' and '/market-insights' in path:
+    elif method == 'POST' and path == '/api/ai/market-insights':
         role = body.get('role')
         location = body.get('location')
         
-        insights = get_market_insights(role, location)
+        log_market_query(MARKET_INSIGHTS, role, location)
+        insights = market_store.lookup(MARKET_INSIGHTS, role, location)
+        if insights is None:
+            insights = get_market_insights(role, location)
         return success_response(insights, headers)
     
-    elif method == 'POST' and '/interview-prep' in path:
+    elif method == 'POST' and path == '/api/ai/interview-prep':
         job_id = body.get('jobId')
         job_description = body.get('jobDescription')
         
@@ -278,17 +507,59 @@ def handle_applications_request(method: str, path: str, body: Dict, headers: Dic
     applications_table = dynamodb.Table(APPLICATIONS_TABLE)
     
     if method == 'GET':
+        # One bounded page of a user's applications; nextCursor fetches the next one
         user_id = body.get('userId')
         if not user_id:
             return error_response(400, 'User ID required', headers)
         
-        response = applications_table.query(
-            IndexName='UserIdIndex',
-            KeyConditionExpression='userId = :userId',
-            ExpressionAttributeValues={':userId': user_id}
-        )
-        
-        return success_response(response.get('Items', []), headers)
+        applied_from = body.get('from')
+        applied_to = body.get('to')
+        if applied_to and 'T' not in applied_to:
+            # A date-only upper bound includes the whole day
+            applied_to = f"{applied_to}T23:59:59.999999"
+        descending = str(body.get('order', 'asc')).lower() == 'desc'
+        
+        try:
+            limit = parse_page_size(body.get('limit'))
+            fields = parse_fields(body.get('fields'))
+            fingerprint = query_fingerprint(user_id, applied_from, applied_to, descending, fields)
+            start_key = decode_cursor(body.get('cursor'), fingerprint, APPLICATION_INDEX_KEYS)
+        except PaginationError as e:
+            return error_response(400, str(e), headers)
+        
+        key_condition = 'userId = :userId'
+        values = {':userId': user_id}
+        if applied_from and applied_to:
+            key_condition += ' AND appliedAt BETWEEN :from AND :to'
+            values.update({':from': applied_from, ':to': applied_to})
+        elif applied_from:
+            key_condition += ' AND appliedAt >= :from'
+            values[':from'] = applied_from
+        elif applied_to:
+            key_condition += ' AND appliedAt <= :to'
+            values[':to'] = applied_to
+        
+        query = {
+            'IndexName': 'UserIdIndex',
+            'KeyConditionExpression': key_condition,
+            'ExpressionAttributeValues': values,
+            'Limit': limit,
+            'ScanIndexForward': not descending,
+            **projection_params(fields)
+        }
+        if start_key:
+            if start_key.get('userId') != user_id:
+                return error_response(400, 'Invalid cursor', headers)
+            query['ExclusiveStartKey'] = start_key
+        
+        response = applications_table.query(**query)
+        items = response.get('Items', [])
+        
+        return success_response({
+            'items': items,
+            'count': len(items),
+            'nextCursor': encode_cursor(response.get('LastEvaluatedKey'), fingerprint)
+        }, headers)
     
     elif method == 'POST':
         # Track new application
@@ -323,26 +594,174 @@ def handle_applications_request(method: str, path: str, body: Dict, headers: Dic
     return error_response(405, 'Method not allowed', headers)
 
 
+def handle_applications_bulk_request(method: str, path: str, body: Dict, headers: Dict) -> Dict:
+    """
+    Bulk application import (POST) and status update (PUT)
+    Returns one result per submitted entry, in order
+    """
+    from dynamo_batch import batch_write_items, update_items
+    
+    entries = body.get('applications') if method == 'POST' else body.get('updates')
+    if not isinstance(entries, list) or not entries:
+        field = 'applications' if method == 'POST' else 'updates'
+        return error_response(400, f'A non-empty {field} list is required', headers)
+    if len(entries) > MAX_BULK_APPLICATIONS:
+        return error_response(400, f'At most {MAX_BULK_APPLICATIONS} applications per request', headers)
+    
+    # DynamoDB needs Decimal rather than float for numbers
+    entries = json.loads(json.dumps(entries), parse_float=Decimal)
+    client = dynamodb.meta.client
+    user_id = body.get('userId')
+    results: List[Dict[str, Any]] = []
+    
+    if method == 'POST':
+        now = datetime.utcnow()
+        items = []
+        for index, entry in enumerate(entries):
+            owner = entry.get('userId', user_id) if isinstance(entry, dict) else None
+            if not owner:
+                results.append({'index': index, 'status': 'failed', 'error': 'User ID required'})
+                continue
+            application_id = f"app_{now.timestamp()}_{index}"
+            items.append({
+                **entry,
+                'userId': owner,
+                'applicationId': application_id,
+                'appliedAt': entry.get('appliedAt') or now.isoformat(),
+                'status': entry.get('status') or 'applied'
+            })
+            results.append({'index': index, 'applicationId': application_id})
+        
+        written = batch_write_items(client, APPLICATIONS_TABLE, 'applicationId', items)
+        for result in results:
+            if 'applicationId' in result:
+                error = written.get(result['applicationId'])
+                result.update({'status': 'failed', 'error': error} if error else {'status': 'created'})
+        
+        succeeded = sum(1 for result in results if result['status'] == 'created')
+        return success_response({'created': succeeded, 'failed': len(results) - succeeded, 'results': results}, headers)
+    
+    # Status updates: BatchWriteItem cannot update in place, so run conditional
+    # UpdateItem calls in parallel; the condition rejects unknown applications
+    # and, when userId is given, applications owned by someone else
+    now = datetime.utcnow().isoformat()
+    requests = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get('applicationId') or not entry.get('status'):
+            results.append({'index': index, 'status': 'failed', 'error': 'Application ID and status required'})
+            continue
+        condition = 'attribute_exists(applicationId)'
+        values = {':status': entry['status'], ':updated': now}
+        if user_id:
+            condition += ' AND userId = :userId'
+            values[':userId'] = user_id
+        requests.append({
+            'Key': {'applicationId': entry['applicationId']},
+            'UpdateExpression': 'SET #status = :status, updatedAt = :updated',
+            'ConditionExpression': condition,
+            'ExpressionAttributeNames': {'#status': 'status'},
+            'ExpressionAttributeValues': values
+        })
+        results.append({'index': index, 'applicationId': entry['applicationId']})
+    
+    outcomes = iter(update_items(client, APPLICATIONS_TABLE, requests))
+    for result in results:
+        if 'applicationId' not in result:
+            continue
+        error = next(outcomes)
+        if error == 'ConditionalCheckFailed':
+            result.update({'status': 'failed', 'error': 'Application not found'})
+        elif error:
+            result.update({'status': 'failed', 'error': error})
+        else:
+            result['status'] = 'updated'
+    
+    succeeded = sum(1 for result in results if result['status'] == 'updated')
+    return success_response({'updated': succeeded, 'failed': len(results) - succeeded, 'results': results}, headers)
+
+
 def handle_market_intelligence_request(method: str, path: str, body: Dict, headers: Dict) -> Dict:
     """Handle market intelligence data requests"""
     from bedrock_integration import get_salary_trends, get_skill_demand_forecast
     
-    if method == 'GET' and '/salary-trends' in path:
+    if method == 'GET' and path == '/api/market-intelligence/salary-trends':
         role = body.get('role')
         location = body.get('location')
         
-        trends = get_salary_trends(role, location)
+        log_market_query(SALARY_TRENDS, role, location)
+        trends = market_store.lookup(SALARY_TRENDS, role, location)
+        if trends is None:
+            trends = get_salary_trends(role, location)
         return success_response(trends, headers)
     
-    elif method == 'GET' and '/skill-demand' in path:
+    elif method == 'GET' and path == '/api/market-intelligence/skill-demand':
         skills = body.get('skills', [])
         
         demand_data = get_skill_demand_forecast(skills)
         return success_response(demand_data, headers)
     
+    elif method == 'GET' and path == '/api/market-intelligence/overview':
+        # Fan out the dashboard's AI calls concurrently instead of one after another
+        from async_bedrock import (
+            gather_ai_calls,
+            get_salary_trends_async,
+            get_market_insights_async,
+            get_skill_demand_forecast_async
+        )
+        
+        role = body.get('role')
+        location = body.get('location')
+        skills = body.get('skills', [])
+        
+        # Precomputed results are served from the market store; only misses go to Bedrock
+        log_market_query('overview', role, location)
+        stored = {kind: market_store.lookup(kind, role, location) for kind in (SALARY_TRENDS, MARKET_INSIGHTS)}
+        live_calls = {'skillDemand': get_skill_demand_forecast_async(skills)}
+        if stored[SALARY_TRENDS] is None:
+            live_calls[SALARY_TRENDS] = get_salary_trends_async(role, location)
+        if stored[MARKET_INSIGHTS] is None:
+            live_calls[MARKET_INSIGHTS] = get_market_insights_async(role, location)
+        
+        results = {**stored, **gather_ai_calls(**live_calls)}
+        overview = {key: results[key] for key in (SALARY_TRENDS, MARKET_INSIGHTS, 'skillDemand')}
+        return success_response(overview, headers)
+    
     return error_response(405, 'Method not allowed', headers)
 
 
+# Route table, compiled once at import time.
+# Handlers receive the matched pattern as path, with path parameters merged into body.
+ROUTES = [
+    ('GET', '/api/jobs', handle_jobs_request),
+    ('POST', '/api/jobs/score', handle_jobs_request),
+    ('GET', '/api/users/{userId}', handle_users_request),
+    ('POST', '/api/users', handle_users_request),
+    ('PUT', '/api/users', handle_users_request),
+    ('PUT', '/api/users/{userId}', handle_users_request),
+    ('POST', '/api/resume/analyze', handle_resume_request),
+    ('POST', '/api/resume/tailor', handle_resume_request),
+    ('POST', '/api/resume/ats-score', handle_resume_request),
+    ('POST', '/api/resume/upload', handle_resume_request),
+    ('POST', '/api/resume/upload-url', handle_resume_request),
+    ('POST', '/api/resume/upload-complete', handle_resume_request),
+    ('POST', '/api/resume/upload-abort', handle_resume_request),
+    ('POST', '/api/ai/career-roadmap', handle_ai_request),
+    ('POST', '/api/ai/market-insights', handle_ai_request),
+    ('POST', '/api/ai/interview-prep', handle_ai_request),
+    ('GET', '/api/applications', handle_applications_request),
+    ('POST', '/api/applications', handle_applications_request),
+    ('PUT', '/api/applications', handle_applications_request),
+    ('POST', '/api/applications/bulk', handle_applications_bulk_request),
+    ('PUT', '/api/applications/bulk', handle_applications_bulk_request),
+    ('PUT', '/api/applications/{applicationId}', handle_applications_request),
+    ('GET', '/api/market-intelligence/salary-trends', handle_market_intelligence_request),
+    ('GET', '/api/market-intelligence/skill-demand', handle_market_intelligence_request),
+    ('GET', '/api/market-intelligence/overview', handle_market_intelligence_request),
+]
+
+router = Router(ROUTES)
+
+
 def success_response(data: Any, headers: Dict) -> Dict:
     """Create successful response"""
     return {
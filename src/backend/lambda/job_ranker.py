@@ -0,0 +1,201 @@
+"""
+Local Job Pre-Ranker
+Deterministic, vectorized skill/role/location/industry match used to pick the
+top-K jobs before the weighted LLM score in score_jobs_batch
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Component weights, mirroring the weighting used by the LLM scorer
+SKILLS_WEIGHT = 0.40
+ROLE_WEIGHT = 0.30
+LOCATION_WEIGHT = 0.15
+INDUSTRY_WEIGHT = 0.15
+
+# Share of the skills component that comes from exact skill overlap;
+# the remainder is TF-IDF similarity against the full job text
+SKILL_OVERLAP_SHARE = 0.6
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'of', 'on', 'or', 'our', 'the', 'to', 'we', 'with', 'you', 'your', 'will'
+])
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, keeping tech spellings like c++, c# and node.js"""
+    tokens = (t.rstrip('.') for t in TOKEN_PATTERN.findall(text.lower()))
+    return [t for t in tokens if t and t not in STOP_WORDS]
+
+
+def _normalize(value: str) -> str:
+    return ' '.join(tokenize(value))
+
+
+def _job_skills(job: Dict) -> List[str]:
+    return job.get('requiredSkills') or job.get('skills') or []
+
+
+def _job_text(job: Dict) -> str:
+    return ' '.join([
+        job.get('title', ''),
+        ' '.join(_job_skills(job)),
+        job.get('description', ''),
+        job.get('industry', '')
+    ])
+
+
+class _SparseTerms:
+    """
+    Sparse document-term matrix stored as parallel (row, column, weight) arrays
+    Rows are L2-normalized TF-IDF vectors
+    """
+
+    def __init__(self, documents: List[List[str]], vocabulary: Dict[str, int]):
+        rows: List[int] = []
+        cols: List[int] = []
+        counts: List[int] = []
+        for row, tokens in enumerate(documents):
+            term_counts: Dict[int, int] = {}
+            for token in tokens:
+                col = vocabulary.setdefault(token, len(vocabulary))
+                term_counts[col] = term_counts.get(col, 0) + 1
+            rows.extend([row] * len(term_counts))
+            cols.extend(term_counts.keys())
+            counts.extend(term_counts.values())
+
+        self.n_docs = len(documents)
+        self.vocabulary = vocabulary
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        tf = 1.0 + np.log(np.asarray(counts, dtype=np.float64))
+
+        df = np.bincount(self.cols, minlength=len(vocabulary)).astype(np.float64)
+        self.idf = np.log((1.0 + self.n_docs) / (1.0 + df)) + 1.0
+        weights = tf * self.idf[self.cols]
+        norms = np.sqrt(np.bincount(self.rows, weights=weights ** 2, minlength=self.n_docs))
+        norms[norms == 0] = 1.0
+        self.weights = weights / norms[self.rows]
+
+    def cosine(self, tokens: List[str]) -> np.ndarray:
+        """Cosine similarity of every document against a query token list"""
+        query = np.zeros(len(self.idf), dtype=np.float64)
+        for token in tokens:
+            col = self.vocabulary.get(token)
+            if col is not None:
+                query[col] += 1.0
+        nonzero = query > 0
+        if not nonzero.any():
+            return np.zeros(self.n_docs)
+        query[nonzero] = (1.0 + np.log(query[nonzero])) * self.idf[nonzero]
+        query /= np.linalg.norm(query)
+        return np.bincount(self.rows, weights=self.weights * query[self.cols], minlength=self.n_docs)
+
+
+class JobIndex:
+    """
+    Precomputed feature arrays for a job corpus
+    Build once per job feed, then score any number of user profiles against it
+    """
+
+    def __init__(self, jobs: List[Dict]):
+        self.jobs = jobs
+        self.job_ids = [str(job.get('jobId')) for job in jobs]
+        self._text = _SparseTerms([tokenize(_job_text(job)) for job in jobs], {})
+        self._titles = _SparseTerms([tokenize(job.get('title', '')) for job in jobs], {})
+
+        # Exact skill membership as (job row, skill id) pairs
+        self._skill_ids: Dict[str, int] = {}
+        skill_rows: List[int] = []
+        skill_cols: List[int] = []
+        for row, job in enumerate(jobs):
+            for skill in {_normalize(s) for s in _job_skills(job)} - {''}:
+                skill_rows.append(row)
+                skill_cols.append(self._skill_ids.setdefault(skill, len(self._skill_ids)))
+        self._skill_rows = np.asarray(skill_rows, dtype=np.int64)
+        self._skill_cols = np.asarray(skill_cols, dtype=np.int64)
+        self._skill_counts = np.bincount(self._skill_rows, minlength=len(jobs)).astype(np.float64)
+
+        self._locations = np.asarray([_normalize(job.get('location', '')) for job in jobs], dtype=str)
+        self._remote = np.asarray([
+            bool(job.get('remote')) or 'remote' in loc for job, loc in zip(jobs, self._locations)
+        ], dtype=bool)
+        self._industries = np.asarray([_normalize(job.get('industry', '')) for job in jobs], dtype=str)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def _skill_overlap(self, user_skills: List[str]) -> np.ndarray:
+        """Fraction of each job's required skills that the user has"""
+        user_ids = [self._skill_ids[s] for s in {_normalize(s) for s in user_skills} if s in self._skill_ids]
+        if not user_ids or not len(self._skill_cols):
+            return np.zeros(len(self.jobs))
+        has_skill = np.isin(self._skill_cols, user_ids).astype(np.float64)
+        matched = np.bincount(self._skill_rows, weights=has_skill, minlength=len(self.jobs))
+        return np.divide(matched, self._skill_counts, out=np.zeros(len(self.jobs)), where=self._skill_counts > 0)
+
+    def _membership(self, values: np.ndarray, wanted: List[str]) -> np.ndarray:
+        wanted_norm = {_normalize(w) for w in wanted} - {''}
+        if not wanted_norm or not len(values):
+            return np.zeros(len(values))
+        exact = np.isin(values, list(wanted_norm))
+        # Partial matches such as "seattle wa" against a "seattle" preference
+        partial = np.zeros(len(values), dtype=bool)
+        for wanted_value in wanted_norm:
+            partial |= np.char.find(values, wanted_value) >= 0
+        return np.where(exact, 1.0, np.where(partial, 0.75, 0.0))
+
+    def score(self, user_profile: Dict) -> np.ndarray:
+        """Local compatibility scores (0-100) for every job in the index"""
+        if not self.jobs:
+            return np.zeros(0)
+
+        preferences = user_profile.get('preferences', {}) or {}
+        skills = user_profile.get('skills', []) or []
+
+        skill_score = (
+            SKILL_OVERLAP_SHARE * self._skill_overlap(skills)
+            + (1 - SKILL_OVERLAP_SHARE) * self._text.cosine(tokenize(' '.join(skills)))
+        )
+        role_score = self._titles.cosine(tokenize(user_profile.get('targetRole', '') or ''))
+
+        locations = preferences.get('locations', []) or []
+        location_score = self._membership(self._locations, locations)
+        if any(_normalize(loc) == 'remote' for loc in locations):
+            location_score = np.maximum(location_score, self._remote.astype(np.float64))
+        industry_score = self._membership(self._industries, preferences.get('industries', []) or [])
+
+        total = (
+            SKILLS_WEIGHT * skill_score
+            + ROLE_WEIGHT * role_score
+            + LOCATION_WEIGHT * location_score
+            + INDUSTRY_WEIGHT * industry_score
+        )
+        return np.clip(np.round(total * 100), 0, 100)
+
+    def top_k(self, user_profile: Dict, k: Optional[int] = None) -> List[Tuple[Dict, int]]:
+        """Jobs ordered by local score (best first), truncated to k"""
+        scores = self.score(user_profile)
+        k = len(scores) if k is None else min(k, len(scores))
+        if k <= 0:
+            return []
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(len(scores))
+        # Stable ordering: by score, then by original feed position
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(self.jobs[i], int(scores[i])) for i in order]
+
+
+def rank_jobs(user_profile: Dict, jobs: List[Dict], top_k: Optional[int] = None) -> List[Tuple[Dict, int]]:
+    """
+    Rank jobs for a user with the local scorer
+    Returns (job, score) pairs, best first
+    """
+    return JobIndex(jobs).top_k(user_profile, top_k)
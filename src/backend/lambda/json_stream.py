@@ -0,0 +1,210 @@
+"""
+Incremental JSON Extraction for Model Output
+Consumes model text chunk by chunk and emits each complete JSON value (or each
+element of a top-level array) as soon as it closes, ignoring surrounding prose
+"""
+
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Optional
+
+# Characters that matter outside / inside a JSON string
+_STRUCTURAL = re.compile(r'["{}\[\],]')
+_IN_STRING = re.compile(r'["\\]')
+
+_OPENERS = {'{': '}', '[': ']'}
+_EXPECT_OPENERS = {'object': '{', 'array': '['}
+
+
+class IncrementalJSONParser:
+    """
+    Streaming extractor for the first JSON value in model output
+
+    expect: 'object', 'array' or None (either) - which value to look for
+    items:  when True (arrays only), each top-level array element is emitted as
+            soon as it closes instead of emitting the whole array at the end
+
+    Candidates that turn out not to be valid JSON (e.g. a stray brace in prose)
+    are discarded and scanning resumes after them.
+    """
+
+    def __init__(self, expect: Optional[str] = None, items: bool = False):
+        if expect not in (None, 'object', 'array'):
+            raise ValueError(f"Unsupported expect value: {expect}")
+        if items and expect != 'array':
+            raise ValueError("items=True requires expect='array'")
+        self.openers = _EXPECT_OPENERS[expect] if expect else '{['
+        self.items = items
+        self.complete = False
+        self._buffer = ''
+        self._pos = 0
+        self._reset_candidate()
+
+    def _reset_candidate(self) -> None:
+        self._start = -1
+        self._stack: List[str] = []
+        self._in_string = False
+        self._element_start = -1
+
+    def _discard_candidate(self) -> None:
+        """Drop an invalid candidate and resume scanning just after its opener"""
+        self._pos = self._start + 1
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        self._reset_candidate()
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume the next chunk of text and return any newly completed values"""
+        if self.complete:
+            return []
+        self._buffer += chunk
+        completed: List[Any] = []
+
+        while not self.complete:
+            if self._start < 0:
+                if not self._scan_for_opener():
+                    break
+                continue
+
+            if self._in_string:
+                match = _IN_STRING.search(self._buffer, self._pos)
+                if not match:
+                    self._pos = len(self._buffer)
+                    break
+                if match.group() == '\\':
+                    if match.end() >= len(self._buffer):
+                        # Escape split across chunks; wait for the next one
+                        self._pos = match.start()
+                        break
+                    self._pos = match.end() + 1
+                else:
+                    self._in_string = False
+                    self._pos = match.end()
+                continue
+
+            match = _STRUCTURAL.search(self._buffer, self._pos)
+            if not match:
+                self._pos = len(self._buffer)
+                break
+            char = match.group()
+            self._pos = match.end()
+
+            if char == '"':
+                self._mark_element_start(match.start())
+                self._in_string = True
+            elif char in _OPENERS:
+                self._mark_element_start(match.start())
+                self._stack.append(_OPENERS[char])
+            elif char in '}]':
+                if char != self._stack[-1]:
+                    self._discard_candidate()
+                    continue
+                if self._top_level_array() and char == ']':
+                    if not self._emit_element(match.start(), completed):
+                        continue
+                self._stack.pop()
+                if not self._stack:
+                    self._finish_candidate(completed)
+            elif char == ',' and self._top_level_array():
+                self._emit_element(match.start(), completed)
+
+        return completed
+
+    def _scan_for_opener(self) -> bool:
+        positions = [p for p in (self._buffer.find(o, self._pos) for o in self.openers) if p >= 0]
+        if not positions:
+            # Nothing to keep: prose before the JSON value is dropped
+            self._buffer = ''
+            self._pos = 0
+            return False
+        start = min(positions)
+        self._buffer = self._buffer[start:]
+        self._start = 0
+        self._pos = 1
+        self._stack = [_OPENERS[self._buffer[0]]]
+        return True
+
+    def _top_level_array(self) -> bool:
+        return self.items and len(self._stack) == 1
+
+    def _mark_element_start(self, index: int) -> None:
+        if self._top_level_array() and self._element_start < 0:
+            self._element_start = index
+
+    def _emit_element(self, end: int, completed: List[Any]) -> bool:
+        """Parse the top-level array element ending at end; False if the candidate was discarded"""
+        text = self._buffer[self._element_start:end].strip() if self._element_start >= 0 else ''
+        if not text:
+            # Scalars have no structural start marker, so recover them from the text
+            text = self._buffer[self._last_separator(end):end].strip()
+        self._element_start = -1
+        if not text:
+            return True
+        try:
+            completed.append(json.loads(text))
+            return True
+        except ValueError:
+            self._discard_candidate()
+            return False
+
+    def _last_separator(self, end: int) -> int:
+        index = max(self._buffer.rfind(',', 0, end), self._buffer.rfind('[', 0, end))
+        return index + 1
+
+    def _finish_candidate(self, completed: List[Any]) -> None:
+        text = self._buffer[self._start:self._pos]
+        if self.items:
+            self.complete = True
+            return
+        try:
+            completed.append(json.loads(text))
+            self.complete = True
+        except ValueError:
+            self._discard_candidate()
+
+
+def extract_json(text: str, expect: Optional[str] = None) -> Optional[Any]:
+    """
+    Return the first valid JSON value of the expected kind in text, or None
+    """
+    parser = IncrementalJSONParser(expect=expect)
+    values = parser.feed(text)
+    return values[0] if values else None
+
+
+def iter_json_items(chunks: Iterable[str]) -> Iterator[Any]:
+    """
+    Yield each element of the first top-level JSON array in a chunk stream as
+    soon as it closes. Stops consuming (and closes) the source once the array
+    is complete, so a streamed generation is cut off at the closing bracket.
+    """
+    parser = IncrementalJSONParser(expect='array', items=True)
+    iterator = iter(chunks)
+    try:
+        for chunk in iterator:
+            yield from parser.feed(chunk)
+            if parser.complete:
+                break
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close:
+            close()
+
+
+def collect_json(chunks: Iterable[str], expect: Optional[str] = None) -> Optional[Any]:
+    """
+    Return the first complete JSON value from a chunk stream, closing the
+    source as soon as the value closes. Returns None if none is found.
+    """
+    parser = IncrementalJSONParser(expect=expect)
+    iterator = iter(chunks)
+    try:
+        for chunk in iterator:
+            values = parser.feed(chunk)
+            if values:
+                return values[0]
+        return None
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close:
+            close()
@@ -0,0 +1,415 @@
+"""
+Mailbox Scanning Pipeline
+Streams an mbox file, Maildir or batch of raw messages through
+analyze_email_for_interview. Duplicate Message-IDs are dropped, each thread is
+analyzed once over its new messages, model calls run with bounded
+concurrency, detected interviews are written to INTERVIEWS_TABLE in batches,
+and a per-thread checkpoint lets reruns handle only new mail.
+"""
+
+import io
+import os
+import re
+import json
+import time
+import email
+import hashlib
+import mailbox
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from decimal import Decimal
+from email import policy
+from email.parser import BytesHeaderParser
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+import logging
+
+from aws_clients import get_client
+from dynamo_batch import batch_write_items
+
+logger = logging.getLogger()
+
+# Environment configuration
+INTERVIEWS_TABLE = os.environ.get('INTERVIEWS_TABLE', 'CareerAgentInterviews')
+CHECKPOINT_BUCKET = os.environ.get('RESUMES_BUCKET', 'career-agent-resumes')
+CHECKPOINT_PREFIX = os.environ.get('MAILBOX_CHECKPOINT_PREFIX', 'mailbox-checkpoints')
+SCAN_CONCURRENCY = int(os.environ.get('MAILBOX_SCAN_CONCURRENCY', '8'))
+CHECKPOINT_EVERY = int(os.environ.get('MAILBOX_CHECKPOINT_EVERY', '200'))
+WRITE_BATCH_SIZE = int(os.environ.get('MAILBOX_WRITE_BATCH_SIZE', '100'))
+
+# Text passed to the analyzer per thread (the prefilter sees all of it,
+# the model prompt takes the first 1000 characters)
+MAX_EMAIL_CHARS = 20000
+# New messages of one thread analyzed together, newest first, so an invite
+# followed by a short reply ("Thanks, confirmed") is still seen
+THREAD_MESSAGES = int(os.environ.get('MAILBOX_THREAD_MESSAGES', '5'))
+THREAD_SEPARATOR = '\n\n-----\n\n'
+
+CHECKPOINT_VERSION = 1
+
+_MESSAGE_ID = re.compile(r'<[^<>\s]+>')
+_TAG = re.compile(r'<(script|style)\b.*?</\1>|<[^>]+>', re.IGNORECASE | re.DOTALL)
+
+
+class MessageRef(NamedTuple):
+    key: Any
+    message_id: str
+    thread: str
+    received: float
+    subject: str
+    sender: str
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()[:24]
+
+
+def _header(headers: email.message.Message, name: str) -> str:
+    value = headers.get(name)
+    return ' '.join(str(value).split()) if value is not None else ''
+
+
+def message_ref(key: Any, headers: email.message.Message) -> MessageRef:
+    """
+    Identity of one message from its headers
+    The thread is Gmail's X-GM-THRID when present, else the root of References
+    (or In-Reply-To), else the message itself
+    """
+    subject = _header(headers, 'Subject')
+    sender = _header(headers, 'From')
+    try:
+        received = parsedate_to_datetime(_header(headers, 'Date')).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        received = 0.0
+
+    message_id = (_MESSAGE_ID.findall(_header(headers, 'Message-ID')) or [''])[0]
+    if not message_id:
+        # No Message-ID: identical sender, date and subject are treated as one message
+        message_id = 'hdr:' + _digest(f"{sender}\n{_header(headers, 'Date')}\n{subject}")
+
+    gmail_thread = _header(headers, 'X-GM-THRID')
+    if gmail_thread:
+        thread = 'gm:' + gmail_thread
+    else:
+        parents = _MESSAGE_ID.findall(_header(headers, 'References')) or \
+            _MESSAGE_ID.findall(_header(headers, 'In-Reply-To'))
+        thread = parents[0] if parents else message_id
+    return MessageRef(key, message_id, _digest(thread), received, subject, sender)
+
+
+def read_headers(box: Any, key: Any) -> email.message.Message:
+    """Parse only the header block of a stored message"""
+    lines = []
+    f = box.get_file(key)
+    try:
+        for line in f:
+            if line in (b'\n', b'\r\n'):
+                break
+            lines.append(line)
+    finally:
+        f.close()
+    return BytesHeaderParser().parsebytes(b''.join(lines))
+
+
+def email_text(raw: bytes) -> str:
+    """Headers the analyzer cares about plus the plain-text body (HTML stripped as a fallback)"""
+    message = email.message_from_bytes(raw, policy=policy.default)
+    body = message.get_body(preferencelist=('plain', 'html'))
+    text = ''
+    if body is not None:
+        try:
+            text = body.get_content()
+        except (LookupError, ValueError):
+            text = body.get_payload(decode=True).decode('utf-8', errors='replace')
+        if body.get_content_subtype() == 'html':
+            text = _TAG.sub(' ', text)
+    text = '\n'.join(line.strip() for line in text.splitlines() if line.strip())
+    head = '\n'.join(f"{name}: {_header(message, name)}" for name in ('Subject', 'From', 'Date'))
+    return f"{head}\n\n{text}"[:MAX_EMAIL_CHARS]
+
+
+class RawMessages:
+    """Mailbox-like view over raw RFC 822 messages (e.g. fetched from the Gmail API)"""
+
+    def __init__(self, messages: Iterable[Tuple[Any, bytes]]):
+        self._messages = dict(messages)
+
+    def iterkeys(self):
+        return iter(self._messages)
+
+    def get_bytes(self, key: Any) -> bytes:
+        return self._messages[key]
+
+    def get_file(self, key: Any):
+        return io.BytesIO(self._messages[key])
+
+
+def open_mailbox(path: str) -> mailbox.Mailbox:
+    """Maildir for a directory, mbox for a file"""
+    if os.path.isdir(path):
+        return mailbox.Maildir(path, factory=None, create=False)
+    return mailbox.mbox(path, factory=None, create=False)
+
+
+class Checkpoint:
+    """
+    Per-thread high-water marks: thread digest -> [received, message digest]
+    A message is new when its thread is unknown or it is newer than the last
+    message analyzed in that thread
+    """
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None):
+        state = state if state and state.get('version') == CHECKPOINT_VERSION else {}
+        self.threads: Dict[str, List] = state.get('threads', {})
+        self.analyzed = state.get('analyzed', 0)
+
+    def is_new(self, ref: MessageRef) -> bool:
+        mark = self.threads.get(ref.thread)
+        if mark is None:
+            return True
+        return ref.received > mark[0] or (ref.received == mark[0] and _digest(ref.message_id) != mark[1])
+
+    def mark(self, ref: MessageRef) -> None:
+        mark = self.threads.get(ref.thread)
+        if mark is None or ref.received >= mark[0]:
+            self.threads[ref.thread] = [ref.received, _digest(ref.message_id)]
+        self.analyzed += 1
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            'version': CHECKPOINT_VERSION,
+            'threads': self.threads,
+            'analyzed': self.analyzed,
+            'updatedAt': datetime.now(timezone.utc).isoformat()
+        }
+
+
+class FileCheckpointStore:
+    """Checkpoint kept in a local JSON file (CLI runs and benchmarks)"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, state: Dict[str, Any]) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+
+class S3CheckpointStore:
+    """Checkpoint kept as one S3 object per user"""
+
+    def __init__(self, user_id: str, bucket: str = CHECKPOINT_BUCKET, prefix: str = CHECKPOINT_PREFIX):
+        self.bucket = bucket
+        self.key = f"{prefix}/{user_id}.json"
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            body = get_client('s3').get_object(Bucket=self.bucket, Key=self.key)['Body']
+            return json.loads(body.read())
+        except Exception as e:
+            if getattr(e, 'response', {}).get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    def save(self, state: Dict[str, Any]) -> None:
+        get_client('s3').put_object(Bucket=self.bucket, Key=self.key, ContentType='application/json',
+                                    Body=json.dumps(state, separators=(',', ':')).encode('utf-8'))
+
+
+def dynamo_sink(items: List[Dict]) -> Dict[str, Optional[str]]:
+    """Write interview items with BatchWriteItem; returns interviewId -> None or an error"""
+    return batch_write_items(get_client('dynamodb'), INTERVIEWS_TABLE, 'interviewId', items)
+
+
+def _dynamo_value(value: Any) -> Any:
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: _dynamo_value(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_dynamo_value(v) for v in value]
+    return value
+
+
+def interview_item(user_id: str, ref: MessageRef, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Interviews table item; one per thread, so reruns overwrite rather than duplicate"""
+    details = result.get('interviewDetails')
+    return _dynamo_value({
+        'interviewId': f"{user_id}#{ref.thread}",
+        'userId': user_id,
+        'threadId': ref.thread,
+        'messageId': ref.message_id,
+        'subject': ref.subject[:500],
+        'sender': ref.sender[:500],
+        'receivedAt': datetime.fromtimestamp(ref.received, timezone.utc).isoformat() if ref.received else None,
+        'confidence': result.get('confidence'),
+        'interviewDetails': details if isinstance(details, dict) else {},
+        'suggestedAction': result.get('suggestedAction'),
+        'status': 'detected',
+        'detectedAt': datetime.now(timezone.utc).isoformat()
+    })
+
+
+def thread_text(raws: List[bytes]) -> str:
+    """Text of a thread's messages (given newest first), adding older ones while they fit MAX_EMAIL_CHARS"""
+    parts: List[str] = []
+    length = 0
+    for raw in raws:
+        text = email_text(raw)
+        if parts and length + len(THREAD_SEPARATOR) + len(text) > MAX_EMAIL_CHARS:
+            break
+        parts.append(text)
+        length += len(THREAD_SEPARATOR) + len(text)
+    return THREAD_SEPARATOR.join(parts)[:MAX_EMAIL_CHARS]
+
+
+def _analyze_raw(analyze: Callable[[str], Dict], raws: List[bytes]) -> Dict:
+    return analyze(thread_text(raws))
+
+
+def plan_scan(box: Any, checkpoint: Checkpoint, counts: Dict[str, int]) -> List[List[MessageRef]]:
+    """
+    First pass over headers only: drop duplicate Message-IDs and mail already
+    covered by the checkpoint, and group the new messages by thread.
+    Returns each thread's newest THREAD_MESSAGES new messages (newest first),
+    threads with the most recent mail first
+    """
+    seen: Set[str] = set()
+    threads: Dict[str, List[MessageRef]] = {}
+    for key in box.iterkeys():
+        try:
+            ref = message_ref(key, read_headers(box, key))
+        except Exception as e:
+            logger.warning(f"Skipping unreadable message {key}: {str(e)}")
+            counts['unreadable'] += 1
+            continue
+        counts['messages'] += 1
+        if ref.message_id in seen:
+            counts['duplicates'] += 1
+            continue
+        seen.add(ref.message_id)
+        if not checkpoint.is_new(ref):
+            counts['alreadyScanned'] += 1
+            continue
+        threads.setdefault(ref.thread, []).append(ref)
+        counts['threadCollapsed'] += 1
+    counts['threadCollapsed'] -= len(threads)
+    # Stable sort: of messages with the same Date, the later one in the mailbox counts as newer
+    grouped = [sorted(reversed(refs), key=lambda ref: -ref.received)[:THREAD_MESSAGES] for refs in threads.values()]
+    return sorted(grouped, key=lambda refs: -refs[0].received)
+
+
+def scan_mailbox(box: Any, user_id: str, store: Any = None, analyze: Optional[Callable[[str], Dict]] = None,
+                 sink: Callable[[List[Dict]], Dict[str, Optional[str]]] = dynamo_sink,
+                 concurrency: int = SCAN_CONCURRENCY, checkpoint_every: int = CHECKPOINT_EVERY,
+                 write_batch_size: int = WRITE_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Scan one user's mailbox for interview invitations
+    box is a mailbox.Mailbox (see open_mailbox) or RawMessages; store loads and
+    saves the checkpoint (None scans everything every time). Messages are read
+    on this thread and analyzed on at most `concurrency` workers, with at most
+    twice that many threads loaded at once. A thread's new messages are
+    analyzed together and recorded against the newest one. Pending interview writes are flushed before
+    each checkpoint save, and a thread is only checkpointed once its analysis
+    and write succeeded (an analyzer that raises or returns a result with an
+    'error' key has failed), so an interrupted or failed run is picked up next time.
+    Returns run counts
+    """
+    if analyze is None:
+        from bedrock_integration import analyze_email_for_interview
+        analyze = analyze_email_for_interview
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1')
+
+    started = time.perf_counter()
+    counts = {name: 0 for name in ('messages', 'unreadable', 'duplicates', 'alreadyScanned', 'threadCollapsed',
+                                   'analyzed', 'prefiltered', 'failed', 'interviews', 'writeErrors')}
+    checkpoint = Checkpoint(store.load() if store else None)
+    threads = plan_scan(box, checkpoint, counts)
+
+    pending_items: List[Dict] = []
+    finished: List[Tuple[MessageRef, Optional[str]]] = []
+    failed_writes: Set[str] = set()
+
+    def flush() -> None:
+        if not pending_items:
+            return
+        for key, error in sink(list(pending_items)).items():
+            if error:
+                logger.error(f"Failed to write interview {key}: {error}")
+                failed_writes.add(key)
+        pending_items.clear()
+
+    def commit() -> None:
+        flush()
+        counts['writeErrors'] = len(failed_writes)
+        for ref, item_key in finished:
+            if item_key not in failed_writes:
+                checkpoint.mark(ref)
+        finished.clear()
+        if store:
+            store.save(checkpoint.state())
+
+    def complete(future, ref: MessageRef) -> None:
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"Email analysis failed for {ref.message_id}: {str(e)}")
+            counts['failed'] += 1
+            return
+        if result.get('error'):
+            # Fallback result from a failed model call; leave the thread for the next run
+            logger.error(f"Email analysis failed for {ref.message_id}: {result['error']}")
+            counts['failed'] += 1
+            return
+        counts['analyzed'] += 1
+        if result.get('prefiltered'):
+            counts['prefiltered'] += 1
+        item_key = None
+        if result.get('isInterview'):
+            item = interview_item(user_id, ref, result)
+            item_key = item['interviewId']
+            pending_items.append(item)
+            counts['interviews'] += 1
+            if len(pending_items) >= write_batch_size:
+                flush()
+        finished.append((ref, item_key))
+        if len(finished) >= checkpoint_every:
+            commit()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='mailbox') as pool:
+        in_flight: Dict[Any, MessageRef] = {}
+        for refs in threads:
+            if len(in_flight) >= concurrency * 2:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    complete(future, in_flight.pop(future))
+            readable: List[Tuple[MessageRef, bytes]] = []
+            for ref in refs:
+                try:
+                    readable.append((ref, box.get_bytes(ref.key)))
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable message {ref.key}: {str(e)}")
+                    counts['unreadable'] += 1
+            if not readable:
+                continue
+            # An unreadable newer message stays past the checkpoint and is retried next run
+            in_flight[pool.submit(_analyze_raw, analyze, [raw for _, raw in readable])] = readable[0][0]
+        for future in list(in_flight):
+            complete(future, in_flight.pop(future))
+    commit()
+
+    seconds = time.perf_counter() - started
+    counts['seconds'] = round(seconds, 3)
+    counts['messagesPerSecond'] = round(counts['messages'] / seconds, 1) if seconds > 0 else 0.0
+    logger.info(f"Mailbox scan for {user_id}: {json.dumps(counts)}")
+    return counts
@@ -0,0 +1,224 @@
+"""
+Precomputed Market Intelligence Store
+Serves salary trends and market insights for popular (role, location) pairs
+from a versioned, gzip-compressed JSON snapshot built offline by
+scripts/precompute_market_intel.py. Lookups are in-memory dict hits; callers
+fall back to live generation on a miss.
+
+Layout under MARKET_STORE_URI (s3://bucket/prefix or a local directory):
+    v<version>.json.gz   immutable snapshot
+    LATEST               name of the current snapshot file
+"""
+
+import os
+import json
+import gzip
+import time
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+import logging
+
+from aws_clients import get_client
+
+logger = logging.getLogger()
+
+# Environment configuration
+MARKET_STORE_URI = os.environ.get('MARKET_STORE_URI', '')
+REFRESH_SECONDS = float(os.environ.get('MARKET_STORE_REFRESH_SECONDS', '900'))
+
+SCHEMA_VERSION = 1
+LATEST_POINTER = 'LATEST'
+
+# Result kinds kept per pair, named as in the overview response
+SALARY_TRENDS = 'salaryTrends'
+MARKET_INSIGHTS = 'marketInsights'
+KINDS = (SALARY_TRENDS, MARKET_INSIGHTS)
+
+# Prefix of the structured log line the precompute pipeline mines for traffic
+QUERY_LOG_PREFIX = 'MARKET_QUERY '
+
+
+def _fold(value: Optional[str]) -> str:
+    return ' '.join((value or '').split()).lower()
+
+
+def pair_key(role: Optional[str], location: Optional[str]) -> str:
+    """Store key for a (role, location) pair, case- and whitespace-folded"""
+    return f"{_fold(role)}|{_fold(location)}"
+
+
+def log_market_query(kind: str, role: Optional[str], location: Optional[str]) -> None:
+    """Emit the structured traffic line consumed by the precompute pipeline"""
+    logger.info(QUERY_LOG_PREFIX + json.dumps({'kind': kind, 'role': role, 'location': location}))
+
+
+def build_snapshot(entries: Dict[Tuple[str, str], Dict[str, Any]], version: str) -> Dict[str, Any]:
+    """
+    Snapshot document from {(role, location): {'salaryTrends': ..., 'marketInsights': ...}}
+    """
+    return {
+        'schema': SCHEMA_VERSION,
+        'version': version,
+        'generatedAt': int(time.time()),
+        'entries': {
+            pair_key(role, location): {kind: data[kind] for kind in KINDS if data.get(kind)}
+            for (role, location), data in entries.items()
+        }
+    }
+
+
+def encode_snapshot(snapshot: Dict[str, Any]) -> bytes:
+    return gzip.compress(json.dumps(snapshot, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_snapshot(data: bytes) -> Dict[str, Any]:
+    snapshot = json.loads(gzip.decompress(data))
+    if snapshot.get('schema') != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported market store schema: {snapshot.get('schema')}")
+    return snapshot
+
+
+def _split_s3(uri: str) -> Tuple[str, str]:
+    bucket, _, prefix = uri[len('s3://'):].partition('/')
+    return bucket, prefix.strip('/')
+
+
+def read_object(uri: str, name: str) -> bytes:
+    if uri.startswith('s3://'):
+        bucket, prefix = _split_s3(uri)
+        key = f"{prefix}/{name}" if prefix else name
+        return get_client('s3').get_object(Bucket=bucket, Key=key)['Body'].read()
+    with open(os.path.join(uri, name), 'rb') as f:
+        return f.read()
+
+
+def write_object(uri: str, name: str, data: bytes) -> None:
+    if uri.startswith('s3://'):
+        bucket, prefix = _split_s3(uri)
+        key = f"{prefix}/{name}" if prefix else name
+        get_client('s3').put_object(Bucket=bucket, Key=key, Body=data)
+        return
+    os.makedirs(uri, exist_ok=True)
+    path = os.path.join(uri, name)
+    with open(path + '.tmp', 'wb') as f:
+        f.write(data)
+    os.replace(path + '.tmp', path)
+
+
+def publish(snapshot: Dict[str, Any], uri: str = MARKET_STORE_URI) -> str:
+    """Write an immutable snapshot, then switch LATEST to it. Returns the snapshot name"""
+    name = f"v{snapshot['version']}.json.gz"
+    write_object(uri, name, encode_snapshot(snapshot))
+    write_object(uri, LATEST_POINTER, name.encode('utf-8'))
+    return name
+
+
+def load_latest(uri: str = MARKET_STORE_URI) -> Optional[Dict[str, Any]]:
+    """Current snapshot under uri, or None if nothing has been published"""
+    try:
+        name = read_object(uri, LATEST_POINTER).decode('utf-8').strip()
+    except (FileNotFoundError, KeyError):
+        return None
+    except Exception as e:
+        if getattr(e, 'response', {}).get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+            return None
+        raise
+    return decode_snapshot(read_object(uri, name))
+
+
+class MarketStore:
+    """
+    In-memory view of the latest snapshot, loaded on first lookup and
+    re-checked every refresh_seconds
+    """
+
+    def __init__(self, uri: str = MARKET_STORE_URI, refresh_seconds: float = REFRESH_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.uri = uri
+        self.refresh_seconds = refresh_seconds
+        self.clock = clock
+        self.version: Optional[str] = None
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.uri)
+
+    def _maybe_refresh(self) -> None:
+        now = self.clock()
+        if self._loaded_at is not None and now - self._loaded_at < self.refresh_seconds:
+            return
+        with self._lock:
+            if self._loaded_at is not None and now - self._loaded_at < self.refresh_seconds:
+                return
+            # Set first so a failing store is retried once per interval, not per request
+            self._loaded_at = now
+            try:
+                snapshot = load_latest(self.uri)
+            except Exception as e:
+                logger.warning(f"Market store load failed, serving live results: {str(e)}")
+                return
+            if snapshot is None or snapshot.get('version') == self.version:
+                return
+            self._entries = snapshot.get('entries', {})
+            self.version = snapshot.get('version')
+            logger.info(f"Market store loaded version {self.version} with {len(self._entries)} pairs")
+
+    def lookup(self, kind: str, role: Optional[str], location: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Precomputed result for a pair, or None on a miss"""
+        if not self.enabled:
+            return None
+        self._maybe_refresh()
+        entry = self._entries.get(pair_key(role, location))
+        result = entry.get(kind) if entry else None
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def load(self, snapshot: Dict[str, Any]) -> None:
+        """Serve an in-memory snapshot directly (tests and local runs)"""
+        with self._lock:
+            self._entries = snapshot.get('entries', {})
+            self.version = snapshot.get('version')
+            self._loaded_at = self.clock()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'version': self.version,
+            'pairs': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def count_queries(lines: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Count MARKET_QUERY log lines per pair key
+    Returns {key: {'count', 'role', 'location'}} keeping the first-seen spelling
+    """
+    counts: Dict[str, Dict[str, Any]] = {}
+    for line in lines:
+        index = line.find(QUERY_LOG_PREFIX)
+        if index < 0:
+            continue
+        try:
+            query = json.loads(line[index + len(QUERY_LOG_PREFIX):])
+        except ValueError:
+            continue
+        if not query.get('role'):
+            continue
+        key = pair_key(query.get('role'), query.get('location'))
+        entry = counts.setdefault(key, {'count': 0, 'role': query.get('role'), 'location': query.get('location')})
+        entry['count'] += 1
+    return counts
+
+
+market_store = MarketStore()
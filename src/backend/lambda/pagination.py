@@ -0,0 +1,92 @@
+"""
+Cursor Pagination Helpers for DynamoDB Queries
+Opaque page tokens wrapping LastEvaluatedKey, page-size limits and
+field projection for list endpoints
+"""
+
+import re
+import json
+import base64
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+# Page size limits
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+MAX_PROJECTED_FIELDS = 20
+
+_FIELD_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+class PaginationError(ValueError):
+    """Invalid pagination parameter; surfaced to the client as a 400"""
+
+
+def query_fingerprint(*parts: Any) -> str:
+    """Short digest of the query a cursor belongs to"""
+    return hashlib.sha256(json.dumps(parts, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def encode_cursor(last_evaluated_key: Optional[Dict[str, Any]], fingerprint: str) -> Optional[str]:
+    """Opaque token for the next page, or None when there is no next page"""
+    if not last_evaluated_key:
+        return None
+    payload = json.dumps({'k': last_evaluated_key, 'q': fingerprint}, separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: Optional[str], fingerprint: str, key_names: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+    """
+    ExclusiveStartKey from a token issued for the same query
+    Raises PaginationError for malformed tokens or tokens from another query
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        key = payload['k']
+    except (ValueError, KeyError, TypeError):
+        raise PaginationError('Invalid cursor')
+    if payload.get('q') != fingerprint:
+        raise PaginationError('Cursor does not match this query')
+    if not isinstance(key, dict) or set(key) - set(key_names):
+        raise PaginationError('Invalid cursor')
+    return key
+
+
+def parse_page_size(value: Any, default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    if value in (None, ''):
+        return default
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError('limit must be an integer')
+    if size < 1:
+        raise PaginationError('limit must be at least 1')
+    return min(size, maximum)
+
+
+def parse_fields(value: Any) -> List[str]:
+    """Requested attribute names from a comma-separated string or a list"""
+    if not value:
+        return []
+    fields = value.split(',') if isinstance(value, str) else list(value)
+    fields = list(dict.fromkeys(str(field).strip() for field in fields if str(field).strip()))
+    if len(fields) > MAX_PROJECTED_FIELDS:
+        raise PaginationError(f'At most {MAX_PROJECTED_FIELDS} fields can be requested')
+    for field in fields:
+        if not _FIELD_NAME.match(field):
+            raise PaginationError(f'Invalid field name: {field}')
+    return fields
+
+
+def projection_params(fields: List[str]) -> Dict[str, Any]:
+    """ProjectionExpression and placeholder names (field names may be reserved words)"""
+    if not fields:
+        return {}
+    names = {f'#f{i}': field for i, field in enumerate(fields)}
+    return {
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names
+    }
@@ -0,0 +1,78 @@
+"""
+Read-Through User Profile Cache
+Keeps recently read CareerAgentUsers items in the container so hot users do
+not cost a DynamoDB read per request. Writers invalidate the entry; other
+containers see the change once their entry's TTL expires.
+"""
+
+import os
+import copy
+import time
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from response_cache import LRUCache
+
+# Environment configuration
+PROFILE_CACHE_ENABLED = os.environ.get('USER_PROFILE_CACHE_ENABLED', 'true').lower() == 'true'
+PROFILE_CACHE_MAX_ENTRIES = int(os.environ.get('USER_PROFILE_CACHE_MAX_ENTRIES', '1000'))
+PROFILE_CACHE_TTL = float(os.environ.get('USER_PROFILE_CACHE_TTL', '60'))
+
+
+class ProfileCache:
+    """
+    Bounded LRU + TTL cache in front of a profile loader
+    loader(user_id) returns the stored item or None; missing users are not cached.
+    Callers get their own copy, so mutating a returned profile never leaks
+    into the cache.
+    """
+
+    def __init__(self, loader: Callable[[str], Optional[Dict]], max_entries: int = PROFILE_CACHE_MAX_ENTRIES,
+                 ttl: float = PROFILE_CACHE_TTL, enabled: bool = PROFILE_CACHE_ENABLED,
+                 clock: Callable[[], float] = time.time):
+        self.loader = loader
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries = LRUCache(max_entries=max_entries, clock=clock)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, user_id: Optional[str]) -> Optional[Dict]:
+        """Profile for user_id, read through to the loader on a miss"""
+        if not user_id:
+            return None
+        if self.enabled:
+            profile = self._entries.get(user_id)
+            if profile is not None:
+                self._count('hits')
+                return copy.deepcopy(profile)
+
+        self._count('misses')
+        profile = self.loader(user_id)
+        if profile is not None and self.enabled:
+            self._entries.set(user_id, copy.deepcopy(profile), self.ttl)
+        return profile
+
+    def invalidate(self, user_id: Optional[str]) -> None:
+        """Drop a user's entry after their profile was written"""
+        if user_id:
+            self._entries.delete(user_id)
+            self._count('invalidations')
+
+    def clear(self) -> None:
+        self._entries.clear()
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hitRate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['entries'] = len(self._entries)
+        return stats
@@ -0,0 +1,277 @@
+"""
+Section-Aware Prompt Input Compression
+Splits resumes and job descriptions into sections, drops boilerplate and
+duplicate lines, and packs the highest-value lines into a per-function input
+token budget instead of cutting the text at a fixed character offset.
+Tokens saved are logged per call and aggregated in compression_stats.
+"""
+
+import os
+import re
+import json
+import math
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger()
+
+# Environment configuration
+COMPRESSION_ENABLED = os.environ.get('PROMPT_COMPRESSION_ENABLED', 'true').lower() == 'true'
+
+# Rough characters-per-token ratio for English prose with Claude tokenizers
+CHARS_PER_TOKEN = 4
+
+RESUME = 'resume'
+JOB = 'job'
+
+# Input token budgets per (function, document kind); override with
+# PROMPT_INPUT_BUDGETS, e.g. {"tailor_resume_for_job.resume": 800}
+INPUT_BUDGETS: Dict[str, int] = {
+    'analyze_resume.resume': 2000,
+    'tailor_resume_for_job.resume': 600,
+    'tailor_resume_for_job.job': 500,
+    'generate_interview_questions.job': 600,
+}
+INPUT_BUDGETS.update(json.loads(os.environ.get('PROMPT_INPUT_BUDGETS', '{}')))
+
+# Heading phrases per section, matched against short standalone lines
+SECTION_HEADINGS = {
+    RESUME: {
+        'summary': ('summary', 'professional summary', 'profile', 'objective', 'career objective', 'about me'),
+        'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                       'employment history', 'work history', 'career history'),
+        'skills': ('skills', 'technical skills', 'core competencies', 'competencies', 'technologies',
+                   'tools', 'key skills'),
+        'projects': ('projects', 'personal projects', 'selected projects'),
+        'education': ('education', 'academic background', 'qualifications'),
+        'certifications': ('certifications', 'certificates', 'licenses', 'licenses and certifications'),
+        'awards': ('awards', 'honors', 'achievements', 'publications'),
+        'interests': ('interests', 'hobbies', 'volunteering'),
+        'references': ('references',),
+    },
+    JOB: {
+        'about': ('about us', 'about the company', 'who we are', 'company overview', 'our mission', 'our story'),
+        'role': ('about the role', 'the role', 'overview', 'position summary', 'job summary', 'summary',
+                 'role overview', 'the opportunity'),
+        'responsibilities': ('responsibilities', 'key responsibilities', 'what you will do', "what you'll do",
+                             'duties', 'your role', 'day to day'),
+        'requirements': ('requirements', 'qualifications', 'minimum qualifications', 'required qualifications',
+                         'basic qualifications', 'what you bring', 'must have', 'must haves',
+                         'what we are looking for', "what we're looking for", 'skills', 'required skills'),
+        'preferred': ('preferred qualifications', 'preferred', 'nice to have', 'nice to haves', 'bonus points',
+                      'bonus'),
+        'benefits': ('benefits', 'perks', 'what we offer', 'compensation', 'perks and benefits', 'why join us'),
+        'eeo': ('equal opportunity', 'equal employment opportunity', 'eeo statement', 'diversity and inclusion'),
+        'apply': ('how to apply', 'application process', 'next steps'),
+    },
+}
+
+# Section weights per function and document kind; 0 drops the section.
+# 'header' is the text before the first heading.
+SECTION_WEIGHTS = {
+    'analyze_resume': {
+        RESUME: {'experience': 1.0, 'skills': 1.0, 'summary': 0.9, 'projects': 0.8, 'education': 0.7,
+                 'certifications': 0.7, 'header': 0.6, 'awards': 0.5, 'interests': 0.1,
+                 'references': 0.0},
+    },
+    'tailor_resume_for_job': {
+        RESUME: {'skills': 1.0, 'experience': 1.0, 'summary': 0.8, 'projects': 0.8, 'certifications': 0.6,
+                 'education': 0.4, 'awards': 0.3, 'header': 0.2, 'interests': 0.0,
+                 'references': 0.0},
+        JOB: {'requirements': 1.0, 'responsibilities': 0.9, 'preferred': 0.8, 'role': 0.6, 'header': 0.6,
+              'about': 0.2, 'benefits': 0.0, 'eeo': 0.0, 'apply': 0.0},
+    },
+    'generate_interview_questions': {
+        JOB: {'responsibilities': 1.0, 'requirements': 1.0, 'preferred': 0.8, 'role': 0.7, 'header': 0.6,
+              'about': 0.3, 'benefits': 0.0, 'eeo': 0.0, 'apply': 0.0},
+    },
+}
+DEFAULT_WEIGHT = 0.5
+
+# Lines dropped wherever they appear
+BOILERPLATE = re.compile(
+    r'equal (employment )?opportunity|without regard to|reasonable accommodation|e-verify'
+    r'|references (are )?available (up)?on request|apply now|click (here|apply)'
+    r'|this job description is not (designed|intended)|all qualified applicants'
+    r'|^page \d+( of \d+)?$|^curriculum vitae$|^resume$',
+    re.IGNORECASE
+)
+
+# Paragraphs longer than this are split into sentences so they can be packed separately
+MAX_UNIT_CHARS = 300
+
+_BULLET = re.compile('^[\\s\\-*>\u2022\u25aa\u25cf\u2023\u2043]+')
+_DATED = re.compile(r'\b(19|20)\d{2}\b|\bpresent\b', re.IGNORECASE)
+_SENTENCE = re.compile(r'(?<=[.!?;])\s+(?=[A-Z0-9])')
+_WORD = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+_STOP_WORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it', 'of', 'on', 'or',
+    'our', 'the', 'to', 'we', 'with', 'you', 'your', 'will', 'this', 'that', 'have', 'has', 'work'
+])
+
+
+class CompressedText(NamedTuple):
+    text: str
+    original_tokens: int
+    tokens: int
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def terms(text: str) -> Set[str]:
+    """Content words used to score lines against the other document"""
+    return {word.rstrip('.') for word in _WORD.findall(text.lower())} - _STOP_WORDS
+
+
+def _heading(line: str, headings: Dict[str, Tuple[str, ...]]) -> Optional[str]:
+    """Section name if the line is a known heading, else None"""
+    stripped = _BULLET.sub('', line).strip().rstrip(':').strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    folded = ' '.join(stripped.lower().replace('&', 'and').split())
+    for section, phrases in headings.items():
+        if folded in phrases:
+            return section
+    return None
+
+
+def split_sections(text: str, kind: str) -> List[Tuple[str, Optional[str], List[str]]]:
+    """
+    [(section, heading line, content lines)] in document order
+    Content lines have bullets stripped; long paragraphs are split into sentences
+    """
+    headings = SECTION_HEADINGS[kind]
+    sections: List[Tuple[str, Optional[str], List[str]]] = [('header', None, [])]
+    for raw in (text or '').splitlines():
+        line = ' '.join(raw.split())
+        if not line:
+            continue
+        section = _heading(line, headings)
+        if section:
+            sections.append((section, line.rstrip(':'), []))
+            continue
+        content = _BULLET.sub('', line).strip()
+        if len(content) > MAX_UNIT_CHARS:
+            sections[-1][2].extend(_SENTENCE.split(content))
+        elif content:
+            sections[-1][2].append(content)
+    return [entry for entry in sections if entry[2]]
+
+
+def _units(sections, weights: Dict[str, float], focus: Set[str]):
+    """Scored, deduplicated lines: (score, section index, line index, text)"""
+    seen: Set[str] = set()
+    units = []
+    for s_index, (section, _, lines) in enumerate(sections):
+        weight = weights.get(section, DEFAULT_WEIGHT)
+        if weight <= 0:
+            continue
+        for l_index, line in enumerate(lines):
+            folded = ' '.join(line.lower().split())
+            if folded in seen or BOILERPLATE.search(line):
+                continue
+            seen.add(folded)
+            # Earlier lines in a section (most recent role, key skills) rank higher
+            score = weight * (1.0 - 0.3 * l_index / max(1, len(lines)))
+            if section in ('experience', 'education') and _DATED.search(line):
+                # Role and degree lines anchor the bullets under them
+                score *= 1.25
+            if focus:
+                words = terms(line)
+                if words:
+                    score *= 1.0 + len(words & focus) / len(words)
+            units.append((score, s_index, l_index, line))
+    return units
+
+
+def pack(sections, units, budget_tokens: int) -> str:
+    """Greedy best-first selection within the budget, emitted in document order"""
+    budget_chars = budget_tokens * CHARS_PER_TOKEN
+    chosen: Set[Tuple[int, int]] = set()
+    opened: Set[int] = set()
+    used = 0
+    for score, s_index, l_index, line in sorted(units, key=lambda unit: (-unit[0], unit[1], unit[2])):
+        heading = sections[s_index][1]
+        cost = len(line) + 3
+        if s_index not in opened and heading:
+            cost += len(heading) + 2
+        if used + cost > budget_chars:
+            continue
+        used += cost
+        chosen.add((s_index, l_index))
+        opened.add(s_index)
+
+    out: List[str] = []
+    for s_index, (_, heading, lines) in enumerate(sections):
+        if s_index not in opened:
+            continue
+        if heading:
+            out.append(f"{heading}:")
+        out.extend(f"- {line}" for l_index, line in enumerate(lines) if (s_index, l_index) in chosen)
+    return '\n'.join(out)
+
+
+class CompressionStats:
+    """Per-function totals of input tokens before and after compression"""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, function_name: str, original_tokens: int, tokens: int) -> None:
+        with self._lock:
+            totals = self._totals.setdefault(function_name, {'calls': 0, 'originalTokens': 0, 'tokens': 0})
+            totals['calls'] += 1
+            totals['originalTokens'] += original_tokens
+            totals['tokens'] += tokens
+
+    def report(self) -> Dict[str, Dict]:
+        with self._lock:
+            snapshot = {name: dict(totals) for name, totals in self._totals.items()}
+        for totals in snapshot.values():
+            saved = max(0, totals['originalTokens'] - totals['tokens'])
+            totals['savedTokens'] = saved
+            totals['savedRate'] = round(saved / totals['originalTokens'], 4) if totals['originalTokens'] else 0.0
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+compression_stats = CompressionStats()
+
+
+def compress(text: Optional[str], kind: str, function_name: str, budget_tokens: Optional[int] = None,
+             focus: Optional[Iterable[str]] = None) -> CompressedText:
+    """
+    Compress a resume or job description for one AI function
+    focus: terms from the other document (e.g. the job description when
+    tailoring a resume) that make a line more valuable
+    """
+    text = text or ''
+    original = estimate_tokens(text)
+    budget = budget_tokens or INPUT_BUDGETS.get(f"{function_name}.{kind}", 1000)
+
+    if not COMPRESSION_ENABLED:
+        packed = text[:budget * CHARS_PER_TOKEN]
+    else:
+        weights = SECTION_WEIGHTS.get(function_name, {}).get(kind, {})
+        sections = split_sections(text, kind)
+        packed = pack(sections, _units(sections, weights, set(focus or ())), budget)
+        if not packed and text.strip():
+            # Nothing survived (e.g. one oversized paragraph); fall back to a plain cut
+            packed = text[:budget * CHARS_PER_TOKEN]
+
+    result = CompressedText(packed, original, estimate_tokens(packed))
+    compression_stats.record(function_name, result.original_tokens, result.tokens)
+    logger.info(f"Prompt compression {function_name}/{kind}: {result.original_tokens} -> {result.tokens} "
+                f"tokens ({result.saved_tokens} saved)")
+    return result
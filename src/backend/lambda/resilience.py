@@ -0,0 +1,364 @@
+"""
+Resilience Layer for Bedrock Model Calls
+Circuit breaker that fails fast after repeated errors, per-function latency
+histograms, and hedged requests that race a second call against a slow first one
+"""
+
+import os
+import math
+import time
+import bisect
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger()
+
+# Environment configuration
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BEDROCK_BREAKER_FAILURES', '5'))
+BREAKER_RESET_SECONDS = float(os.environ.get('BEDROCK_BREAKER_RESET_SECONDS', '30'))
+CALL_TIMEOUT_SECONDS = float(os.environ.get('BEDROCK_CALL_TIMEOUT_SECONDS', '20'))
+HEDGE_ENABLED = os.environ.get('BEDROCK_HEDGE_ENABLED', 'true').lower() == 'true'
+HEDGE_PERCENTILE = float(os.environ.get('BEDROCK_HEDGE_PERCENTILE', '0.95'))
+HEDGE_MIN_SAMPLES = int(os.environ.get('BEDROCK_HEDGE_MIN_SAMPLES', '20'))
+HEDGE_MAX_RATIO = float(os.environ.get('BEDROCK_HEDGE_MAX_RATIO', '0.1'))
+HEDGE_WORKERS = int(os.environ.get('BEDROCK_HEDGE_WORKERS', '16'))
+# Seconds of the Lambda's remaining time kept back for building and returning the response
+DEADLINE_MARGIN_SECONDS = float(os.environ.get('BEDROCK_DEADLINE_MARGIN_SECONDS', '2'))
+
+# Client errors that say nothing about Bedrock's health and must not trip the breaker
+NON_FAILURE_ERROR_CODES = frozenset([
+    'ValidationException',
+    'AccessDeniedException',
+    'ResourceNotFoundException',
+])
+
+# Histogram bucket upper bounds in ms: 25ms growing by 25% per bucket up to ~2 minutes
+BUCKET_BOUNDS_MS: List[float] = []
+_bound = 25.0
+while _bound < 120000:
+    BUCKET_BOUNDS_MS.append(round(_bound, 1))
+    _bound *= 1.25
+BUCKET_BOUNDS_MS.append(float('inf'))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Bedrock while the circuit is open"""
+
+
+# perf_counter() time by which every model call of the current invocation must
+# finish; one invocation runs at a time per Lambda process, and its worker threads
+# share the deadline, so this is module state rather than thread-local
+_request_deadline: Optional[float] = None
+
+
+def set_request_deadline(context: Any, margin: float = DEADLINE_MARGIN_SECONDS) -> None:
+    """Bound model calls by the invocation's remaining time (context=None clears it)"""
+    global _request_deadline
+    remaining_ms = getattr(context, 'get_remaining_time_in_millis', None)
+    if remaining_ms is None:
+        _request_deadline = None
+        return
+    _request_deadline = time.perf_counter() + remaining_ms() / 1000 - margin
+
+
+def request_time_left() -> Optional[float]:
+    """Seconds until the request deadline, or None outside a Lambda invocation"""
+    deadline = _request_deadline
+    return None if deadline is None else deadline - time.perf_counter()
+
+
+def is_failure(error: Exception) -> bool:
+    """Whether an exception should count against the circuit breaker"""
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict):
+        code = response.get('Error', {}).get('Code')
+        return code not in NON_FAILURE_ERROR_CODES
+    return not isinstance(error, CircuitOpenError)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram; percentiles resolve to a bucket upper bound
+    """
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKET_BOUNDS_MS)
+        self.count = 0
+        self.total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float) -> None:
+        index = bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        with self._lock:
+            if not self.count:
+                return None
+            target = max(1, math.ceil(fraction * self.count))
+            running = 0
+            for bound, bucket_count in zip(BUCKET_BOUNDS_MS, self.counts):
+                running += bucket_count
+                if running >= target:
+                    return bound
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'meanMs': round(self.total_ms / self.count, 1) if self.count else None,
+            'p50Ms': self.percentile(0.5),
+            'p95Ms': self.percentile(0.95),
+            'p99Ms': self.percentile(0.99)
+        }
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+    closed:    calls pass through; failure_threshold consecutive failures open it
+    open:      calls fail fast with CircuitOpenError for reset_seconds
+    half_open: one probe call is let through; success closes, failure re-opens
+    """
+
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = BREAKER_RESET_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call must not be attempted"""
+        with self._lock:
+            if self.state == 'open':
+                if self.clock() - self.opened_at < self.reset_seconds:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Circuit {self.name} is open")
+                self.state = 'half_open'
+                self._probe_in_flight = False
+            if self.state == 'half_open':
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Circuit {self.name} is half-open, probe in flight")
+                self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != 'closed':
+                logger.info(f"Circuit {self.name} closed")
+            self.state = 'closed'
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == 'half_open' or self.consecutive_failures >= self.failure_threshold:
+                if self.state != 'open':
+                    logger.warning(f"Circuit {self.name} opened after {self.consecutive_failures} consecutive failures")
+                self.state = 'open'
+                self.opened_at = self.clock()
+                self._probe_in_flight = False
+
+    @property
+    def healthy(self) -> bool:
+        return self.state == 'closed' and self.consecutive_failures == 0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'consecutiveFailures': self.consecutive_failures,
+            'rejected': self.rejected
+        }
+
+
+class ResilientCaller:
+    """
+    Runs model calls behind a circuit breaker with an overall deadline, records
+    per-function latency and hedges calls that run past the function's latency
+    percentile by racing a second identical request
+    """
+
+    def __init__(self, breaker: CircuitBreaker, call_timeout: float = CALL_TIMEOUT_SECONDS,
+                 hedge_enabled: bool = HEDGE_ENABLED, hedge_percentile: float = HEDGE_PERCENTILE,
+                 hedge_min_samples: int = HEDGE_MIN_SAMPLES, hedge_max_ratio: float = HEDGE_MAX_RATIO,
+                 max_workers: int = HEDGE_WORKERS):
+        self.breaker = breaker
+        self.call_timeout = call_timeout
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_max_ratio = hedge_max_ratio
+        self.max_workers = max_workers
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters = {'calls': 0, 'hedged': 0, 'hedgeWins': 0, 'timeouts': 0, 'deadlineExceeded': 0,
+                         'failures': 0}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix='bedrock-hedge')
+        return self._executor
+
+    def histogram(self, function_name: Optional[str]) -> LatencyHistogram:
+        name = function_name or 'default'
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def hedge_delay(self, function_name: Optional[str]) -> Optional[float]:
+        """Seconds to wait before hedging, or None when this call must not be hedged"""
+        if not self.hedge_enabled or not self.breaker.healthy:
+            # Never add load to a service that is already failing
+            return None
+        histogram = self.histogram(function_name)
+        if histogram.count < self.hedge_min_samples:
+            return None
+        with self._lock:
+            if self.counters['hedged'] >= self.hedge_max_ratio * max(1, self.counters['calls']):
+                return None
+        delay_ms = histogram.percentile(self.hedge_percentile)
+        if delay_ms is None or delay_ms == float('inf'):
+            return None
+        return delay_ms / 1000
+
+    def call(self, function_name: Optional[str], func: Callable[[], Any]) -> Any:
+        """
+        Call func (one model request) with breaker, deadline and hedging applied
+        The call timeout runs from when a worker starts the first attempt, so
+        time queued for a worker does not count, and is cut short by the
+        request deadline (set_request_deadline). Raises CircuitOpenError when the
+        circuit is open and TimeoutError when no attempt finishes in time; only
+        a full call timeout counts against the breaker.
+        """
+        self.breaker.before_call()
+        self._count('calls')
+        delay = self.hedge_delay(function_name)
+        time_left = request_time_left()
+        if time_left is not None and time_left <= 0:
+            self._count('deadlineExceeded')
+            raise FutureTimeoutError(f"No time left in the request for {function_name or 'model'} call")
+        submitted = time.perf_counter()
+        started = threading.Event()
+
+        def first() -> Any:
+            started.set()
+            return func()
+
+        executor = self._get_executor()
+        attempts = [executor.submit(first)]
+        if not started.wait(timeout=self.call_timeout if time_left is None else time_left):
+            if attempts[0].cancel():
+                # Queued behind other calls; says nothing about Bedrock's health
+                self._count('deadlineExceeded')
+                raise FutureTimeoutError(f"No worker free for {function_name or 'model'} call")
+        start = time.perf_counter()
+        queued = start - submitted
+        pending = set(attempts)
+        deadline = start + self.call_timeout
+        time_left = request_time_left()
+        cut_short = time_left is not None and time_left < self.call_timeout
+        if cut_short:
+            deadline = start + time_left
+        last_error: Optional[Exception] = None
+
+        try:
+            while pending:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                timeout = remaining
+                hedge_pending = delay is not None and len(attempts) == 1
+                if hedge_pending:
+                    timeout = min(remaining, max(0.0, start + delay - time.perf_counter()))
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    self.histogram(function_name).record(elapsed_ms)
+                    if future is not attempts[0]:
+                        self._count('hedgeWins')
+                    self.breaker.record_success()
+                    return result
+
+                if not done and hedge_pending:
+                    logger.info(f"Hedging {function_name or 'model'} call after {delay * 1000:.0f}ms")
+                    self._count('hedged')
+                    hedge = executor.submit(func)
+                    attempts.append(hedge)
+                    pending.add(hedge)
+        finally:
+            for future in pending:
+                future.cancel()
+
+        if last_error is not None and not pending:
+            self._record_failure(last_error)
+            raise last_error
+
+        if cut_short:
+            self._count('deadlineExceeded')
+            raise FutureTimeoutError(f"Bedrock call for {function_name or 'model'} ran out of request time "
+                                     f"({queued:.1f}s queued)")
+        self._count('timeouts')
+        self.histogram(function_name).record((time.perf_counter() - start) * 1000)
+        self.breaker.record_failure()
+        raise FutureTimeoutError(f"Bedrock call for {function_name or 'model'} exceeded {self.call_timeout}s")
+
+    def _record_failure(self, error: Exception) -> None:
+        self._count('failures')
+        if is_failure(error):
+            self.breaker.record_failure()
+        else:
+            # Bedrock answered (e.g. a validation error), so it is reachable
+            self.breaker.record_success()
+
+    def report(self) -> Dict[str, Any]:
+        """Breaker state, call counters and per-function latency percentiles"""
+        with self._lock:
+            counters = dict(self.counters)
+            histograms = dict(self.histograms)
+        return {
+            'breaker': self.breaker.summary(),
+            'counters': counters,
+            'latency': {name: histogram.summary() for name, histogram in histograms.items()}
+        }
+
+    def reset(self) -> None:
+        """Clear histograms, counters and breaker state (tests only)"""
+        with self._lock:
+            self.histograms.clear()
+            self.counters = {name: 0 for name in self.counters}
+        self.breaker.record_success()
+        self.breaker.rejected = 0
+
+
+bedrock_breaker = CircuitBreaker('bedrock')
+bedrock_caller = ResilientCaller(bedrock_breaker)
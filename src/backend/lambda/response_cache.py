@@ -0,0 +1,283 @@
+"""
+Response Cache for AWS Bedrock Model Invocations
+Content-addressed in-process LRU tier with an optional shared DynamoDB tier
+"""
+
+import json
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from aws_clients import get_resource
+from dynamo_batch import batch_get_items
+
+logger = logging.getLogger()
+
+# Time-to-live (seconds) for cached responses of each AI function.
+# A TTL of 0 disables caching for that function.
+FUNCTION_TTLS = {
+    'get_job_recommendations': 15 * 60,
+    'calculate_job_score': 60 * 60,
+    'score_jobs_batch': 60 * 60,
+    'analyze_resume': 0,
+    'tailor_resume_for_job': 0,
+    'generate_career_roadmap': 6 * 60 * 60,
+    'get_market_insights': 6 * 60 * 60,
+    'generate_interview_questions': 24 * 60 * 60,
+    'get_salary_trends': 24 * 60 * 60,
+    'get_skill_demand_forecast': 24 * 60 * 60,
+    'analyze_email_for_interview': 0,
+}
+
+# Environment configuration
+CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '512'))
+CACHE_TABLE = os.environ.get('RESPONSE_CACHE_TABLE', '')
+
+# Shared-tier hits are kept locally for at most this long (seconds)
+SHARED_PROMOTION_TTL = 5 * 60
+
+
+def make_cache_key(model_id: str, prompt: str, max_tokens: int,
+                   temperature: float, top_p: float) -> str:
+    """
+    Build a content-addressed cache key for a model request
+    """
+    canonical = json.dumps(
+        {
+            'modelId': model_id,
+            'prompt': prompt,
+            'maxTokens': max_tokens,
+            'temperature': temperature,
+            'topP': top_p
+        },
+        sort_keys=True,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def ttl_for(function_name: Optional[str]) -> int:
+    """Return the cache TTL for an AI function (0 when not cacheable)"""
+    if not CACHE_ENABLED or not function_name:
+        return 0
+    return FUNCTION_TTLS.get(function_name, 0)
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with per-entry expiry
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LocalSharedTier(LRUCache):
+    """
+    Local stand-in for the shared DynamoDB tier (tests and local development)
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        super().__init__(max_entries=1_000_000, clock=clock)
+
+
+class DynamoDBCacheTier:
+    """
+    Shared cache tier backed by a DynamoDB table
+    Table schema: cacheKey (S, HASH), value (S), expiresAt (N, TTL attribute)
+    """
+
+    def __init__(self, table_name: str, table: Any = None, clock: Callable[[], float] = time.time):
+        self.table_name = table_name
+        self._table = table
+        self._clock = clock
+
+    @property
+    def table(self) -> Any:
+        if self._table is None:
+            self._table = get_resource('dynamodb').Table(self.table_name)
+        return self._table
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            item = self.table.get_item(Key={'cacheKey': key}).get('Item')
+        except Exception as e:
+            logger.warning(f"Shared cache read failed: {str(e)}")
+            return None
+        # DynamoDB TTL deletion is lazy, so expired items can still be returned
+        if not item or float(item.get('expiresAt', 0)) <= self._clock():
+            return None
+        return json.loads(item['value'])
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Look up several keys with BatchGetItem; missing and expired keys are omitted"""
+        try:
+            items = batch_get_items(get_resource('dynamodb'), self.table_name, 'cacheKey', keys)
+        except Exception as e:
+            logger.warning(f"Shared cache batch read failed: {str(e)}")
+            return {}
+        now = self._clock()
+        return {
+            key: json.loads(item['value'])
+            for key, item in items.items()
+            if float(item.get('expiresAt', 0)) > now
+        }
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            self.table.put_item(Item={
+                'cacheKey': key,
+                'value': json.dumps(value),
+                'expiresAt': int(self._clock() + ttl)
+            })
+        except Exception as e:
+            logger.warning(f"Shared cache write failed: {str(e)}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self.table.delete_item(Key={'cacheKey': key})
+        except Exception as e:
+            logger.warning(f"Shared cache delete failed: {str(e)}")
+
+
+class ResponseCache:
+    """
+    Two-tier response cache: in-process LRU in front of an optional shared tier
+    """
+
+    def __init__(self, local: Optional[LRUCache] = None, shared: Any = None,
+                 clock: Callable[[], float] = time.time):
+        self.local = local if local is not None else LRUCache(clock=clock)
+        self.shared = shared
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'localHits': 0, 'sharedHits': 0, 'misses': 0, 'sets': 0}
+
+    def _count(self, *names: str) -> None:
+        with self._lock:
+            for name in names:
+                self._stats[name] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None:
+            self._count('hits', 'localHits')
+            return value
+
+        if self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                # Promote into the local tier so the next lookup skips DynamoDB
+                self.local.set(key, value, SHARED_PROMOTION_TTL)
+                self._count('hits', 'sharedHits')
+                return value
+
+        self._count('misses')
+        return None
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Look up several keys at once; shared-tier misses of the local tier are
+        fetched in one batch when the shared tier supports it
+        """
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            value = self.local.get(key)
+            if value is not None:
+                found[key] = value
+                self._count('hits', 'localHits')
+            else:
+                missing.append(key)
+
+        if missing and self.shared is not None:
+            get_many = getattr(self.shared, 'get_many', None)
+            if get_many is not None:
+                shared_found = get_many(missing)
+            else:
+                shared_found = {key: value for key in missing
+                                for value in [self.shared.get(key)] if value is not None}
+            for key, value in shared_found.items():
+                self.local.set(key, value, SHARED_PROMOTION_TTL)
+                found[key] = value
+                self._count('hits', 'sharedHits')
+
+        for key in missing:
+            if key not in found:
+                self._count('misses')
+        return found
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self.local.set(key, value, ttl)
+        if self.shared is not None:
+            self.shared.set(key, value, ttl)
+        self._count('sets')
+
+    def delete(self, key: str) -> None:
+        self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete(key)
+
+    def clear(self) -> None:
+        """Clear the local tier and reset counters"""
+        self.local.clear()
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hitRate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['localEntries'] = len(self.local)
+        return stats
+
+
+def build_response_cache() -> ResponseCache:
+    """Build the module-level cache from environment configuration"""
+    shared = DynamoDBCacheTier(CACHE_TABLE) if CACHE_TABLE else None
+    return ResponseCache(local=LRUCache(max_entries=CACHE_MAX_ENTRIES), shared=shared)
+
+
+response_cache = build_response_cache()
@@ -0,0 +1,92 @@
+"""
+Resume Analysis Deduplication by Normalized Content Hash
+Stores analyze_resume results by a hash of the normalized resume text, and
+tailor_resume_for_job results by the (resume, job description) pair, so
+resubmitting the same content skips the model call
+"""
+
+import os
+import copy
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+import bedrock_integration
+from response_cache import response_cache
+
+logger = logging.getLogger()
+
+# Environment configuration
+DEDUP_ENABLED = os.environ.get('RESUME_DEDUP_ENABLED', 'true').lower() == 'true'
+DEDUP_TTL = int(os.environ.get('RESUME_DEDUP_TTL', str(30 * 24 * 60 * 60)))
+
+# Bump when the analysis or tailoring prompts change so old results are not served
+ANALYSIS_KEY_VERSION = 'v3'
+TAILOR_KEY_VERSION = 'v2'
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Case-folded text with all whitespace runs collapsed to single spaces"""
+    return ' '.join((text or '').split()).casefold()
+
+
+def content_hash(*texts: Optional[str]) -> str:
+    """sha256 over the normalized texts"""
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(normalize_text(text).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def _is_placeholder(result: Any) -> bool:
+    return bedrock_integration.is_placeholder(result)
+
+
+def _lookup_or_generate(key: str, generate) -> Tuple[Dict, bool]:
+    if DEDUP_ENABLED:
+        cached = response_cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached), True
+
+    result = generate()
+    if DEDUP_ENABLED and not _is_placeholder(result):
+        response_cache.set(key, copy.deepcopy(result), DEDUP_TTL)
+    return result, False
+
+
+def analyze_resume(resume_text: str, job_description: Optional[str] = None,
+                   keywords: Optional[List[str]] = None, role: Optional[str] = None) -> Tuple[Dict, str, bool]:
+    """
+    Analysis for a resume, reusing the model's qualitative review for any
+    resubmission of the same content; ATS scores are recomputed locally for
+    the given target
+    Returns (analysis, resume hash, whether the review was served from the store)
+    """
+    resume_hash = content_hash(resume_text)
+    assessment, cached = _lookup_or_generate(
+        f"resume-analysis:{ANALYSIS_KEY_VERSION}:{resume_hash}",
+        lambda: bedrock_integration.assess_resume(resume_text)
+    )
+    if cached:
+        logger.info(f"Resume analysis served from dedup store ({resume_hash[:12]})")
+    
+    # NumPy-backed; imported on first use to keep it off the cold-start path
+    import ats_engine
+    local = ats_engine.score_resume(resume_text, job_description, keywords, role)
+    return ats_engine.merge_analysis(local, assessment), resume_hash, cached
+
+
+def tailor_resume_for_job(resume_text: str, job_description: str) -> Tuple[Dict, bool]:
+    """
+    Tailoring suggestions keyed on the normalized (resume, job description) pair
+    Returns (suggestions, whether they were served from the store)
+    """
+    pair_hash = content_hash(resume_text, job_description)
+    suggestions, cached = _lookup_or_generate(
+        f"resume-tailor:{TAILOR_KEY_VERSION}:{pair_hash}",
+        lambda: bedrock_integration.tailor_resume_for_job(resume_text, job_description)
+    )
+    if cached:
+        logger.info(f"Resume tailoring served from dedup store ({pair_hash[:12]})")
+    return suggestions, cached
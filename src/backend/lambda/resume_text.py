@@ -0,0 +1,299 @@
+"""
+Resume Text Extraction Stage
+Extracts and normalizes the text of an uploaded resume once per S3 object
+version (keyed by ETag), streaming the object rather than loading it whole.
+The text is stored next to the file as <key>.extracted.txt, so analysis and
+tailoring can run from a resumeUrl without the client resending the text.
+
+Supported formats: text/plain, PDF (via pypdf) and DOCX. Other types, such
+as legacy .doc files, raise UnsupportedFormatError (a 415 for the API).
+Output that does not decode to text is rejected rather than cached.
+"""
+
+import os
+import codecs
+import zipfile
+import tempfile
+import threading
+import unicodedata
+import xml.etree.ElementTree as ET
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+from aws_clients import get_client
+from response_cache import LRUCache
+
+logger = logging.getLogger()
+
+# Environment configuration
+RESUMES_BUCKET = os.environ.get('RESUMES_BUCKET', 'career-agent-resumes')
+STREAM_CHUNK_BYTES = int(os.environ.get('RESUME_TEXT_CHUNK_BYTES', str(256 * 1024)))
+MAX_TEXT_CHARS = int(os.environ.get('RESUME_TEXT_MAX_CHARS', '100000'))
+MEMORY_CACHE_ENTRIES = int(os.environ.get('RESUME_TEXT_CACHE_ENTRIES', '64'))
+MEMORY_CACHE_TTL = float(os.environ.get('RESUME_TEXT_CACHE_TTL', '3600'))
+
+# Bump when extraction or normalization changes so stored sidecars are redone
+EXTRACTOR_VERSION = '3'
+SIDECAR_SUFFIX = '.extracted.txt'
+
+# PDF and DOCX files are spooled to disk beyond this size
+SPOOL_MEMORY_BYTES = 4 * 1024 * 1024
+
+PDF = 'application/pdf'
+DOCX = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+TEXT = 'text/plain'
+_EXTENSION_TYPES = {'.pdf': PDF, '.docx': DOCX, '.txt': TEXT}
+
+_memory = LRUCache(max_entries=MEMORY_CACHE_ENTRIES)
+_stats_lock = threading.Lock()
+_stats = {'memoryHits': 0, 'sidecarHits': 0, 'extractions': 0}
+
+
+class ResumeTextError(ValueError):
+    """The resume cannot be located or has no extractable text"""
+
+
+class UnsupportedFormatError(ResumeTextError):
+    """The resume's file type has no text extractor; surfaced to the client as a 415"""
+
+
+def _unsupported(content_type: Optional[str]) -> UnsupportedFormatError:
+    return UnsupportedFormatError(f'Text extraction is not supported for {content_type or "unknown"} files; '
+                                  'upload a PDF, DOCX or text version, or send resumeText')
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def normalize_extracted(text: str) -> str:
+    """NFKC text with whitespace collapsed within lines and blank-line runs removed"""
+    text = unicodedata.normalize('NFKC', text).replace('\x00', '')
+    lines = [' '.join(line.split()) for line in text.splitlines()]
+    normalized: List[str] = []
+    for line in lines:
+        if line or (normalized and normalized[-1]):
+            normalized.append(line)
+    return '\n'.join(normalized).strip()[:MAX_TEXT_CHARS]
+
+
+# ---------------------------------------------------------------- plain text
+
+def extract_plain_text(chunks: Iterable[bytes]) -> str:
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    parts = [decoder.decode(chunk) for chunk in chunks]
+    parts.append(decoder.decode(b'', final=True))
+    return ''.join(parts).lstrip('\ufeff')
+
+
+# ---------------------------------------------------------------------- PDF
+
+def _spool(chunks: Iterable[bytes]) -> IO[bytes]:
+    """Seekable copy of a chunk stream (zip and PDF indexes sit at the end of the file)"""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+    for chunk in chunks:
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def extract_pdf_text(chunks: Iterable[bytes]) -> str:
+    """
+    Page text via pypdf, which applies the fonts' encodings and ToUnicode
+    CMaps (including the Identity-H CID fonts Word, Google Docs and Chrome
+    export); pages after MAX_TEXT_CHARS of text are not read
+    """
+    # Imported on first use to keep pypdf off the cold-start path
+    from pypdf import PdfReader
+    from pypdf.errors import PyPdfError
+
+    with _spool(chunks) as spool:
+        try:
+            reader = PdfReader(spool, strict=False)
+            if reader.is_encrypted and not reader.decrypt(''):
+                raise ResumeTextError('The PDF is password protected')
+            pages: List[str] = []
+            length = 0
+            for page in reader.pages:
+                text = page.extract_text() or ''
+                pages.append(text)
+                length += len(text)
+                if length >= MAX_TEXT_CHARS:
+                    break
+            return '\n'.join(pages)
+        except PyPdfError as e:
+            raise ResumeTextError(f'Unreadable PDF file: {str(e)}')
+
+
+# --------------------------------------------------------------------- DOCX
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def extract_docx_text(chunks: Iterable[bytes]) -> str:
+    """Paragraph text of word/document.xml"""
+    with _spool(chunks) as spool:
+        try:
+            with zipfile.ZipFile(spool) as archive, archive.open('word/document.xml') as document:
+                out: List[str] = []
+                for _, element in ET.iterparse(document, events=('end',)):
+                    if element.tag == _W + 't' and element.text:
+                        out.append(element.text)
+                    elif element.tag == _W + 'tab':
+                        out.append('\t')
+                    elif element.tag in (_W + 'br', _W + 'p'):
+                        out.append('\n')
+                        if element.tag == _W + 'p':
+                            element.clear()
+                return ''.join(out)
+        except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+            raise ResumeTextError(f'Unreadable DOCX file: {str(e)}')
+
+
+EXTRACTORS = {PDF: extract_pdf_text, DOCX: extract_docx_text, TEXT: extract_plain_text}
+
+# Share of non-space characters that must be letters or digits, and the most that may be control,
+# private-use or unassigned code points, for extracted output to count as text (a PDF font
+# without a Unicode mapping yields glyph IDs)
+MIN_ALNUM_SHARE = 0.5
+MAX_UNPRINTABLE_SHARE = 0.05
+
+
+def looks_like_text(text: str) -> bool:
+    """False for glyph-ID or binary output that decoded to characters but not to words"""
+    chars = [char for char in text if not char.isspace()]
+    if not chars:
+        return False
+    alnum = sum(1 for char in chars if char.isalnum())
+    unprintable = sum(1 for char in chars
+                      if char == '\ufffd' or unicodedata.category(char) in ('Cc', 'Cf', 'Co', 'Cn', 'Cs'))
+    return alnum >= MIN_ALNUM_SHARE * len(chars) and unprintable <= MAX_UNPRINTABLE_SHARE * len(chars)
+
+
+def content_type_for(key: str, content_type: Optional[str]) -> str:
+    base = (content_type or '').split(';')[0].strip().lower()
+    if base in EXTRACTORS:
+        return base
+    return _EXTENSION_TYPES.get(os.path.splitext(key)[1].lower(), base)
+
+
+def extract_text(chunks: Iterable[bytes], content_type: str) -> str:
+    """Normalized text of a resume given as a byte-chunk iterator"""
+    extractor = EXTRACTORS.get(content_type)
+    if extractor is None:
+        raise _unsupported(content_type)
+    text = normalize_extracted(extractor(chunks))
+    if not text:
+        raise ResumeTextError('No extractable text found in the resume')
+    if not looks_like_text(text):
+        raise ResumeTextError('The resume text could not be decoded; upload a DOCX or text version')
+    return text
+
+
+# ------------------------------------------------------------------- S3 stage
+
+def parse_resume_url(resume_url: Optional[str], user_id: Optional[str]) -> Tuple[str, str]:
+    """
+    (bucket, key) for an s3:// URL or a bare key in RESUMES_BUCKET
+    The key must sit under the requesting user's prefix
+    """
+    if not resume_url or not user_id:
+        raise ResumeTextError('User ID and resumeUrl required')
+    if resume_url.startswith('s3://'):
+        bucket, _, key = resume_url[len('s3://'):].partition('/')
+    else:
+        bucket, key = RESUMES_BUCKET, resume_url.lstrip('/')
+    if bucket != RESUMES_BUCKET or not key.startswith(f"{user_id}/") or key.endswith(SIDECAR_SUFFIX):
+        raise ResumeTextError('resumeUrl does not refer to one of this user\'s resumes')
+    return bucket, key
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    return getattr(error, 'response', {}).get('Error', {}).get('Code')
+
+
+def _iter_body(body: Any) -> Iterator[bytes]:
+    if hasattr(body, 'iter_chunks'):
+        yield from body.iter_chunks(STREAM_CHUNK_BYTES)
+        return
+    while True:
+        chunk = body.read(STREAM_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _read_sidecar(s3: Any, bucket: str, key: str, etag: str) -> Optional[str]:
+    try:
+        sidecar = s3.get_object(Bucket=bucket, Key=key + SIDECAR_SUFFIX)
+    except Exception as e:
+        if _error_code(e) in ('NoSuchKey', '404', 'NotFound'):
+            return None
+        logger.warning(f"Resume text sidecar read failed for {key}: {str(e)}")
+        return None
+    metadata = sidecar.get('Metadata', {})
+    if metadata.get('source-etag') != etag or metadata.get('extractor') != EXTRACTOR_VERSION:
+        return None
+    return sidecar['Body'].read().decode('utf-8')
+
+
+def get_resume_text(resume_url: Optional[str], user_id: Optional[str]) -> Dict[str, Any]:
+    """
+    Extracted text for an uploaded resume
+    Served from memory or the sidecar when it matches the object's current ETag;
+    otherwise the object is streamed, extracted and the sidecar rewritten.
+    Returns {'text', 'key', 'eTag', 'source': 'memory' | 'sidecar' | 'extracted'}
+    """
+    bucket, key = parse_resume_url(resume_url, user_id)
+    s3 = get_client('s3')
+    try:
+        head = s3.head_object(Bucket=bucket, Key=key)
+    except Exception as e:
+        if _error_code(e) in ('NoSuchKey', '404', 'NotFound'):
+            raise ResumeTextError('Resume not found')
+        raise
+    etag = head.get('ETag', '').strip('"')
+    memory_key = f"{bucket}/{key}@{etag}"
+
+    text = _memory.get(memory_key)
+    if text is not None:
+        _count('memoryHits')
+        return {'text': text, 'key': key, 'eTag': etag, 'source': 'memory'}
+
+    text = _read_sidecar(s3, bucket, key, etag)
+    source = 'sidecar'
+    if text is None:
+        content_type = content_type_for(key, head.get('ContentType'))
+        if content_type not in EXTRACTORS:
+            raise _unsupported(content_type)
+        # IfMatch pins the version whose ETag the sidecar will be recorded against
+        obj = s3.get_object(Bucket=bucket, Key=key, IfMatch=head.get('ETag'))
+        text = extract_text(_iter_body(obj['Body']), content_type)
+        source = 'extracted'
+        try:
+            s3.put_object(
+                Bucket=bucket,
+                Key=key + SIDECAR_SUFFIX,
+                Body=text.encode('utf-8'),
+                ContentType='text/plain; charset=utf-8',
+                Metadata={'source-etag': etag, 'extractor': EXTRACTOR_VERSION}
+            )
+        except Exception as e:
+            logger.warning(f"Resume text sidecar write failed for {key}: {str(e)}")
+
+    _count('sidecarHits' if source == 'sidecar' else 'extractions')
+    _memory.set(memory_key, text, MEMORY_CACHE_TTL)
+    return {'text': text, 'key': key, 'eTag': etag, 'source': source}
+
+
+def stats() -> Dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset() -> None:
+    _memory.clear()
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
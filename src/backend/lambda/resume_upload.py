@@ -0,0 +1,152 @@
+"""
+Direct-to-S3 Resume Uploads
+Issues presigned POST forms (or presigned multipart part URLs for large files)
+so clients send resume bytes straight to RESUMES_BUCKET, and verifies the
+uploaded object when the client reports completion
+"""
+
+import os
+import re
+import math
+from typing import Any, Dict, List, Optional
+
+from aws_clients import get_client
+
+# Environment configuration
+RESUMES_BUCKET = os.environ.get('RESUMES_BUCKET', 'career-agent-resumes')
+MAX_RESUME_BYTES = int(os.environ.get('MAX_RESUME_BYTES', str(10 * 1024 * 1024)))
+UPLOAD_URL_TTL = int(os.environ.get('RESUME_UPLOAD_URL_TTL', '900'))
+MULTIPART_THRESHOLD = int(os.environ.get('RESUME_MULTIPART_THRESHOLD', str(5 * 1024 * 1024)))
+MULTIPART_PART_SIZE = int(os.environ.get('RESUME_MULTIPART_PART_SIZE', str(5 * 1024 * 1024)))
+
+ALLOWED_CONTENT_TYPES = frozenset([
+    'application/pdf',
+    'application/msword',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'text/plain',
+])
+
+_UNSAFE_CHARS = re.compile(r'[^A-Za-z0-9._-]+')
+
+
+class UploadError(ValueError):
+    """Invalid upload request; surfaced to the client as a 400"""
+
+
+def resume_key(user_id: str, file_name: str) -> str:
+    """S3 key for a user's resume, with the file name reduced to safe characters"""
+    base = os.path.basename(file_name.replace('\\', '/'))
+    safe = _UNSAFE_CHARS.sub('_', base).strip('._') or 'resume'
+    return f"{user_id}/{safe[:120]}"
+
+
+def _validate(user_id: Optional[str], file_name: Optional[str], content_type: Optional[str],
+              file_size: Optional[Any]) -> int:
+    if not user_id or not file_name:
+        raise UploadError('User ID and file name required')
+    if content_type not in ALLOWED_CONTENT_TYPES:
+        raise UploadError(f'Unsupported content type: {content_type}')
+    try:
+        size = int(file_size)
+    except (TypeError, ValueError):
+        raise UploadError('fileSize (bytes) required')
+    if size < 1 or size > MAX_RESUME_BYTES:
+        raise UploadError(f'fileSize must be between 1 and {MAX_RESUME_BYTES} bytes')
+    return size
+
+
+def create_upload(user_id: Optional[str], file_name: Optional[str], content_type: Optional[str],
+                  file_size: Optional[Any]) -> Dict[str, Any]:
+    """
+    Upload instructions for one resume
+    Files up to MULTIPART_THRESHOLD get a presigned POST form whose policy pins
+    the key, content type and size range; larger files get a multipart upload
+    with one presigned URL per part
+    """
+    size = _validate(user_id, file_name, content_type, file_size)
+    key = resume_key(user_id, file_name)
+    s3 = get_client('s3')
+
+    if size <= MULTIPART_THRESHOLD:
+        post = s3.generate_presigned_post(
+            Bucket=RESUMES_BUCKET,
+            Key=key,
+            Fields={'Content-Type': content_type},
+            Conditions=[
+                {'Content-Type': content_type},
+                ['content-length-range', 1, MAX_RESUME_BYTES]
+            ],
+            ExpiresIn=UPLOAD_URL_TTL
+        )
+        return {'uploadMethod': 'POST', 'key': key, 'url': post['url'], 'fields': post['fields'],
+                'expiresIn': UPLOAD_URL_TTL}
+
+    upload_id = s3.create_multipart_upload(Bucket=RESUMES_BUCKET, Key=key, ContentType=content_type)['UploadId']
+    part_count = math.ceil(size / MULTIPART_PART_SIZE)
+    parts = [
+        {
+            'partNumber': number,
+            'url': s3.generate_presigned_url(
+                'upload_part',
+                Params={'Bucket': RESUMES_BUCKET, 'Key': key, 'UploadId': upload_id, 'PartNumber': number},
+                ExpiresIn=UPLOAD_URL_TTL
+            )
+        }
+        for number in range(1, part_count + 1)
+    ]
+    return {'uploadMethod': 'MULTIPART', 'key': key, 'uploadId': upload_id, 'partSize': MULTIPART_PART_SIZE,
+            'parts': parts, 'expiresIn': UPLOAD_URL_TTL}
+
+
+def complete_upload(user_id: Optional[str], key: Optional[str], upload_id: Optional[str] = None,
+                    parts: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Finish a multipart upload if needed, then verify the object exists, belongs
+    to the user and is within limits. Returns the stored object's metadata
+    """
+    if not user_id or not key:
+        raise UploadError('User ID and key required')
+    if not key.startswith(f"{user_id}/"):
+        raise UploadError('Key does not belong to this user')
+    s3 = get_client('s3')
+
+    if upload_id:
+        if not parts:
+            raise UploadError('parts (partNumber and eTag of each uploaded part) required')
+        try:
+            completed = sorted(({'PartNumber': int(part['partNumber']), 'ETag': part['eTag']} for part in parts),
+                               key=lambda part: part['PartNumber'])
+        except (KeyError, TypeError, ValueError):
+            raise UploadError('Each part needs partNumber and eTag')
+        s3.complete_multipart_upload(Bucket=RESUMES_BUCKET, Key=key, UploadId=upload_id,
+                                     MultipartUpload={'Parts': completed})
+
+    try:
+        head = s3.head_object(Bucket=RESUMES_BUCKET, Key=key)
+    except Exception as e:
+        if getattr(e, 'response', {}).get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+            raise UploadError('Uploaded object not found')
+        raise
+
+    size = head.get('ContentLength', 0)
+    if size > MAX_RESUME_BYTES or head.get('ContentType') not in ALLOWED_CONTENT_TYPES:
+        # Multipart uploads are not covered by a POST policy, so enforce limits here
+        s3.delete_object(Bucket=RESUMES_BUCKET, Key=key)
+        raise UploadError('Uploaded object exceeds the size limit or has an unsupported content type')
+
+    return {
+        'resumeUrl': f"s3://{RESUMES_BUCKET}/{key}",
+        'key': key,
+        'size': size,
+        'eTag': head.get('ETag', '').strip('"'),
+        'contentType': head.get('ContentType')
+    }
+
+
+def abort_upload(user_id: Optional[str], key: Optional[str], upload_id: Optional[str]) -> None:
+    """Abort an unfinished multipart upload so its parts stop accruing storage"""
+    if not user_id or not key or not upload_id:
+        raise UploadError('User ID, key and uploadId required')
+    if not key.startswith(f"{user_id}/"):
+        raise UploadError('Key does not belong to this user')
+    get_client('s3').abort_multipart_upload(Bucket=RESUMES_BUCKET, Key=key, UploadId=upload_id)
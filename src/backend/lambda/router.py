@@ -0,0 +1,154 @@
+"""
+Declarative Request Router for the Lambda Handler
+Compiles (method, path pattern) entries once into a static-path dict plus a
+segment trie for patterns with {parameters}
+"""
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class RouteMatch(NamedTuple):
+    """Result of resolving a request against the route table"""
+    status: int
+    handler: Optional[Callable] = None
+    pattern: Optional[str] = None
+    params: Dict[str, str] = {}
+    allowed_methods: Tuple[str, ...] = ()
+
+
+class _Node:
+    __slots__ = ('children', 'param_name', 'param_child', 'methods', 'pattern')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.param_name: Optional[str] = None
+        self.param_child: Optional['_Node'] = None
+        self.methods: Dict[str, Callable] = {}
+        self.pattern: Optional[str] = None
+
+
+def normalize_path(path: str) -> str:
+    """Strip query string and trailing slash so /api/jobs/ matches /api/jobs"""
+    path = path.split('?', 1)[0]
+    if len(path) > 1:
+        path = path.rstrip('/')
+    return path or '/'
+
+
+def _split(path: str) -> List[str]:
+    stripped = path.strip('/')
+    return stripped.split('/') if stripped else []
+
+
+class Router:
+    """
+    Route table mapping (method, pattern) to handlers
+    Patterns use {name} for path parameters, e.g. /api/users/{userId}
+    """
+
+    def __init__(self, routes: Iterable[Tuple[str, str, Callable]] = ()):
+        self._static: Dict[str, Dict[str, Callable]] = {}
+        # Precomputed results for exact (method, path) hits on static routes
+        self._exact: Dict[Tuple[str, str], RouteMatch] = {}
+        self._root = _Node()
+        self._routes: List[Tuple[str, str, Callable]] = []
+        for method, pattern, handler in routes:
+            self.add(method, pattern, handler)
+
+    @property
+    def routes(self) -> List[Tuple[str, str, Callable]]:
+        return list(self._routes)
+
+    def add(self, method: str, pattern: str, handler: Callable) -> None:
+        method = method.upper()
+        pattern = normalize_path(pattern)
+        self._routes.append((method, pattern, handler))
+
+        if '{' not in pattern:
+            methods = self._static.setdefault(pattern, {})
+            if method in methods:
+                raise ValueError(f"Duplicate route: {method} {pattern}")
+            methods[method] = handler
+            self._exact[(method, pattern)] = RouteMatch(200, handler, pattern, {})
+            return
+
+        node = self._root
+        for segment in _split(pattern):
+            if segment.startswith('{') and segment.endswith('}'):
+                name = segment[1:-1]
+                if node.param_child is None:
+                    node.param_child = _Node()
+                    node.param_name = name
+                elif node.param_name != name:
+                    raise ValueError(f"Conflicting parameter names at {pattern}: {node.param_name} vs {name}")
+                node = node.param_child
+            else:
+                node = node.children.setdefault(segment, _Node())
+
+        if method in node.methods:
+            raise ValueError(f"Duplicate route: {method} {pattern}")
+        node.methods[method] = handler
+        node.pattern = pattern
+
+    def _walk_literal_first(self, segments: List[str]) -> Optional[Tuple[_Node, Dict[str, str]]]:
+        """Single greedy pass (literal before parameter); None means fall back to backtracking"""
+        node = self._root
+        params: Dict[str, str] = {}
+        for segment in segments:
+            child = node.children.get(segment)
+            if child is None:
+                if node.param_child is None:
+                    return None
+                params[node.param_name] = segment
+                child = node.param_child
+            node = child
+        return (node, params) if node.methods else None
+
+    def _walk(self, node: _Node, segments: List[str], index: int,
+              params: Dict[str, str]) -> Optional[Tuple[_Node, Dict[str, str]]]:
+        if index == len(segments):
+            return (node, params) if node.methods else None
+
+        child = node.children.get(segments[index])
+        if child is not None:
+            found = self._walk(child, segments, index + 1, params)
+            if found:
+                return found
+
+        if node.param_child is not None:
+            found = self._walk(node.param_child, segments, index + 1,
+                               {**params, node.param_name: segments[index]})
+            if found:
+                return found
+        return None
+
+    def resolve(self, method: str, path: str) -> RouteMatch:
+        """
+        Resolve a request to its handler
+        Returns status 200 with handler and params, 405 with the allowed methods
+        when the path exists under another method, or 404 when no pattern matches
+        """
+        exact = self._exact.get((method, path))
+        if exact is not None:
+            return exact
+
+        method = method.upper()
+        path = normalize_path(path)
+
+        methods = self._static.get(path)
+        if methods is not None:
+            handler = methods.get(method)
+            if handler is None:
+                return RouteMatch(405, allowed_methods=tuple(sorted(methods)))
+            return RouteMatch(200, handler, path, {})
+
+        segments = _split(path)
+        found = self._walk_literal_first(segments) or self._walk(self._root, segments, 0, {})
+        if found is None:
+            return RouteMatch(404)
+
+        node, params = found
+        handler = node.methods.get(method)
+        if handler is None:
+            return RouteMatch(405, allowed_methods=tuple(sorted(node.methods)))
+        return RouteMatch(200, handler, node.pattern, params)
@@ -0,0 +1,151 @@
+"""
+Single-Flight Coalescing of Identical AI Requests
+Concurrent callers with the same canonical key share one in-flight call and
+its parsed result, for both thread-based and asyncio callers
+"""
+
+import copy
+import json
+import asyncio
+import functools
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return ' '.join(value.split()).lower()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    return value
+
+
+def canonical_key(function_name: str, *args: Any, **kwargs: Any) -> str:
+    """
+    Key identifying equivalent calls: strings are case- and whitespace-folded,
+    list order is kept because it determines the order of the result; keyword
+    arguments are included sorted by name
+    """
+    parts = [function_name, _normalize(list(args))]
+    if kwargs:
+        parts.append([[name, _normalize(value)] for name, value in sorted(kwargs.items())])
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'followers')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    In-flight call registry
+    do() coalesces threads; do_async() coalesces tasks on the same event loop.
+    Every caller but the thread leader receives its own deep copy of the
+    result, so one caller mutating it cannot affect another.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, function_name: str, collapsed: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(function_name, {'calls': 0, 'executions': 0, 'collapsed': 0})
+            stats['calls'] += 1
+            stats['collapsed' if collapsed else 'executions'] += 1
+
+    def do(self, key: str, func: Callable[[], Any], function_name: str = 'default') -> Any:
+        """Run func once for all threads that call do() with key while it is in flight"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.followers += 1
+        self._count(function_name, collapsed=not leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            with self._lock:
+                self._calls.pop(key, None)
+            # Snapshot for followers so the leader is free to mutate its result
+            call.result = copy.deepcopy(result) if call.followers else None
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def do_async(self, key: str, factory: Callable[[], Awaitable[Any]],
+                       function_name: str = 'default') -> Any:
+        """Await factory() once for all tasks on this event loop awaiting key while it is in flight"""
+        loop = asyncio.get_running_loop()
+        in_flight = self._async_calls.get(loop)
+        if in_flight is None:
+            in_flight = self._async_calls.setdefault(loop, {})
+
+        task = in_flight.get(key)
+        leader = task is None
+        if leader:
+            task = asyncio.ensure_future(factory())
+            in_flight[key] = task
+            task.add_done_callback(lambda _: in_flight.pop(key, None))
+        self._count(function_name, collapsed=not leader)
+
+        # shield: a cancelled follower must not cancel the shared call
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-function calls, executions and collapsed (coalesced) calls"""
+        with self._lock:
+            snapshot = {name: dict(stats) for name, stats in self._stats.items()}
+        for stats in snapshot.values():
+            stats['collapseRate'] = round(stats['collapsed'] / stats['calls'], 4) if stats['calls'] else 0.0
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+singleflight = SingleFlight()
+
+
+def coalesced(function_name: str) -> Callable:
+    """
+    Decorator that coalesces concurrent calls with equivalent arguments
+    The wrapper exposes key_for(*args, **kwargs) so async variants can share the key
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return singleflight.do(canonical_key(function_name, *args, **kwargs),
+                                   lambda: func(*args, **kwargs), function_name)
+
+        wrapper.key_for = lambda *args, **kwargs: canonical_key(function_name, *args, **kwargs)
+        wrapper.function_name = function_name
+        return wrapper
+    return decorator
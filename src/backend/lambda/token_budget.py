@@ -0,0 +1,145 @@
+"""
+Adaptive Output Token Budgets for AI Functions
+Records actual output tokens per function from the Bedrock usage block and
+derives a per-function max_tokens budget and stop sequences from them
+"""
+
+import os
+import json
+import math
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger()
+
+# Environment configuration
+BUDGET_ENABLED = os.environ.get('TOKEN_BUDGET_ENABLED', 'true').lower() == 'true'
+MIN_SAMPLES = int(os.environ.get('TOKEN_BUDGET_MIN_SAMPLES', '20'))
+HEADROOM = float(os.environ.get('TOKEN_BUDGET_HEADROOM', '1.25'))
+WINDOW = int(os.environ.get('TOKEN_BUDGET_WINDOW', '200'))
+FLOOR = 64
+
+# Optional static budgets used until enough samples exist, e.g. {"get_salary_trends": 600}
+SEED_BUDGETS: Dict[str, int] = json.loads(os.environ.get('TOKEN_BUDGETS', '{}'))
+
+# The model is asked to write this marker after the JSON so generation stops at
+# the closing bracket instead of continuing into commentary
+JSON_END_MARKER = '</json>'
+JSON_END_INSTRUCTION = f"\n    Respond with the JSON only, then write {JSON_END_MARKER} immediately after it.\n    "
+
+# Functions whose output is a single JSON value
+JSON_FUNCTIONS = frozenset([
+    'get_job_recommendations',
+    'score_jobs_batch',
+    'analyze_resume',
+    'tailor_resume_for_job',
+    'generate_career_roadmap',
+    'get_market_insights',
+    'generate_interview_questions',
+    'get_salary_trends',
+    'get_skill_demand_forecast',
+    'analyze_email_for_interview',
+])
+
+
+def _percentile(sorted_values: List[int], fraction: float) -> int:
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class TokenBudgetTracker:
+    """
+    Rolling per-function record of output token usage and truncations
+    """
+
+    def __init__(self, min_samples: int = MIN_SAMPLES, headroom: float = HEADROOM,
+                 window: int = WINDOW, seeds: Optional[Dict[str, int]] = None):
+        self.min_samples = min_samples
+        self.headroom = headroom
+        self.window = window
+        self.seeds = dict(SEED_BUDGETS if seeds is None else seeds)
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _counters(self, function_name: str) -> Dict[str, int]:
+        return self._counts.setdefault(function_name, {'requests': 0, 'truncated': 0, 'budgetRetries': 0})
+
+    def record(self, function_name: str, output_tokens: Optional[int], stop_reason: Optional[str]) -> None:
+        """Record one completion's usage"""
+        if not function_name:
+            return
+        with self._lock:
+            counters = self._counters(function_name)
+            counters['requests'] += 1
+            if stop_reason == 'max_tokens':
+                counters['truncated'] += 1
+            if output_tokens is not None:
+                self._samples.setdefault(function_name, deque(maxlen=self.window)).append(int(output_tokens))
+
+    def record_retry(self, function_name: str) -> None:
+        with self._lock:
+            self._counters(function_name)['budgetRetries'] += 1
+
+    def budget(self, function_name: Optional[str], ceiling: int) -> int:
+        """
+        max_tokens to request for a function, never above the caller's ceiling
+        """
+        if not BUDGET_ENABLED or not function_name:
+            return ceiling
+        with self._lock:
+            samples = sorted(self._samples.get(function_name, ()))
+        if len(samples) >= self.min_samples:
+            derived = math.ceil(_percentile(samples, 0.99) * self.headroom)
+        elif function_name in self.seeds:
+            derived = self.seeds[function_name]
+        else:
+            return ceiling
+        return min(ceiling, max(FLOOR, derived))
+
+    def stop_sequences(self, function_name: Optional[str]) -> List[str]:
+        if not BUDGET_ENABLED or function_name not in JSON_FUNCTIONS:
+            return []
+        return [JSON_END_MARKER]
+
+    def apply(self, function_name: Optional[str], prompt: str, max_tokens: int):
+        """
+        Return (prompt, max_tokens, stop_sequences) tuned for the function
+        """
+        stop_sequences = self.stop_sequences(function_name)
+        if stop_sequences:
+            prompt = prompt + JSON_END_INSTRUCTION
+        return prompt, self.budget(function_name, max_tokens), stop_sequences
+
+    def report(self) -> Dict[str, Dict]:
+        """Per-function usage percentiles, current budget and truncation counts"""
+        with self._lock:
+            names = set(self._samples) | set(self._counts)
+            snapshot = {
+                name: (sorted(self._samples.get(name, ())), dict(self._counts.get(name, {})))
+                for name in names
+            }
+        report = {}
+        for name, (samples, counts) in snapshot.items():
+            requests = counts.get('requests', 0)
+            report[name] = {
+                'samples': len(samples),
+                'p50': _percentile(samples, 0.5) if samples else None,
+                'p99': _percentile(samples, 0.99) if samples else None,
+                'max': samples[-1] if samples else None,
+                'requests': requests,
+                'truncated': counts.get('truncated', 0),
+                'truncationRate': round(counts.get('truncated', 0) / requests, 4) if requests else 0.0,
+                'budgetRetries': counts.get('budgetRetries', 0)
+            }
+        return report
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+token_budget = TokenBudgetTracker()
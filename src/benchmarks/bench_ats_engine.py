@@ -0,0 +1,71 @@
+"""
+Benchmark for the Local ATS Engine
+Reports resumes scored per second against one job description on synthetic
+resume batches
+
+Usage: python src/benchmarks/bench_ats_engine.py [--sizes 100 1000 10000] [--repeat 3]
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+
+# Add lambda directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+from ats_engine import ROLE_KEYWORDS, resolve_keywords, score_resumes
+
+JOB_DESCRIPTION = """Senior Data Engineer
+Responsibilities
+- Own batch and streaming data pipelines on AWS
+- Partner with analysts on data modeling for the warehouse
+Requirements
+- Python and SQL
+- Spark, Airflow and Kafka
+- ETL design and data quality
+Nice to have
+- dbt, Snowflake, Terraform
+"""
+
+SKILLS = sorted({keyword for keywords in ROLE_KEYWORDS.values() for keyword in keywords})
+VERBS = ['Built', 'Led', 'Designed', 'Migrated', 'Reduced', 'Scaled', 'Automated', 'Shipped']
+
+
+def make_resume(rng: random.Random) -> str:
+    lines = ['Candidate Name', 'candidate@example.com | +1 555 010 0000', 'Summary',
+             'Engineer with a focus on data systems.', 'Experience']
+    for year in range(rng.randint(1, 4)):
+        lines.append(f'Engineer, Company {year} ({2015 + year} - {2016 + year})')
+        for _ in range(rng.randint(3, 6)):
+            lines.append(f'- {rng.choice(VERBS)} {" and ".join(rng.sample(SKILLS, 2))} work, '
+                         f'improving throughput {rng.randint(5, 60)}%')
+    lines += ['Skills', ', '.join(rng.sample(SKILLS, rng.randint(5, 15))), 'Education', 'BSc 2014']
+    return '\n'.join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    keywords = resolve_keywords(JOB_DESCRIPTION)
+    print(f"{len(keywords)} keywords extracted from the job description")
+
+    print(f"{'resumes':>8} {'batch ms':>10} {'resumes/s':>12} {'per-resume ms':>14}")
+    for size in args.sizes:
+        resumes = [make_resume(rng) for _ in range(size)]
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            score_resumes(resumes, keywords)
+            timings.append(time.perf_counter() - start)
+        seconds = min(timings)
+        print(f"{size:>8} {seconds * 1000:>10.1f} {size / seconds:>12,.0f} {seconds * 1000 / size:>14.3f}")
+
+
+if __name__ == '__main__':
+    main()
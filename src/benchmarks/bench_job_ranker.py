@@ -0,0 +1,80 @@
+"""
+Benchmark for the Local Job Pre-Ranker
+Reports index build time and jobs ranked per second on synthetic job feeds
+
+Usage: python src/benchmarks/bench_job_ranker.py [--sizes 1000 10000 50000] [--repeat 5]
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+
+# Add lambda directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+from job_ranker import JobIndex
+
+SKILLS = [
+    'Python', 'Java', 'Go', 'Rust', 'C++', 'C#', 'JavaScript', 'TypeScript', 'React', 'Node.js',
+    'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Terraform', 'SQL', 'PostgreSQL', 'Spark',
+    'Airflow', 'Kafka', 'TensorFlow', 'PyTorch', 'Pandas', 'Tableau', 'Excel', 'Figma', 'Scrum'
+]
+TITLES = [
+    'Software Engineer', 'Senior Software Engineer', 'Data Engineer', 'Data Scientist',
+    'Machine Learning Engineer', 'DevOps Engineer', 'Product Manager', 'Frontend Developer',
+    'Backend Developer', 'Cloud Architect', 'Business Analyst', 'UX Designer'
+]
+LOCATIONS = ['Seattle, WA', 'San Francisco, CA', 'New York, NY', 'Austin, TX', 'Remote', 'Boston, MA']
+INDUSTRIES = ['Technology', 'Finance', 'Healthcare', 'Retail', 'Education', 'Media']
+
+
+def make_jobs(count: int, rng: random.Random) -> list:
+    return [
+        {
+            'jobId': f'job-{i}',
+            'title': rng.choice(TITLES),
+            'requiredSkills': rng.sample(SKILLS, rng.randint(3, 8)),
+            'location': rng.choice(LOCATIONS),
+            'industry': rng.choice(INDUSTRIES),
+            'description': ' '.join(rng.sample(SKILLS + TITLES, 10))
+        }
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    profile = {
+        'skills': ['Python', 'AWS', 'SQL', 'Spark'],
+        'targetRole': 'Senior Data Engineer',
+        'preferences': {'locations': ['Seattle', 'Remote'], 'industries': ['Technology']}
+    }
+
+    print(f"{'jobs':>8} {'build ms':>10} {'rank ms':>10} {'jobs ranked/s':>15} {'build+rank/s':>14}")
+    for size in args.sizes:
+        jobs = make_jobs(size, rng)
+
+        start = time.perf_counter()
+        index = JobIndex(jobs)
+        build_seconds = time.perf_counter() - start
+
+        rank_times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            index.top_k(profile, 50)
+            rank_times.append(time.perf_counter() - start)
+        rank_seconds = min(rank_times)
+
+        print(f"{size:>8} {build_seconds * 1000:>10.1f} {rank_seconds * 1000:>10.2f} "
+              f"{size / rank_seconds:>15,.0f} {size / (build_seconds + rank_seconds):>14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
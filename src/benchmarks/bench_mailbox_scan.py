@@ -0,0 +1,163 @@
+"""
+Benchmark for the Mailbox Scanning Pipeline
+Scans a synthetic mbox or Maildir fixture (or an existing mailbox) and reports
+messages per second for a naive one-message-at-a-time loop, for scan_mailbox
+at several concurrency levels, and for a checkpointed rerun after new mail
+arrives. Bedrock calls and table writes are simulated with fixed latencies;
+the local email pre-filter runs for real.
+
+Usage: python src/benchmarks/bench_mailbox_scan.py [--messages 2000] [--format mbox|maildir] \\
+    [--mailbox PATH] [--concurrency 1 8 16] [--model-ms 400] [--write-ms 20]
+"""
+
+import argparse
+import json
+import mailbox
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+# Add lambda directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import bedrock_integration
+from mailbox_scan import FileCheckpointStore, email_text, open_mailbox, scan_mailbox
+
+TEMPLATES = [
+    (0.10, 'Interview invitation - {company}',
+     'Hi, thanks for applying to {company}. We would like to schedule an interview with you. '
+     'Are you available next Tuesday at 2:00 PM PST? Join at https://zoom.us/j/{n}'),
+    (0.15, 'Your weekly digest from {company}',
+     'Top stories this week. You are receiving this email because you subscribed. Unsubscribe here.'),
+    (0.15, 'Your order #{n} has shipped', 'Your order has shipped. Tracking number {n}.'),
+    (0.10, 'Update on your application to {company}',
+     'Thank you for your interest. Unfortunately we have decided to move forward with other candidates.'),
+    (0.15, 'New jobs for you', 'New jobs matching your search at {company} and 12 other companies.'),
+    (0.10, 'Thank you for applying', 'We have received your application for the engineer role at {company}.'),
+    (0.25, 'Catching up', 'Hey, are we still on for lunch? Let me know what works for {company} folks.'),
+]
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark', 'Wayne', 'Wonka']
+
+
+def make_fixture(path: str, count: int, fmt: str, rng: random.Random) -> None:
+    """Mailbox with ~5% duplicate deliveries and ~10% replies in existing threads"""
+    box = mailbox.Maildir(path) if fmt == 'maildir' else mailbox.mbox(path)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    weights = [weight for weight, _, _ in TEMPLATES]
+    previous = []
+    for i in range(count):
+        if previous and rng.random() < 0.05:
+            box.add(rng.choice(previous))
+            continue
+        _, subject, body = rng.choices(TEMPLATES, weights)[0]
+        company = rng.choice(COMPANIES)
+        headers = [
+            f"Message-ID: <msg-{i}@mail.example.com>",
+            f"Subject: {subject.format(company=company, n=i)}",
+            f"From: {company} <noreply@{company.lower()}.com>",
+            f"Date: {format_datetime(start + timedelta(minutes=7 * i))}",
+        ]
+        if previous and rng.random() < 0.10:
+            headers.append(f"References: <msg-{rng.randrange(i)}@mail.example.com>")
+        raw = '\r\n'.join(headers + ['Content-Type: text/plain; charset=utf-8', '',
+                                      body.format(company=company, n=i), '']).encode('utf-8')
+        previous.append(raw)
+        box.add(raw)
+    box.flush()
+    box.close()
+
+
+def simulated_model(model_ms: float):
+    def invoke(prompt, **kwargs):
+        time.sleep(model_ms / 1000)
+        return json.dumps({'isInterview': 'schedule an interview' in prompt, 'confidence': 90,
+                           'interviewDetails': {}, 'suggestedAction': 'Reply'})
+    return invoke
+
+
+def simulated_sink(write_ms: float):
+    def sink(items):
+        # One BatchWriteItem round trip per 25 items
+        time.sleep(write_ms / 1000 * -(-len(items) // 25))
+        return {item['interviewId']: None for item in items}
+    return sink
+
+
+def naive_scan(path: str, write_ms: float) -> dict:
+    """Every message analyzed in turn, one PutItem per detected interview"""
+    start = time.perf_counter()
+    box = open_mailbox(path)
+    messages = 0
+    for key in box.iterkeys():
+        messages += 1
+        result = bedrock_integration.analyze_email_for_interview(email_text(box.get_bytes(key)))
+        if result.get('isInterview'):
+            time.sleep(write_ms / 1000)
+    seconds = time.perf_counter() - start
+    return {'messages': messages, 'analyzed': messages, 'seconds': seconds}
+
+
+def report(label: str, counts: dict) -> None:
+    seconds = counts['seconds']
+    print(f"{label:<22} {counts['messages']:>8} {counts['analyzed']:>9} {counts.get('prefiltered', '-'):>12} "
+          f"{seconds:>9.2f} {counts['messages'] / seconds if seconds else 0:>12,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--format', choices=['mbox', 'maildir'], default='mbox')
+    parser.add_argument('--mailbox', help='scan an existing mbox file or Maildir instead of a fixture')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 16])
+    parser.add_argument('--model-ms', type=float, default=400)
+    parser.add_argument('--write-ms', type=float, default=20)
+    parser.add_argument('--skip-naive', action='store_true', help='skip the slow one-at-a-time baseline')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    try:
+        path = args.mailbox
+        if not path:
+            path = os.path.join(tmp, 'Maildir' if args.format == 'maildir' else 'inbox.mbox')
+            start = time.perf_counter()
+            make_fixture(path, args.messages, args.format, random.Random(42))
+            print(f"Fixture: {args.messages} messages ({args.format}) in {time.perf_counter() - start:.2f}s")
+
+        sink = simulated_sink(args.write_ms)
+        print(f"Model latency {args.model_ms:.0f} ms, batch write latency {args.write_ms:.0f} ms\n")
+        print(f"{'run':<22} {'messages':>8} {'analyzed':>9} {'prefiltered':>12} {'seconds':>9} {'messages/s':>12}")
+        with patch.object(bedrock_integration, 'invoke_bedrock_model', simulated_model(args.model_ms)):
+            if not args.skip_naive:
+                report('naive sequential', naive_scan(path, args.write_ms))
+
+            for concurrency in args.concurrency:
+                report(f"scan concurrency={concurrency}",
+                       scan_mailbox(open_mailbox(path), 'bench-user', sink=sink, concurrency=concurrency))
+
+            store = FileCheckpointStore(os.path.join(tmp, 'checkpoint.json'))
+            concurrency = max(args.concurrency)
+            report('checkpointed first run', scan_mailbox(open_mailbox(path), 'bench-user', store=store,
+                                                          sink=sink, concurrency=concurrency))
+            if not args.mailbox:
+                # A day of new mail, then rerun against the saved checkpoint
+                extra = os.path.join(tmp, 'new.mbox')
+                make_fixture(extra, max(1, args.messages // 50), 'mbox', random.Random(7))
+                target = mailbox.Maildir(path) if args.format == 'maildir' else mailbox.mbox(path)
+                for raw in mailbox.mbox(extra).itervalues():
+                    target.add(raw.as_bytes().replace(b'@mail.example.com', b'@new.example.com'))
+                target.flush()
+                target.close()
+            report('checkpointed rerun', scan_mailbox(open_mailbox(path), 'bench-user', store=store,
+                                                      sink=sink, concurrency=concurrency))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
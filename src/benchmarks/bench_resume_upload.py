@@ -0,0 +1,106 @@
+"""
+Benchmark for Resume Upload Paths
+Compares the legacy base64-through-Lambda upload with presigned direct-to-S3
+uploads. Lambda-side CPU (JSON parse + base64 decode, presign generation) is
+measured locally; network transfer is modelled from the given client
+bandwidth, in-region bandwidth and round-trip time. Sizes over the API
+Gateway (10 MB) or Lambda (6 MB) request payload limits are flagged, since
+the legacy path cannot carry them at all.
+
+Usage: python src/benchmarks/bench_resume_upload.py [--sizes-mb 1 5 8 20] \\
+    [--client-mbps 20] [--region-mbps 400] [--rtt-ms 60] [--repeat 5]
+"""
+
+import argparse
+import sys
+import os
+import json
+import base64
+import time
+
+# Add lambda directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+# Presigning is local signing work; fake credentials keep it offline
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'bench')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'bench')
+
+import resume_upload
+
+API_GATEWAY_LIMIT = 10 * 1024 * 1024
+LAMBDA_PAYLOAD_LIMIT = 6 * 1024 * 1024
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def transfer_seconds(size: int, mbps: float, rtt: float) -> float:
+    return rtt + size * 8 / (mbps * 1_000_000)
+
+
+def legacy_path(size: int, args) -> dict:
+    """Client -> API Gateway -> Lambda (base64 JSON) -> S3"""
+    body = json.dumps({'userId': 'u1', 'fileName': 'cv.pdf',
+                       'fileContent': base64.b64encode(os.urandom(size)).decode('ascii')})
+    cpu = best_of(args.repeat, lambda: base64.b64decode(json.loads(body)['fileContent'], validate=True))
+    put = transfer_seconds(size, args.region_mbps, args.rtt_ms / 1000 / 4)
+    lambda_seconds = cpu + put
+    return {
+        'payload': len(body),
+        'lambda': lambda_seconds,
+        'endToEnd': transfer_seconds(len(body), args.client_mbps, args.rtt_ms / 1000) + lambda_seconds,
+        'fits': len(body) <= min(API_GATEWAY_LIMIT, LAMBDA_PAYLOAD_LIMIT)
+    }
+
+
+def direct_path(size: int, args) -> dict:
+    """Lambda issues presigned URLs, client -> S3, Lambda verifies with HeadObject"""
+    s3 = resume_upload.get_client('s3')
+    s3.create_multipart_upload = lambda **kwargs: {'UploadId': 'bench-upload'}
+    limit = resume_upload.MAX_RESUME_BYTES
+    resume_upload.MAX_RESUME_BYTES = max(limit, size)
+    try:
+        upload = resume_upload.create_upload('u1', 'cv.pdf', 'application/pdf', size)
+        presign = best_of(args.repeat, lambda: resume_upload.create_upload('u1', 'cv.pdf', 'application/pdf', size))
+    finally:
+        resume_upload.MAX_RESUME_BYTES = limit
+    rtt = args.rtt_ms / 1000
+    # Lambda: presign request + completion (HeadObject, plus CompleteMultipartUpload)
+    calls = 2 if upload['uploadMethod'] == 'MULTIPART' else 1
+    lambda_seconds = presign + calls * rtt / 4
+    return {
+        'method': upload['uploadMethod'],
+        'lambda': lambda_seconds,
+        'endToEnd': 2 * rtt + transfer_seconds(size, args.client_mbps, rtt) + lambda_seconds
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes-mb', type=float, nargs='+', default=[1, 5, 8, 20])
+    parser.add_argument('--client-mbps', type=float, default=20.0, help='Client uplink bandwidth')
+    parser.add_argument('--region-mbps', type=float, default=400.0, help='Lambda to S3 bandwidth')
+    parser.add_argument('--rtt-ms', type=float, default=60.0, help='Client round-trip time')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'size':>7} | {'legacy lambda':>13} {'legacy e2e':>10} {'payload':>9} | "
+          f"{'method':>9} {'direct lambda':>13} {'direct e2e':>10}")
+    for size_mb in args.sizes_mb:
+        size = int(size_mb * 1024 * 1024)
+        legacy = legacy_path(size, args)
+        direct = direct_path(size, args)
+        payload = f"{legacy['payload'] / 1024 / 1024:.1f}MB" + ('' if legacy['fits'] else '!')
+        print(f"{size_mb:>5.1f}MB | {legacy['lambda'] * 1000:>11.1f}ms {legacy['endToEnd']:>9.2f}s {payload:>9} | "
+              f"{direct['method']:>9} {direct['lambda'] * 1000:>11.1f}ms {direct['endToEnd']:>9.2f}s")
+    print("! = legacy request exceeds the API Gateway / Lambda payload limit and would be rejected")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Microbenchmark for lambda_handler Dispatch
+Compares the compiled route table against the previous startswith/substring
+chain for every registered route
+
+Usage: python src/benchmarks/bench_router.py [--iterations 200000]
+"""
+
+import argparse
+import sys
+import os
+import timeit
+
+# Add lambda directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+from index import ROUTES, router
+
+# Sub-handler branches of the previous dispatch, in evaluation order
+LEGACY_BRANCHES = {
+    '/api/jobs': [('GET', None), ('POST', '/score')],
+    '/api/users': [('GET', None), ('POST', None), ('PUT', None)],
+    '/api/resume': [('POST', '/analyze'), ('POST', '/tailor'), ('POST', '/upload')],
+    '/api/ai': [('POST', '/career-roadmap'), ('POST', '/market-insights'), ('POST', '/interview-prep')],
+    '/api/applications': [('GET', None), ('POST', None), ('PUT', None)],
+    '/api/market-intelligence': [('GET', '/salary-trends'), ('GET', '/skill-demand'), ('GET', '/overview')],
+}
+
+
+def legacy_dispatch(method: str, path: str):
+    """The previous prefix chain followed by the sub-handler substring tests"""
+    for prefix, branches in LEGACY_BRANCHES.items():
+        if path.startswith(prefix):
+            for branch_method, needle in branches:
+                if method == branch_method and (needle is None or needle in path):
+                    return prefix, needle
+            return None
+    return None
+
+
+def concrete_path(pattern: str) -> str:
+    return pattern.replace('{userId}', 'user-123').replace('{applicationId}', 'app_1700000000.0')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{'route':<55} {'legacy ns':>10} {'router ns':>10}")
+    legacy_total = router_total = 0.0
+    for method, pattern, _ in ROUTES:
+        path = concrete_path(pattern)
+        legacy = timeit.timeit(lambda: legacy_dispatch(method, path), number=args.iterations)
+        compiled = timeit.timeit(lambda: router.resolve(method, path), number=args.iterations)
+        legacy_ns = legacy / args.iterations * 1e9
+        router_ns = compiled / args.iterations * 1e9
+        legacy_total += legacy_ns
+        router_total += router_ns
+        print(f"{method + ' ' + pattern:<55} {legacy_ns:>10.0f} {router_ns:>10.0f}")
+
+    count = len(ROUTES)
+    print(f"{'mean over ' + str(count) + ' routes':<55} {legacy_total / count:>10.0f} {router_total / count:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
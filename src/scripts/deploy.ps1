@@ -50,8 +50,8 @@ New-Item -ItemType Directory -Path package | Out-Null
 pip install -r requirements.txt -t package\
 
 # Copy Lambda code
-Copy-Item index.py package\
-Copy-Item bedrock_integration.py package\
+Copy-Item *.py package\
+Copy-Item *.json package\
 
 # Create ZIP file
 Compress-Archive -Path package\* -DestinationPath lambda-deployment.zip -Force
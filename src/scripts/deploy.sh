@@ -58,8 +58,8 @@ mkdir package
 pip install -r requirements.txt -t package/
 
 # Copy Lambda code
-cp index.py package/
-cp bedrock_integration.py package/
+cp *.py package/
+cp *.json package/
 
 # Create ZIP file
 cd package
@@ -67,7 +67,7 @@ zip -r ../lambda-deployment.zip .
 cd ..
 
 # Add code files to ZIP
-zip -g lambda-deployment.zip index.py bedrock_integration.py
+zip -g lambda-deployment.zip *.py *.json
 
 echo -e "${GREEN}✓ Lambda package created${NC}"
 cd ../..
@@ -0,0 +1,107 @@
+"""
+Offline Market Intelligence Precompute Pipeline
+Mines MARKET_QUERY lines from exported Lambda logs for the top-N (role, location)
+pairs, generates salary trends and market insights for each, and publishes a
+new versioned snapshot to the market store
+
+Usage:
+    python src/scripts/precompute_market_intel.py --logs export/*.log \\
+        --store-uri s3://<bucket>/market-intel [--top-n 200] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import glob
+import sys
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+# Add lambda directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import bedrock_integration
+import market_store
+from market_store import SALARY_TRENDS, MARKET_INSIGHTS, count_queries, pair_key
+from async_bedrock import get_salary_trends_async, get_market_insights_async
+
+
+def read_lines(patterns: List[str]):
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                yield from f
+
+
+def top_pairs(patterns: List[str], top_n: int) -> List[Tuple[str, str, int]]:
+    counts = count_queries(read_lines(patterns))
+    ranked = sorted(counts.values(), key=lambda entry: entry['count'], reverse=True)[:top_n]
+    return [(entry['role'], entry['location'], entry['count']) for entry in ranked]
+
+
+async def generate(pairs: List[Tuple[str, str, int]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Generate both result kinds for every pair; concurrency is bounded by async_bedrock"""
+    async def one(role: str, location: str):
+        trends, insights = await asyncio.gather(
+            get_salary_trends_async(role, location),
+            get_market_insights_async(role, location)
+        )
+        return (role, location), {SALARY_TRENDS: trends, MARKET_INSIGHTS: insights}
+
+    results = await asyncio.gather(*(one(role, location) for role, location, _ in pairs))
+    return dict(results)
+
+
+def carry_forward(entries: Dict[Tuple[str, str], Dict[str, Any]], previous: Dict[str, Any]) -> int:
+    """
+    Reuse the previous snapshot's result where generation failed (an empty or
+    fallback placeholder result); failures with nothing to reuse are left out
+    of the snapshot so requests for them go to the model
+    """
+    previous_entries = (previous or {}).get('entries', {})
+    reused = 0
+    for (role, location), data in entries.items():
+        old = previous_entries.get(pair_key(role, location), {})
+        for kind in (SALARY_TRENDS, MARKET_INSIGHTS):
+            if not bedrock_integration.is_placeholder(data.get(kind)):
+                continue
+            if bedrock_integration.is_placeholder(old.get(kind)):
+                data[kind] = {}
+            else:
+                data[kind] = old[kind]
+                reused += 1
+    return reused
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logs', nargs='+', required=True, help='Log export files or glob patterns')
+    parser.add_argument('--store-uri', default=market_store.MARKET_STORE_URI,
+                        help='s3://bucket/prefix or local directory (default: MARKET_STORE_URI)')
+    parser.add_argument('--top-n', type=int, default=200)
+    parser.add_argument('--version', default=time.strftime('%Y%m%d%H%M%S', time.gmtime()))
+    parser.add_argument('--dry-run', action='store_true', help='Print the selected pairs only')
+    args = parser.parse_args()
+
+    pairs = top_pairs(args.logs, args.top_n)
+    print(f"Selected {len(pairs)} (role, location) pairs")
+    for role, location, count in pairs[:20]:
+        print(f"  {count:>7}  {role} / {location}")
+    if args.dry_run or not pairs:
+        return
+    if not args.store_uri:
+        parser.error('--store-uri or MARKET_STORE_URI is required')
+
+    start = time.perf_counter()
+    entries = asyncio.run(generate(pairs))
+    reused = carry_forward(entries, market_store.load_latest(args.store_uri))
+
+    snapshot = market_store.build_snapshot(entries, args.version)
+    name = market_store.publish(snapshot, args.store_uri)
+    size = len(market_store.encode_snapshot(snapshot))
+    print(f"Published {name} ({len(snapshot['entries'])} pairs, {size / 1024:.1f} KiB, "
+          f"{reused} results carried forward) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
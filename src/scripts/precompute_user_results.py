@@ -0,0 +1,104 @@
+"""
+Nightly Per-User Batch Inference
+Scans the users table for active users, builds a Bedrock batch-inference run
+for job recommendations and career roadmaps, executes it (a Bedrock batch job,
+or on-demand calls for small runs) and bulk-writes the results onto the user
+items, where the API serves them instead of calling the model. Rerunning with
+the same --run-uri resumes an interrupted run.
+
+Usage:
+    python src/scripts/precompute_user_results.py \\
+        --run-uri s3://<bucket>/batch-runs/$(date +%Y%m%d) \\
+        [--executor auto|local|bedrock] [--role-arn <bedrock batch role>] \\
+        [--active-days 30] [--functions get_job_recommendations generate_career_roadmap] \\
+        [--segments 4] [--dry-run]
+"""
+
+import argparse
+import itertools
+import sys
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add lambda directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import batch_inference
+from aws_clients import get_client, get_resource
+
+USERS_TABLE = os.environ.get('USERS_TABLE', 'CareerAgentUsers')
+
+
+class RunExecutor:
+    """Picks the executor once the run is prepared and its record count is known"""
+
+    def __init__(self, kind: str, role_arn: str, concurrency: int):
+        self.kind = kind
+        self.role_arn = role_arn
+        self.local = batch_inference.LocalExecutor(concurrency=concurrency)
+
+    def run(self, uri: str, progress: dict) -> None:
+        records = progress.get('counts', {}).get('records', 0)
+        use_batch = self.kind == 'bedrock' or (
+            self.kind == 'auto' and uri.startswith('s3://') and records >= batch_inference.BEDROCK_BATCH_MIN_RECORDS
+        )
+        if use_batch:
+            print(f"Running {records} records as a Bedrock batch job")
+            batch_inference.BedrockBatchExecutor(self.role_arn).run(uri, progress)
+        else:
+            print(f"Running {records} records on demand")
+            self.local.run(uri, progress)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--run-uri', required=True, help='s3://bucket/prefix/<runId> or a local directory')
+    parser.add_argument('--executor', choices=['auto', 'local', 'bedrock'], default='auto',
+                        help=f'auto uses a Bedrock batch job from {batch_inference.BEDROCK_BATCH_MIN_RECORDS} '
+                             'records on an s3:// run URI, on-demand calls otherwise')
+    parser.add_argument('--role-arn', default=batch_inference.BATCH_ROLE_ARN,
+                        help='Service role for Bedrock batch jobs (default: BEDROCK_BATCH_ROLE_ARN)')
+    parser.add_argument('--table', default=USERS_TABLE)
+    parser.add_argument('--functions', nargs='+', choices=sorted(batch_inference.FUNCTIONS),
+                        default=sorted(batch_inference.FUNCTIONS))
+    parser.add_argument('--active-days', type=int, default=30,
+                        help='Only users updated within this many days (0 for all)')
+    parser.add_argument('--segments', type=int, default=1, help='Parallel-scan segments to read')
+    parser.add_argument('--refresh-hours', type=float, default=batch_inference.REFRESH_AFTER_SECONDS / 3600,
+                        help='Regenerate unchanged results older than this')
+    parser.add_argument('--concurrency', type=int, default=8, help='On-demand calls in flight (local executor)')
+    parser.add_argument('--dry-run', action='store_true', help='Count the records a run would contain')
+    args = parser.parse_args()
+
+    active_since = None
+    if args.active_days:
+        active_since = (datetime.now(timezone.utc) - timedelta(days=args.active_days)).replace(tzinfo=None).isoformat()
+    table = get_resource('dynamodb').Table(args.table)
+    users = itertools.chain.from_iterable(
+        batch_inference.iter_users(table, active_since, segment, args.segments) for segment in range(args.segments)
+    )
+    refresh_after = int(args.refresh_hours * 3600)
+
+    if args.dry_run:
+        _, _, counts = batch_inference.build_records(users, args.functions, refresh_after)
+        print(f"Would submit {counts['records']} records for {counts['users']} users "
+              f"({counts['fresh']} results still fresh, {counts['missingInputs']} missing inputs)")
+        return
+
+    progress = batch_inference.load_progress(args.run_uri)
+    if progress.get('stage'):
+        print(f"Resuming run at stage '{progress['stage']}'")
+        users = None
+
+    start = time.perf_counter()
+    executor = RunExecutor(args.executor, args.role_arn, args.concurrency)
+    counts = batch_inference.run_batch(args.run_uri, users, executor, get_client('dynamodb'), args.table,
+                                       args.functions, refresh_after)
+    print(f"Run {args.run_uri} reached stage '{counts.pop('stage')}' in {time.perf_counter() - start:.1f}s")
+    for name, value in sorted(counts.items()):
+        print(f"  {name:>14}: {value}")
+
+
+if __name__ == '__main__':
+    main()
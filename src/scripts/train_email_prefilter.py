@@ -0,0 +1,97 @@
+"""
+Train the Email Interview Pre-Filter
+Fits the Naive Bayes weights shipped as backend/lambda/email_prefilter_model.json
+from labeled emails (JSONL lines with "text" and "isInterview"), and prints the
+cross-validated precision/recall tradeoff of the skip decision per threshold
+
+Usage:
+    python src/scripts/train_email_prefilter.py --data src/scripts/email_prefilter_seed.jsonl \\
+        [labeled-export.jsonl ...] [--folds 5] [--dry-run]
+"""
+
+import argparse
+import json
+import random
+import sys
+import os
+from typing import List, Tuple
+
+# Add lambda directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import email_prefilter
+from email_prefilter import EmailClassifier, evaluate, train
+
+DEFAULT_THRESHOLDS = [0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5]
+
+
+def load_examples(paths: List[str]) -> List[Tuple[str, bool]]:
+    examples = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    examples.append((record['text'], bool(record['isInterview'])))
+    return examples
+
+
+def cross_validate(examples: List[Tuple[str, bool]], folds: int, thresholds: List[float], min_df: int,
+                   model_skip: bool = False):
+    """Pool held-out skip decisions over the folds, per threshold"""
+    shuffled = examples[:]
+    random.Random(7).shuffle(shuffled)
+    totals = {threshold: {'skipped': 0, 'missed': 0} for threshold in thresholds}
+    for fold in range(folds):
+        held_out = shuffled[fold::folds]
+        training = [example for i, example in enumerate(shuffled) if i % folds != fold]
+        classifier = EmailClassifier(train(training, min_df=min_df))
+        for row in evaluate(held_out, thresholds, classifier, model_skip):
+            totals[row['threshold']]['skipped'] += row['skipped']
+            totals[row['threshold']]['missed'] += row['missedInterviews']
+
+    interviews = sum(1 for _, label in examples if label)
+    for threshold in thresholds:
+        skipped, missed = totals[threshold]['skipped'], totals[threshold]['missed']
+        yield {
+            'threshold': threshold,
+            'skipRate': skipped / len(examples),
+            'skipPrecision': 1 - missed / skipped if skipped else 1.0,
+            'interviewRecall': 1 - missed / interviews if interviews else 1.0,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', nargs='+', required=True, help='Labeled JSONL files')
+    parser.add_argument('--out', default=email_prefilter.MODEL_PATH)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--min-df', type=int, default=2)
+    parser.add_argument('--thresholds', type=float, nargs='+', default=DEFAULT_THRESHOLDS)
+    parser.add_argument('--model-skip', action='store_true',
+                        help='Also let the classifier skip emails with no rule hit (EMAIL_PREFILTER_MODEL_SKIP)')
+    parser.add_argument('--dry-run', action='store_true', help='Report only, do not write the model')
+    args = parser.parse_args()
+
+    examples = load_examples(args.data)
+    interviews = sum(1 for _, label in examples if label)
+    print(f"{len(examples)} labeled emails ({interviews} interviews)")
+
+    mode = 'rules + classifier' if args.model_skip else 'rules, classifier veto only'
+    print(f"\n{args.folds}-fold cross-validation of the skip decision ({mode})")
+    print(f"{'skip below':>10} {'never reach model':>18} {'skip precision':>15} {'interview recall':>17}")
+    for row in cross_validate(examples, args.folds, args.thresholds, args.min_df, args.model_skip):
+        print(f"{row['threshold']:>10.2f} {row['skipRate']:>18.1%} {row['skipPrecision']:>15.1%} "
+              f"{row['interviewRecall']:>17.1%}")
+
+    if args.dry_run:
+        return
+    model = train(examples, min_df=args.min_df)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(model, f, indent=1, sort_keys=True)
+        f.write('\n')
+    print(f"\nWrote {len(model['weights'])} token weights to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Test Suite for the Asyncio Bedrock Interface
+Tests bounded concurrency and parity with the synchronous functions
+"""
+
+import unittest
+import asyncio
+import json
+import sys
+import os
+import threading
+import time
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+from async_bedrock import (
+    AsyncBedrockClient,
+    gather_ai_calls,
+    get_salary_trends_async,
+    get_skill_demand_forecast_async
+)
+from response_cache import response_cache
+import bedrock_integration
+
+
+class TestAsyncBedrockClient(unittest.TestCase):
+    """Test cases for the async Bedrock client"""
+
+    def setUp(self):
+        response_cache.clear()
+
+    def test_concurrency_is_bounded(self):
+        """Test no more than max_concurrency calls run at once"""
+        client = AsyncBedrockClient(max_concurrency=3)
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def slow_call(value):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.02)
+            with lock:
+                state['active'] -= 1
+            return value * 2
+
+        async def fan_out():
+            return await asyncio.gather(*(client.run(slow_call, i) for i in range(10)))
+
+        results = asyncio.run(fan_out())
+        client.shutdown()
+
+        self.assertEqual(results, [i * 2 for i in range(10)])
+        self.assertEqual(state['peak'], 3)
+
+    def test_invalid_concurrency(self):
+        """Test a concurrency limit below one is rejected"""
+        with self.assertRaises(ValueError):
+            AsyncBedrockClient(max_concurrency=0)
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_async_variants_match_sync_results(self, mock_bedrock):
+        """Test awaitable variants return the same parsed results"""
+        payloads = {
+            'salary trend': {'currentAverage': 140000, 'range': {'min': 100000, 'max': 180000}},
+            'demand and growth': [{'skill': 'Python', 'currentDemand': 90}]
+        }
+
+        def respond(**kwargs):
+            prompt = json.loads(kwargs['body'])['messages'][0]['content']
+            payload = next(v for k, v in payloads.items() if k in prompt)
+            response = {'body': MagicMock()}
+            response['body'].read.return_value = json.dumps(
+                {'content': [{'text': json.dumps(payload)}]}
+            ).encode()
+            return response
+
+        mock_bedrock.invoke_model.side_effect = respond
+
+        results = gather_ai_calls(
+            trends=get_salary_trends_async('Data Engineer', 'Seattle'),
+            demand=get_skill_demand_forecast_async(['Python'])
+        )
+
+        response_cache.clear()
+        self.assertEqual(results['trends'], bedrock_integration.get_salary_trends('Data Engineer', 'Seattle'))
+        self.assertEqual(results['demand'], bedrock_integration.get_skill_demand_forecast(['Python']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Test Suite for the Local ATS Keyword-Match Engine
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import index
+import ats_engine
+from ats_engine import extract_keywords, role_keywords, score_resume, score_resumes, merge_analysis
+
+JOB = """Data Engineer
+About us
+We move money for millions of people.
+Requirements
+- 5+ years of Python and SQL
+- Spark, Airflow and Kafka on AWS
+- Data modeling for the warehouse
+Nice to have
+- dbt
+Benefits
+- Free lunch
+"""
+
+RESUME = """Jane Doe
+jane@example.com | +1 (206) 555-0100
+Summary
+Data engineer.
+Experience
+Data Engineer, Acme 2019 - Present
+- Built Spark and Airflow pipelines processing 2 TB/day, cutting cost 30%
+- Migrated ETL to AWS saving $40k per year
+- Led data modeling for the warehouse
+Skills
+Python, SQL
+Education
+BSc Computer Science 2018
+"""
+
+
+class TestATSEngine(unittest.TestCase):
+    """Test cases for keyword, section and format scoring"""
+
+    def test_extract_keywords_weights_requirements(self):
+        """Test requirement terms outrank optional ones and perks and generic words are ignored"""
+        keywords = dict(extract_keywords(JOB))
+
+        self.assertIn('data modeling', keywords)
+        self.assertNotIn('data', keywords)
+        self.assertGreater(keywords['kafka'], keywords['dbt'])
+        self.assertNotIn('lunch', keywords)
+        self.assertNotIn('years', keywords)
+        self.assertNotIn('5+', keywords)
+
+    def test_role_keywords(self):
+        """Test a seniority-qualified title maps to its role family"""
+        self.assertIn('airflow', role_keywords('Senior Data Engineer II'))
+        self.assertIn('pytorch', role_keywords('Machine Learning Engineer'))
+        self.assertEqual(role_keywords('Chef'), [])
+
+    def test_score_is_deterministic_with_matched_and_missing(self):
+        """Test the same input always scores the same and reports keyword gaps"""
+        first = score_resume(RESUME, JOB)
+        second = score_resume(RESUME, JOB)
+
+        self.assertEqual(first, second)
+        self.assertIn('kafka', first['missingKeywords'])
+        self.assertIn('data modeling', first['matchedKeywords'])
+        self.assertEqual(first['sectionScore'], 100)
+        self.assertTrue(first['formatting']['quantifiedAchievements'])
+        self.assertTrue(0 <= first['atsScore'] <= 100)
+
+    def test_batch_matches_single_scores(self):
+        """Test vectorized batch scoring equals per-resume scoring"""
+        resumes = [RESUME, 'Python developer', '', RESUME.replace('Kafka', '') + '\nKafka']
+        keywords = ats_engine.resolve_keywords(JOB)
+        batch = score_resumes(resumes, keywords)
+
+        self.assertEqual(batch, [score_resumes([text], keywords)[0] for text in resumes])
+        self.assertGreater(batch[3]['keywordMatch'], batch[0]['keywordMatch'])
+        self.assertEqual(batch[2]['keywordMatch'], 0)
+
+    def test_keyword_strings_and_malformed_keywords(self):
+        """Test a comma-separated string is split into keywords and unusable keyword values are ignored"""
+        self.assertEqual(ats_engine.resolve_keywords(keywords='python, aws ,'), ['python', 'aws'])
+        self.assertEqual(ats_engine.resolve_keywords(keywords=['sql', ['kafka', 2], 5, {'x': 1}]),
+                         ['sql', ('kafka', 2.0)])
+        self.assertEqual(ats_engine.resolve_keywords(JOB, keywords={'python': 1}), ats_engine.resolve_keywords(JOB))
+        self.assertEqual(score_resume(RESUME, keywords='Python, Kafka')['missingKeywords'], ['kafka'])
+
+    def test_without_target_keyword_match_is_none(self):
+        """Test scoring without any keyword target uses sections and formatting only"""
+        result = score_resume(RESUME)
+        self.assertIsNone(result['keywordMatch'])
+        self.assertEqual(result['matchedKeywords'], [])
+
+    def test_merge_prefers_local_scores(self):
+        """Test model-supplied score fields never override local ones"""
+        merged = merge_analysis({'atsScore': 61}, {'atsScore': 95, 'strengths': ['x']})
+        self.assertEqual(merged, {'atsScore': 61, 'strengths': ['x']})
+
+
+class TestATSScoreRoute(unittest.TestCase):
+    """Test cases for /api/resume/ats-score"""
+
+    def call(self, payload):
+        with patch('bedrock_integration.bedrock_runtime') as bedrock:
+            response = index.lambda_handler({
+                'httpMethod': 'POST', 'path': '/api/resume/ats-score', 'body': json.dumps(payload)
+            }, None)
+        bedrock.invoke_model.assert_not_called()
+        return response['statusCode'], json.loads(response['body'])
+
+    def test_batch_scoring_without_model(self):
+        """Test a batch of resumes is scored locally against a job description"""
+        status, body = self.call({'resumes': [RESUME, 'Chef'], 'jobDescription': JOB})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body['count'], 2)
+        self.assertGreater(body['results'][0]['keywordMatch'], body['results'][1]['keywordMatch'])
+
+    def test_invalid_batch(self):
+        """Test an empty batch is rejected"""
+        status, _ = self.call({'resumes': []})
+        self.assertEqual(status, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
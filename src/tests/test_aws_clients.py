@@ -0,0 +1,116 @@
+"""
+Test Suite for the Shared AWS Client Registry and Cold-Start Profiling
+"""
+
+import unittest
+import sys
+import os
+import subprocess
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import aws_clients
+from aws_clients import LazyClient, get_client, get_resource
+from cold_start import ImportTimer
+
+
+class TestClientRegistry(unittest.TestCase):
+    """Test cases for lazy, shared client creation"""
+
+    def setUp(self):
+        aws_clients.reset()
+        self.session = MagicMock()
+        self.session.client.side_effect = lambda service, region_name, config: MagicMock(name=f'{service}-{region_name}')
+        patcher = patch('aws_clients._get_session', return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(aws_clients.reset)
+
+    def test_lazy_client_created_on_first_use(self):
+        """Test no client is built until an attribute is accessed"""
+        lazy = LazyClient('bedrock-runtime', region_name='us-west-2')
+        self.session.client.assert_not_called()
+
+        lazy.invoke_model
+        lazy.invoke_model_with_response_stream
+        self.session.client.assert_called_once()
+        self.assertEqual(self.session.client.call_args[0], ('bedrock-runtime',))
+        self.assertEqual(self.session.client.call_args[1]['region_name'], 'us-west-2')
+
+    def test_clients_shared_per_service_and_region(self):
+        """Test one client per (service, region) across callers"""
+        self.assertIs(get_client('s3', 'us-east-1'), get_client('s3', 'us-east-1'))
+        self.assertIsNot(get_client('s3', 'us-east-1'), get_client('s3', 'eu-west-1'))
+        get_resource('dynamodb', 'us-east-1')
+
+        report = aws_clients.creation_report()
+        self.assertEqual(len(report), 3)
+        self.assertEqual({entry['kind'] for entry in report}, {'client', 'resource'})
+
+
+class TestClientConfig(unittest.TestCase):
+    """Test cases for the shared botocore configuration"""
+
+    def test_defaults_enable_pooling_and_keepalive(self):
+        """Test default settings raise the pool size and turn on TCP keep-alive"""
+        settings = aws_clients.client_settings('dynamodb')
+        self.assertGreater(settings['max_pool_connections'], 10)
+        self.assertTrue(settings['tcp_keepalive'])
+        self.assertEqual(settings['retries']['mode'], 'standard')
+
+    def test_service_overrides(self):
+        """Test per-service environment variables override the defaults"""
+        with patch.dict(os.environ, {'BEDROCK_READ_TIMEOUT': '300', 'DYNAMODB_MAX_ATTEMPTS': '6'}):
+            self.assertEqual(aws_clients.client_settings('bedrock-runtime')['read_timeout'], 300.0)
+            self.assertEqual(aws_clients.client_settings('dynamodb')['retries']['max_attempts'], 6)
+            self.assertEqual(aws_clients.client_settings('s3')['retries']['max_attempts'], 3)
+
+    def test_bedrock_gets_longer_read_timeout(self):
+        """Test Bedrock defaults to a longer read timeout than other services"""
+        self.assertGreater(aws_clients.client_settings('bedrock-runtime')['read_timeout'],
+                           aws_clients.client_settings('s3')['read_timeout'])
+
+    def test_connection_stats_report_reuse(self):
+        """Test reuse rate is derived from connections opened vs requests sent"""
+        pool = MagicMock(num_connections=2, num_requests=50)
+        pool.pool.queue = [object(), None]
+        with patch.dict(aws_clients._instances, {('client', 's3', 'us-east-1'): MagicMock()}, clear=True), \
+                patch('aws_clients._pools', return_value=[pool]):
+            stats = aws_clients.connection_stats()
+
+        self.assertEqual(stats[0]['connectionsOpened'], 2)
+        self.assertEqual(stats[0]['requests'], 50)
+        self.assertEqual(stats[0]['reuseRate'], 0.96)
+        self.assertEqual(stats[0]['idleConnections'], 1)
+
+
+class TestImportTimer(unittest.TestCase):
+    """Test cases for import-time profiling"""
+
+    def test_records_module_import_cost(self):
+        """Test modules imported while installed are timed"""
+        timer = ImportTimer()
+        sys.meta_path.insert(0, timer)
+        try:
+            sys.modules.pop('colorsys', None)
+            import colorsys  # noqa: F401
+        finally:
+            sys.meta_path.remove(timer)
+
+        modules = {entry['module']: entry for entry in timer.report()}
+        self.assertIn('colorsys', modules)
+        self.assertGreaterEqual(modules['colorsys']['cumulativeMs'], modules['colorsys']['selfMs'])
+
+    def test_handler_modules_do_not_import_numpy(self):
+        """Test the cold-start import of index and bedrock_integration leaves NumPy unloaded"""
+        lambda_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda'))
+        script = "import sys, index, bedrock_integration, resume_dedup; print('numpy' in sys.modules)"
+        output = subprocess.run([sys.executable, '-c', script], cwd=lambda_dir, capture_output=True, text=True,
+                                check=True).stdout
+        self.assertEqual(output.strip().splitlines()[-1], 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,244 @@
+"""
+Test Suite for Offline Batch Inference
+"""
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import batch_inference
+import bedrock_integration
+import index
+from batch_inference import (
+    BedrockBatchExecutor,
+    LocalExecutor,
+    build_records,
+    input_hash,
+    lookup,
+    run_batch
+)
+from market_store import read_object
+
+USERS = [
+    {'userId': 'u1', 'skills': ['Python', 'AWS'], 'currentRole': 'Data Analyst', 'targetRole': 'Data Engineer'},
+    {'userId': 'u2', 'skills': ['React'], 'targetRole': 'Frontend Developer'},
+    {'userId': 'u3'},
+]
+RECOMMENDATIONS = [{'title': 'Data Engineer', 'description': 'Pipelines', 'match_score': 87.5}]
+ROADMAP = {'timeline': '12 months', 'requiredSkills': [], 'milestones': []}
+
+
+def stub_model(body):
+    """Recommendations or roadmap depending on the prompt"""
+    prompt = body['messages'][0]['content']
+    result = ROADMAP if 'career roadmap' in prompt else RECOMMENDATIONS
+    return {'content': [{'type': 'text', 'text': json.dumps(result)}], 'stop_reason': 'end_turn'}
+
+
+def dynamodb_client(stored):
+    """Low-level DynamoDB client mock applying SET #attr = :value to stored items"""
+    from boto3.dynamodb.types import TypeDeserializer
+    deserializer = TypeDeserializer()
+    client = MagicMock()
+
+    def update_item(**kwargs):
+        user_id = deserializer.deserialize(kwargs['Key']['userId'])
+        if user_id not in stored:
+            error = Exception('ConditionalCheckFailedException')
+            error.response = {'Error': {'Code': 'ConditionalCheckFailedException'}}
+            raise error
+        attribute = kwargs['ExpressionAttributeNames']['#attr']
+        stored[user_id][attribute] = deserializer.deserialize(kwargs['ExpressionAttributeValues'][':value'])
+
+    client.update_item.side_effect = update_item
+    return client
+
+
+class BatchRunTestCase(unittest.TestCase):
+    """Shared local run directory and user store"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.uri = os.path.join(self.tmp, 'run-1')
+        self.stored = {user['userId']: dict(user) for user in USERS}
+        self.client = dynamodb_client(self.stored)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def run_local(self, users=USERS, invoke=stub_model):
+        return run_batch(self.uri, users, LocalExecutor(invoke, concurrency=2), self.client, 'Users')
+
+
+class TestRunBatch(BatchRunTestCase):
+    """Test cases for run_batch"""
+
+    def test_writes_bedrock_batch_input_format(self):
+        """Test the input is Bedrock batch JSONL with 11-character record IDs"""
+        self.run_local()
+
+        lines = read_object(self.uri, 'input.jsonl').decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        record = json.loads(lines[0])
+        self.assertEqual(set(record), {'recordId', 'modelInput'})
+        self.assertRegex(record['recordId'], r'^[A-Za-z0-9]{11}$')
+        self.assertEqual(record['modelInput']['anthropic_version'], 'bedrock-2023-05-31')
+
+    def test_results_written_and_served(self):
+        """Test parsed results are stored on the user items and served by lookup"""
+        counts = self.run_local()
+
+        self.assertEqual((counts['records'], counts['written'], counts['missingInputs']), (3, 3, 3))
+        self.assertEqual(counts['stage'], 'written')
+        user = self.stored['u1']
+        self.assertEqual(user['precomputedRoadmap']['result'], ROADMAP)
+        self.assertIsInstance(user['precomputedRecommendations']['result'][0]['match_score'], Decimal)
+
+        prompt = bedrock_integration.build_job_recommendations_prompt(user)
+        self.assertEqual(lookup(user, 'get_job_recommendations', prompt), RECOMMENDATIONS)
+
+    def test_rerun_resumes_without_reexecuting(self):
+        """Test a finished run is not executed again and a new run skips fresh results"""
+        self.run_local()
+        invoke = MagicMock(side_effect=stub_model)
+
+        self.assertEqual(self.run_local(invoke=invoke)['stage'], 'written')
+        self.uri = os.path.join(self.tmp, 'run-2')
+        counts = self.run_local(users=list(self.stored.values()), invoke=invoke)
+
+        self.assertEqual((counts['records'], counts['fresh']), (0, 3))
+        invoke.assert_not_called()
+
+    def test_interrupted_write_resumes(self):
+        """Test a run interrupted while writing picks up from the saved position"""
+        with patch('batch_inference.update_items', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.run_local()
+        self.assertEqual(batch_inference.load_progress(self.uri)['stage'], 'executed')
+
+        self.client = dynamodb_client(self.stored)
+        invoke = MagicMock(side_effect=stub_model)
+        counts = self.run_local(users=None, invoke=invoke)
+
+        self.assertEqual(counts['written'], 3)
+        invoke.assert_not_called()
+
+    def test_failed_records_and_deleted_users(self):
+        """Test model errors and unparseable output are counted, deleted users are not recreated"""
+        def flaky(body):
+            if 'React' in body['messages'][0]['content']:
+                raise RuntimeError('ThrottlingException')
+            return {'content': [{'type': 'text', 'text': 'no json here'}]} \
+                if 'career roadmap' in body['messages'][0]['content'] else stub_model(body)
+
+        del self.stored['u1']
+        counts = self.run_local(invoke=flaky)
+
+        self.assertEqual(counts['failed'], 2)
+        self.assertEqual(counts['userDeleted'], 1)
+        self.assertNotIn('u1', self.stored)
+
+
+class TestBuildRecords(unittest.TestCase):
+    """Test cases for build_records"""
+
+    def test_changed_inputs_are_regenerated(self):
+        """Test a stored result is only reused while its input hash matches"""
+        user = dict(USERS[1])
+        prompt = bedrock_integration.build_job_recommendations_prompt(user)
+        user['precomputedRecommendations'] = {'result': [], 'inputHash': input_hash('get_job_recommendations', prompt),
+                                              'generatedAt': int(time.time())}
+
+        _, lines, counts = build_records([user], ['get_job_recommendations'])
+        self.assertEqual((len(lines), counts['fresh']), (0, 1))
+
+        user['skills'] = ['React', 'TypeScript']
+        _, lines, _ = build_records([user], ['get_job_recommendations'])
+        self.assertEqual(len(lines), 1)
+
+
+class TestLookup(unittest.TestCase):
+    """Test cases for request-time lookups"""
+
+    def setUp(self):
+        batch_inference.lookup_stats.reset()
+        self.prompt = bedrock_integration.build_job_recommendations_prompt(USERS[0])
+
+    def stored(self, age_seconds=0, prompt=None):
+        return {'precomputedRecommendations': {
+            'result': [{'match_score': Decimal('90')}],
+            'inputHash': input_hash('get_job_recommendations', prompt or self.prompt),
+            'generatedAt': Decimal(int(time.time() - age_seconds))
+        }}
+
+    def test_outcomes(self):
+        """Test hits convert Decimals; changed, expired and missing results fall back"""
+        self.assertEqual(lookup(self.stored(), 'get_job_recommendations', self.prompt), [{'match_score': 90}])
+        self.assertIsNone(lookup(self.stored(prompt='old profile'), 'get_job_recommendations', self.prompt))
+        self.assertIsNone(lookup(self.stored(age_seconds=10 ** 7), 'get_job_recommendations', self.prompt))
+        self.assertIsNone(lookup({}, 'get_job_recommendations', self.prompt))
+        self.assertEqual(batch_inference.lookup_stats.report(), {
+            'get_job_recommendations.hit': 1, 'get_job_recommendations.changed': 1,
+            'get_job_recommendations.expired': 1, 'get_job_recommendations.miss': 1
+        })
+
+    @patch('bedrock_integration.get_job_recommendations')
+    def test_jobs_endpoint_serves_precomputed(self, mock_live):
+        """Test GET /api/jobs reads the stored recommendations instead of calling the model"""
+        index.profile_cache.clear()
+        user = dict(USERS[0], **self.stored())
+        with patch.object(index, 'dynamodb') as dynamodb:
+            dynamodb.Table.return_value.get_item.return_value = {'Item': user}
+            response = index.lambda_handler({'httpMethod': 'GET', 'path': '/api/jobs',
+                                             'queryStringParameters': {'userId': 'u1'}}, None)
+
+        self.assertEqual(json.loads(response['body']), [{'match_score': 90}])
+        mock_live.assert_not_called()
+
+
+class TestBedrockBatchExecutor(unittest.TestCase):
+    """Test cases for BedrockBatchExecutor"""
+
+    @patch('batch_inference.save_progress')
+    @patch('batch_inference.get_client')
+    def test_submits_once_and_waits(self, mock_get_client, mock_save):
+        """Test the job is submitted with S3 input/output and an existing job ARN is reused"""
+        bedrock = mock_get_client.return_value
+        bedrock.create_model_invocation_job.return_value = {'jobArn': 'arn:job/1'}
+        bedrock.get_model_invocation_job.side_effect = [{'status': 'InProgress'}, {'status': 'Completed'}]
+        executor = BedrockBatchExecutor('arn:role', poll_seconds=0)
+        progress = {}
+
+        executor.run('s3://bucket/batch-runs/20250101', progress)
+
+        kwargs = bedrock.create_model_invocation_job.call_args.kwargs
+        self.assertEqual(kwargs['inputDataConfig']['s3InputDataConfig']['s3Uri'],
+                         's3://bucket/batch-runs/20250101/input.jsonl')
+        self.assertEqual(kwargs['outputDataConfig']['s3OutputDataConfig']['s3Uri'],
+                         's3://bucket/batch-runs/20250101/output/')
+        self.assertEqual(progress['jobArn'], 'arn:job/1')
+
+        bedrock.get_model_invocation_job.side_effect = [{'status': 'Failed', 'message': 'bad input'}]
+        with self.assertRaises(RuntimeError):
+            executor.run('s3://bucket/batch-runs/20250101', progress)
+        self.assertEqual(bedrock.create_model_invocation_job.call_count, 1)
+
+    def test_requires_role_and_s3(self):
+        """Test a role ARN and an S3 run URI are required"""
+        with self.assertRaises(ValueError):
+            BedrockBatchExecutor('')
+        with self.assertRaises(ValueError):
+            BedrockBatchExecutor('arn:role').run('/tmp/run', {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,7 @@ from bedrock_integration import (
     generate_career_roadmap,
     get_market_insights,
     calculate_job_score,
+    score_jobs_batch,
     generate_interview_questions,
     analyze_email_for_interview
 )
@@ -298,6 +299,44 @@ class TestJobScoring(unittest.TestCase):
         self.assertLessEqual(score, 100)
         self.assertIsInstance(score, int)
 
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_score_jobs_batch_packs_jobs_per_call(self, mock_bedrock):
+        """Test a 200-job feed is scored in a few model calls"""
+        def respond(**kwargs):
+            prompt = json.loads(kwargs['body'])['messages'][0]['content']
+            job_ids = [line.split('jobId: ')[1].split(' |')[0]
+                       for line in prompt.splitlines() if 'jobId: ' in line]
+            mock_response = {'body': MagicMock()}
+            mock_response['body'].read.return_value = json.dumps({
+                'content': [{
+                    'text': json.dumps([{'jobId': job_id, 'score': 150} for job_id in job_ids])
+                }]
+            }).encode()
+            return mock_response
+
+        mock_bedrock.invoke_model.side_effect = respond
+
+        jobs = [{'jobId': f'batch-job-{i}', 'title': 'Engineer'} for i in range(200)]
+        scores = score_jobs_batch({'skills': ['Python']}, jobs)
+
+        self.assertEqual(len(scores), 200)
+        self.assertTrue(all(score == 100 for score in scores.values()))
+        self.assertLessEqual(mock_bedrock.invoke_model.call_count, 5)
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_score_jobs_batch_skips_malformed_entries(self, mock_bedrock):
+        """Test one malformed entry mid-array only drops its own score"""
+        entries = [{'jobId': 'j1', 'score': 80}, 'j2: 75', {'jobId': 'j3', 'score': None},
+                   {'jobId': 'j4', 'score': '85%'}, {'jobId': 'j5', 'score': 'high'}, {'jobId': 'j6', 'score': 61.5}]
+        mock_response = {'body': MagicMock()}
+        mock_response['body'].read.return_value = json.dumps({'content': [{'text': json.dumps(entries)}]}).encode()
+        mock_bedrock.invoke_model.return_value = mock_response
+
+        jobs = [{'jobId': f'j{i}', 'title': 'Malformed Entry Engineer'} for i in range(1, 7)]
+        scores = score_jobs_batch({'skills': ['Go']}, jobs)
+
+        self.assertEqual(scores, {'j1': 80, 'j4': 85, 'j6': 61})
+
 
 def run_tests():
     """Run all tests"""
@@ -0,0 +1,75 @@
+"""
+Test Suite for Bulk Application Import and Status Update
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import index
+
+
+class TestBulkApplications(unittest.TestCase):
+    """Test cases for /api/applications/bulk"""
+
+    def setUp(self):
+        patcher = patch.object(index, 'dynamodb')
+        self.client = patcher.start().meta.client
+        self.addCleanup(patcher.stop)
+
+    def call(self, method, payload):
+        response = index.lambda_handler({
+            'httpMethod': method,
+            'path': '/api/applications/bulk',
+            'body': json.dumps(payload)
+        }, None)
+        return response['statusCode'], json.loads(response['body'])
+
+    def test_bulk_import_returns_per_item_results(self):
+        """Test a spreadsheet import is written in batches with one result per row"""
+        self.client.batch_write_item.return_value = {}
+        rows = [{'company': f'Company {i}', 'salary': 120000.5} for i in range(30)] + ['not an object']
+
+        status, body = self.call('POST', {'userId': 'u1', 'applications': rows})
+
+        self.assertEqual(status, 200)
+        self.assertEqual((body['created'], body['failed']), (30, 1))
+        self.assertEqual(self.client.batch_write_item.call_count, 2)
+        self.assertEqual(len({result.get('applicationId') for result in body['results'][:30]}), 30)
+        self.assertEqual(body['results'][30]['status'], 'failed')
+
+    def test_bulk_status_update_uses_conditional_updates(self):
+        """Test unknown or foreign applications are reported as not found"""
+        class ConditionFailed(Exception):
+            response = {'Error': {'Code': 'ConditionalCheckFailedException'}}
+
+        def update(**kwargs):
+            if kwargs['Key']['applicationId']['S'] == 'app-x':
+                raise ConditionFailed()
+            return {}
+
+        self.client.update_item.side_effect = update
+        status, body = self.call('PUT', {'userId': 'u1', 'updates': [
+            {'applicationId': 'app-1', 'status': 'interview'},
+            {'applicationId': 'app-x', 'status': 'offer'},
+            {'status': 'rejected'}
+        ]})
+
+        self.assertEqual(status, 200)
+        self.assertEqual([result['status'] for result in body['results']], ['updated', 'failed', 'failed'])
+        self.assertEqual(body['results'][1]['error'], 'Application not found')
+        self.assertIn('userId = :userId', self.client.update_item.call_args_list[0][1]['ConditionExpression'])
+
+    def test_request_size_is_bounded(self):
+        """Test oversized bulk requests are rejected"""
+        status, _ = self.call('POST', {'userId': 'u1', 'applications': [{}] * (index.MAX_BULK_APPLICATIONS + 1)})
+        self.assertEqual(status, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Test Suite for DynamoDB Batch Helpers
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+from dynamo_batch import batch_get_items, batch_write_items, update_items
+
+
+class TestBatchGetItems(unittest.TestCase):
+    """Test cases for batch_get_items"""
+
+    def test_chunks_and_deduplicates_keys(self):
+        """Test keys are deduplicated and split into 100-key requests"""
+        dynamodb = MagicMock()
+        dynamodb.batch_get_item.side_effect = lambda RequestItems: {
+            'Responses': {'Jobs': [dict(key) for key in RequestItems['Jobs']['Keys']]}
+        }
+
+        key_values = [f'job-{i}' for i in range(250)] + ['job-0', 'job-1']
+        items = batch_get_items(dynamodb, 'Jobs', 'jobId', key_values)
+
+        self.assertEqual(len(items), 250)
+        self.assertEqual(dynamodb.batch_get_item.call_count, 3)
+
+    @patch('dynamo_batch.time.sleep')
+    def test_retries_unprocessed_keys(self, mock_sleep):
+        """Test unprocessed keys are retried with backoff"""
+        dynamodb = MagicMock()
+        dynamodb.batch_get_item.side_effect = [
+            {
+                'Responses': {'Users': [{'userId': 'a'}]},
+                'UnprocessedKeys': {'Users': {'Keys': [{'userId': 'b'}]}}
+            },
+            {'Responses': {'Users': [{'userId': 'b'}]}}
+        ]
+
+        items = batch_get_items(dynamodb, 'Users', 'userId', ['a', 'b'])
+
+        self.assertEqual(set(items), {'a', 'b'})
+        self.assertEqual(mock_sleep.call_count, 1)
+
+
+
+class TestBatchWrites(unittest.TestCase):
+    """Test cases for batch_write_items and update_items"""
+
+    @patch('dynamo_batch.time.sleep')
+    def test_chunks_and_retries_unprocessed_items(self, mock_sleep):
+        """Test items are written 25 per request and unprocessed items retried"""
+        client = MagicMock()
+        retried = []
+
+        def write(RequestItems):
+            entries = RequestItems['Apps']
+            self.assertLessEqual(len(entries), 25)
+            first = entries[0]['PutRequest']['Item']['applicationId']['S']
+            if first == 'app-0' and not retried:
+                retried.append(first)
+                return {'UnprocessedItems': {'Apps': entries[:1]}}
+            return {}
+
+        client.batch_write_item.side_effect = write
+        items = [{'applicationId': f'app-{i}', 'salary': 100} for i in range(60)]
+        results = batch_write_items(client, 'Apps', 'applicationId', items)
+
+        self.assertEqual(len(results), 60)
+        self.assertTrue(all(error is None for error in results.values()))
+        self.assertEqual(client.batch_write_item.call_count, 4)
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    def test_invalid_items_reported_per_item(self):
+        """Test an unserializable item fails alone without blocking the rest"""
+        client = MagicMock()
+        client.batch_write_item.return_value = {}
+        results = batch_write_items(client, 'Apps', 'applicationId',
+                                    [{'applicationId': 'ok'}, {'applicationId': 'bad', 'score': 1.5}])
+
+        self.assertIsNone(results['ok'])
+        self.assertIn('Invalid item', results['bad'])
+
+    def test_update_items_reports_condition_failures(self):
+        """Test conditional update failures are returned in request order"""
+        class ConditionFailed(Exception):
+            response = {'Error': {'Code': 'ConditionalCheckFailedException'}}
+
+        def update(**kwargs):
+            if kwargs['Key']['applicationId']['S'] == 'missing':
+                raise ConditionFailed()
+            return {}
+
+        client = MagicMock()
+        client.update_item.side_effect = update
+        requests = [{'Key': {'applicationId': app_id}, 'UpdateExpression': 'SET #s = :s',
+                     'ExpressionAttributeValues': {':s': 'interview'}} for app_id in ('a', 'missing', 'b')]
+
+        self.assertEqual(update_items(client, 'Apps', requests), [None, 'ConditionalCheckFailed', None])
+        self.assertEqual(client.update_item.call_args_list[0][1]['TableName'], 'Apps')
+
+
+if __name__ == '__main__':
+    unittest.main()
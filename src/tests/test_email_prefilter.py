@@ -0,0 +1,176 @@
+"""
+Test Suite for the Interview Email Pre-Filter
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import bedrock_integration
+import email_prefilter
+from email_prefilter import EmailClassifier, evaluate, extract_details, load_classifier, proper_nouns, screen, train
+
+SEED_PATH = os.path.join(os.path.dirname(__file__), '../scripts/email_prefilter_seed.jsonl')
+
+# Held-out mail with people, companies and wording that do not appear in the seed data
+NOVEL_INVITES = [
+    'Hi Riya, thanks for your interest in Northwind. Could you do a 30 minute call with our engineering lead? '
+    'Send me your availability.',
+    'Good news from Kestrel Labs: Dmitri would like to meet you for the next round. Reply with the times that '
+    'work and I will send an invite.',
+    'Following up on your application to Ollivander Systems, we would like to set up a technical screen with Beatriz.',
+]
+NOVEL_OTHERS = [
+    'Your Pinewood Outfitters receipt: payment received for order 5521. View your account for more details.',
+    'Hi Morgan, your Vandelay Industries subscription renews next week. Update your payment details in account settings.',
+    'Northwind weekly update: see what is new this month. You are receiving this email because you subscribed.',
+]
+
+
+def load_seed():
+    with open(SEED_PATH, 'r', encoding='utf-8') as f:
+        return [(record['text'], record['isInterview']) for record in map(json.loads, f)]
+
+
+def model_response(payload):
+    response = {'body': MagicMock()}
+    response['body'].read.return_value = json.dumps({'content': [{'text': json.dumps(payload)}]}).encode()
+    return response
+
+
+class TestEmailPrefilter(unittest.TestCase):
+    """Test cases for rules, the shipped classifier and regex extraction"""
+
+    def setUp(self):
+        email_prefilter.prefilter_stats.reset()
+
+    def test_extract_details(self):
+        """Test dates, times and meeting links are found without the model"""
+        details = extract_details('Are you free Tuesday, March 12 at 2:00 PM PST? Join https://acme.zoom.us/j/881234.')
+        self.assertEqual(details['date'], 'Tuesday, March 12')
+        self.assertEqual(details['time'], '2:00 PM PST')
+        self.assertEqual(details['meetingLink'], 'https://acme.zoom.us/j/881234')
+        self.assertEqual(details['interviewType'], 'video')
+
+        details = extract_details('Phone screen on 2024-11-04 at 15:00 UTC')
+        self.assertEqual((details['date'], details['time'], details['interviewType']),
+                         ('2024-11-04', '15:00 UTC', 'phone'))
+
+    def test_rules_skip_obvious_negatives(self):
+        """Test newsletters, receipts and rejections skip the model"""
+        self.assertEqual(screen('Your weekly digest. Unsubscribe here.').reason, 'rule:newsletter')
+        self.assertEqual(screen('Your order #123 has shipped').reason, 'rule:receipt')
+        self.assertEqual(screen('Unfortunately we will not be moving forward.').reason, 'rule:rejection')
+
+    def test_scheduling_signal_overrides_rules(self):
+        """Test an invite that happens to match a negative rule still reaches the model"""
+        result = screen('Unfortunately Tuesday no longer works, can we reschedule your interview to Friday?')
+        self.assertFalse(result.skip)
+        self.assertEqual(result.reason, 'scheduling_signal')
+
+    def test_held_out_invites_reach_the_model(self):
+        """Test invites that match a negative rule are not skipped (not in the seed data)"""
+        invites = [
+            'Thank you for applying to Brightline. We would like to set up a call with our CTO on Monday at 10am.',
+            'Hi Sam, we received your application and the team would love to talk. Does Thursday at 4pm work?',
+            'Unfortunately our interviewer is out sick. Could you come in on Thursday 3pm instead?',
+            'Thanks for applying! Please pick a slot for a quick chat with the hiring team next week.',
+        ]
+        for text in invites:
+            self.assertFalse(screen(text).skip, text)
+
+    def test_classifier_alone_does_not_skip(self):
+        """Test a low classifier score without a rule hit only skips when model skipping is enabled"""
+        classifier = MagicMock()
+        classifier.probability.return_value = 0.001
+        self.assertFalse(screen('Quick question about the offsite agenda', classifier).skip)
+        self.assertTrue(screen('Quick question about the offsite agenda', classifier, model_skip=True).skip)
+
+    def test_shipped_model_keeps_every_seed_invite(self):
+        """Test the shipped weights load and no seed invite is skipped at the default threshold"""
+        classifier = load_classifier()
+        self.assertIsNotNone(classifier)
+        examples = load_seed()
+        self.assertFalse(any(screen(text, classifier).skip for text, label in examples if label))
+        self.assertTrue(any(screen(text, classifier).skip for text, label in examples if not label))
+
+    def test_shipped_model_ignores_names(self):
+        """Test the weights hold no seed names or companies, so renaming them does not change the score"""
+        classifier = load_classifier()
+        names = proper_nouns(text for text, _ in load_seed())
+        self.assertTrue({'acme', 'globex', 'hooli', 'alex', 'chris'} <= names)
+        self.assertFalse(names & set(classifier.weights))
+        self.assertFalse([token for token in classifier.weights if 'acme' in token or 'initech' in token])
+        self.assertEqual(classifier.probability('Hi Alex, the team at Acme would like to schedule an interview.'),
+                         classifier.probability('Hi Morgan, the team at Vandelay would like to schedule an interview.'))
+
+    def test_shipped_model_on_novel_vocabulary(self):
+        """Test held-out mail outside the seed vocabulary is separated even when the classifier may skip alone"""
+        classifier = load_classifier()
+        for text in NOVEL_INVITES:
+            self.assertFalse(screen(text, classifier, model_skip=True).skip, text)
+        for text in NOVEL_OTHERS:
+            self.assertTrue(screen(text, classifier, model_skip=True).skip, text)
+        self.assertLess(max(map(classifier.probability, NOVEL_OTHERS)),
+                        min(map(classifier.probability, NOVEL_INVITES)))
+
+    def test_failed_load_is_not_retried(self):
+        """Test missing weights fall back to rules without reopening the file on every call"""
+        saved = (email_prefilter._classifier, email_prefilter._classifier_loaded)
+        self.addCleanup(lambda: setattr(email_prefilter, '_classifier', saved[0]))
+        self.addCleanup(lambda: setattr(email_prefilter, '_classifier_loaded', saved[1]))
+        email_prefilter._classifier, email_prefilter._classifier_loaded = None, False
+
+        with patch('builtins.open', side_effect=OSError('missing')) as mock_open:
+            self.assertIsNone(load_classifier())
+            self.assertIsNone(load_classifier())
+            self.assertEqual(screen('Your order #123 has shipped').reason, 'rule:receipt')
+        self.assertEqual(mock_open.call_count, 1)
+
+    def test_evaluate_reports_tradeoff(self):
+        """Test held-out evaluation reports skip rate, precision and recall per threshold"""
+        examples = load_seed()
+        classifier = EmailClassifier(train(examples[::2]))
+        rows = evaluate(examples[1::2], [0.01, 0.5], classifier)
+
+        self.assertEqual([row['threshold'] for row in rows], [0.01, 0.5])
+        self.assertLessEqual(rows[0]['skipRate'], rows[1]['skipRate'])
+        self.assertGreaterEqual(rows[0]['interviewRecall'], rows[1]['interviewRecall'])
+        self.assertEqual(rows[0]['interviewRecall'], 1.0)
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_negative_skips_bedrock(self, mock_bedrock):
+        """Test a receipt is answered locally and counted as skipped"""
+        result = bedrock_integration.analyze_email_for_interview('Receipt for your payment. Invoice number 42.')
+
+        mock_bedrock.invoke_model.assert_not_called()
+        self.assertFalse(result['isInterview'])
+        self.assertEqual(result['prefiltered'], 'rule:receipt')
+        self.assertEqual(email_prefilter.prefilter_stats.report()['skipRate'], 1.0)
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_invite_gets_hints_and_filled_details(self, mock_bedrock):
+        """Test regex details are sent as hints and fill fields the model left empty"""
+        mock_bedrock.invoke_model.return_value = model_response({
+            'isInterview': True, 'confidence': 90,
+            'interviewDetails': {'date': None, 'time': '2:00 PM', 'interviewType': 'unknown', 'company': 'Acme'}
+        })
+        email = 'We would like to invite you to an interview on March 12 at 2pm: https://meet.google.com/abc-defg-hij'
+        result = bedrock_integration.analyze_email_for_interview(email)
+
+        prompt = json.loads(mock_bedrock.invoke_model.call_args.kwargs['body'])['messages'][0]['content']
+        self.assertIn('https://meet.google.com/abc-defg-hij', prompt.split('Email:')[1].split('Return JSON')[0])
+        details = result['interviewDetails']
+        self.assertEqual(details['date'], 'March 12')
+        self.assertEqual(details['time'], '2:00 PM')
+        self.assertEqual(details['interviewType'], 'video')
+        self.assertEqual(details['meetingLink'], 'https://meet.google.com/abc-defg-hij')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Test Suite for the Local Job Pre-Ranker
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import index
+from job_ranker import JobIndex, rank_jobs, tokenize
+
+
+class TestJobRanker(unittest.TestCase):
+    """Test cases for local job ranking"""
+
+    def setUp(self):
+        self.profile = {
+            'skills': ['Python', 'AWS', 'SQL'],
+            'targetRole': 'Data Engineer',
+            'preferences': {'locations': ['Seattle', 'Remote'], 'industries': ['Technology']}
+        }
+        self.jobs = [
+            {'jobId': 'chef', 'title': 'Pastry Chef', 'requiredSkills': ['Baking'],
+             'location': 'Paris', 'industry': 'Hospitality'},
+            {'jobId': 'remote-de', 'title': 'Senior Data Engineer', 'requiredSkills': ['Python', 'SQL'],
+             'location': 'Remote', 'industry': 'Finance'},
+            {'jobId': 'seattle-de', 'title': 'Data Engineer', 'requiredSkills': ['Python', 'AWS', 'SQL'],
+             'location': 'Seattle, WA', 'industry': 'Technology'}
+        ]
+
+    def test_tokenize_keeps_tech_terms(self):
+        """Test tokenizer keeps c++, c# and node.js intact"""
+        self.assertEqual(tokenize('C++, C# and Node.js.'), ['c++', 'c#', 'node.js'])
+
+    def test_best_match_ranks_first(self):
+        """Test the closest job ranks first and an unrelated job last"""
+        ranked = rank_jobs(self.profile, self.jobs)
+
+        self.assertEqual([job['jobId'] for job, _ in ranked], ['seattle-de', 'remote-de', 'chef'])
+        self.assertGreaterEqual(ranked[0][1], 90)
+        self.assertEqual(ranked[-1][1], 0)
+
+    def test_top_k_is_deterministic(self):
+        """Test top-K truncation and stable output across runs"""
+        jobs = self.jobs * 20
+        index = JobIndex(jobs)
+
+        first = index.top_k(self.profile, 5)
+        second = index.top_k(self.profile, 5)
+
+        self.assertEqual(len(first), 5)
+        self.assertEqual(first, second)
+        self.assertTrue(all(job['jobId'] == 'seattle-de' for job, _ in first))
+
+    def test_empty_profile_and_feed(self):
+        """Test empty inputs do not fail"""
+        self.assertEqual(rank_jobs(self.profile, []), [])
+        self.assertTrue(all(score == 0 for _, score in rank_jobs({}, self.jobs)))
+
+
+class TestScoreEndpoint(unittest.TestCase):
+    """Test cases for POST /api/jobs/score"""
+
+    @patch('bedrock_integration.score_jobs_batch')
+    @patch('dynamo_batch.batch_get_items')
+    def test_unscored_top_jobs_keep_local_score(self, mock_get_items, mock_score):
+        """Test a top-K job the model omitted falls back to its local rank score"""
+        jobs = {'remote-de': {'jobId': 'remote-de', 'title': 'Data Engineer', 'requiredSkills': ['Python']},
+                'chef': {'jobId': 'chef', 'title': 'Pastry Chef', 'requiredSkills': ['Baking']}}
+        mock_get_items.return_value = jobs
+        mock_score.return_value = {'chef': 12}
+        user = {'userId': 'u1', 'skills': ['Python'], 'targetRole': 'Data Engineer'}
+
+        with patch.object(index, 'profile_cache') as cache:
+            cache.get.return_value = user
+            response = index.lambda_handler({'httpMethod': 'POST', 'path': '/api/jobs/score',
+                                             'body': json.dumps({'userId': 'u1', 'jobIds': list(jobs)})}, None)
+
+        scores = json.loads(response['body'])['scores']
+        local = dict((job['jobId'], score) for job, score in rank_jobs(user, list(jobs.values())))
+        self.assertEqual(scores, {'remote-de': local['remote-de'], 'chef': 12})
+        self.assertIsNotNone(scores['remote-de'])
+
+
+if __name__ == '__main__':
+    unittest.main()
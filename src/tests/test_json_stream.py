@@ -0,0 +1,91 @@
+"""
+Test Suite for Incremental JSON Extraction
+"""
+
+import unittest
+import json
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+from json_stream import IncrementalJSONParser, extract_json, iter_json_items, collect_json
+import bedrock_integration
+
+
+def split(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestIncrementalJSONParser(unittest.TestCase):
+    """Test cases for the incremental parser"""
+
+    def test_stray_braces_in_prose_are_skipped(self):
+        """Test braces in prose and inside strings do not break extraction"""
+        text = 'Here is {your} analysis: {"atsScore": 80, "note": "use } carefully"} Hope {this} helps'
+        self.assertEqual(extract_json(text, expect='object'), {'atsScore': 80, 'note': 'use } carefully'})
+
+    def test_expect_skips_other_kinds(self):
+        """Test an expected object is found after a leading array"""
+        self.assertEqual(extract_json('[1, 2] then {"a": 1}', expect='object'), {'a': 1})
+        self.assertIsNone(extract_json('no json at all'))
+
+    def test_items_emitted_as_they_close(self):
+        """Test array elements are emitted chunk by chunk regardless of chunk size"""
+        text = 'Jobs: [{"title": "A, B", "tags": ["x"]}, "plain, string", 42, null, {"t": "]"}] extra [9]'
+        expected = [{'title': 'A, B', 'tags': ['x']}, 'plain, string', 42, None, {'t': ']'}]
+        for size in (1, 3, 8, len(text)):
+            self.assertEqual(list(iter_json_items(split(text, size))), expected)
+
+    def test_first_item_available_before_array_closes(self):
+        """Test the first element is emitted before the rest of the array arrives"""
+        parser = IncrementalJSONParser(expect='array', items=True)
+        self.assertEqual(parser.feed('[{"title": "First"}, {"title": "Sec'), [{'title': 'First'}])
+        self.assertFalse(parser.complete)
+        self.assertEqual(parser.feed('ond"}]'), [{'title': 'Second'}])
+        self.assertTrue(parser.complete)
+
+    def test_escape_split_across_chunks(self):
+        """Test an escaped quote split over two chunks stays inside the string"""
+        parser = IncrementalJSONParser(expect='object')
+        self.assertEqual(parser.feed('{"a": "say \\'), [])
+        self.assertEqual(parser.feed('"hi\\""}'), [{'a': 'say "hi"'}])
+
+    def test_source_closed_once_complete(self):
+        """Test consumption stops at the closing bracket"""
+        consumed = []
+
+        def source():
+            for chunk in ['{"a"', ': 1}', ' trailing prose', ' more']:
+                consumed.append(chunk)
+                yield chunk
+
+        self.assertEqual(collect_json(source(), expect='object'), {'a': 1})
+        self.assertEqual(len(consumed), 2)
+
+
+class TestStreamedRecommendations(unittest.TestCase):
+    """Test structure-aware streaming in bedrock_integration"""
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_stream_job_recommendations(self, mock_bedrock):
+        """Test jobs are yielded individually and the stream is closed after the array"""
+        text = 'Here you go: [{"title": "Data Engineer", "match_score": 90}, {"title": "ML Engineer", "match_score": 80}] Good luck!'
+        events = [
+            {'chunk': {'bytes': json.dumps({'type': 'content_block_delta', 'delta': {'text': chunk}}).encode()}}
+            for chunk in split(text, 10)
+        ]
+        stream = MagicMock()
+        stream.__iter__.return_value = iter(events)
+        mock_bedrock.invoke_model_with_response_stream.return_value = {'body': stream}
+
+        jobs = list(bedrock_integration.stream_job_recommendations({'skills': ['Python']}))
+
+        self.assertEqual([job['title'] for job in jobs], ['Data Engineer', 'ML Engineer'])
+        stream.close.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
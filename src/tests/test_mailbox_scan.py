@@ -0,0 +1,286 @@
+"""
+Test Suite for the Mailbox Scanning Pipeline
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import mailbox
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import mailbox_scan
+from mailbox_scan import (
+    FileCheckpointStore,
+    RawMessages,
+    S3CheckpointStore,
+    email_text,
+    open_mailbox,
+    scan_mailbox
+)
+
+
+def make_message(message_id, subject, body, date='Mon, 06 Jan 2025 10:00:00 +0000', references=None,
+                 extra_headers=None, sender='Recruiter <jobs@acme.com>'):
+    lines = [
+        f"Message-ID: <{message_id}@example.com>",
+        f"Subject: {subject}",
+        f"From: {sender}",
+        f"Date: {date}",
+    ]
+    if references:
+        lines.append(f"References: <{references}@example.com>")
+        lines.append(f"In-Reply-To: <{references}@example.com>")
+    lines.extend(extra_headers or [])
+    lines.extend(['Content-Type: text/plain; charset=utf-8', '', body, ''])
+    return '\r\n'.join(lines).encode('utf-8')
+
+
+def fake_analyze(text):
+    """Interview when the body mentions an interview"""
+    return {
+        'isInterview': 'interview' in text.lower(),
+        'confidence': 90.5,
+        'interviewDetails': {'date': 'Jan 9', 'time': None},
+        'suggestedAction': 'Reply'
+    }
+
+
+class RecordingSink:
+    """In-memory interviews table"""
+
+    def __init__(self, fail=()):
+        self.items = {}
+        self.calls = 0
+        self.fail = set(fail)
+
+    def __call__(self, items):
+        self.calls += 1
+        results = {}
+        for item in items:
+            if item['interviewId'] in self.fail:
+                results[item['interviewId']] = 'ProvisionedThroughputExceededException'
+            else:
+                self.items[item['interviewId']] = item
+                results[item['interviewId']] = None
+        return results
+
+
+class MailboxScanTestCase(unittest.TestCase):
+    """Shared temporary mbox and checkpoint"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'inbox.mbox')
+        self.store = FileCheckpointStore(os.path.join(self.tmp, 'checkpoint.json'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write_mbox(self, messages):
+        box = mailbox.mbox(self.path)
+        for raw in messages:
+            box.add(raw)
+        box.flush()
+        box.close()
+
+    def scan(self, **kwargs):
+        kwargs.setdefault('analyze', fake_analyze)
+        kwargs.setdefault('sink', RecordingSink())
+        kwargs.setdefault('store', self.store)
+        return scan_mailbox(open_mailbox(self.path), 'user-1', **kwargs)
+
+
+class TestScanMailbox(MailboxScanTestCase):
+    """Test cases for scan_mailbox"""
+
+    def test_dedupes_message_ids_and_collapses_threads(self):
+        """Test duplicates are dropped and each thread is analyzed once, recorded at its latest message"""
+        invite = make_message('m1', 'Interview', 'Can we schedule an interview?')
+        self.write_mbox([
+            invite,
+            invite,
+            make_message('m2', 'Re: Interview', 'Interview confirmed for Thursday',
+                         date='Tue, 07 Jan 2025 10:00:00 +0000', references='m1'),
+            make_message('m3', 'Newsletter', 'Weekly digest'),
+        ])
+        analyzed = []
+        sink = RecordingSink()
+
+        counts = self.scan(analyze=lambda text: analyzed.append(text) or fake_analyze(text), sink=sink)
+
+        self.assertEqual(counts['messages'], 4)
+        self.assertEqual(counts['duplicates'], 1)
+        self.assertEqual(counts['threadCollapsed'], 1)
+        self.assertEqual(counts['analyzed'], 2)
+        self.assertEqual(counts['interviews'], 1)
+        self.assertTrue(any('Interview confirmed' in text for text in analyzed))
+        item = next(iter(sink.items.values()))
+        self.assertEqual(item['messageId'], '<m2@example.com>')
+        self.assertEqual(str(item['confidence']), '90.5')
+        self.assertNotIn('time', item['interviewDetails'])
+
+    def test_invite_followed_by_reply_is_detected(self):
+        """Test an invite answered by a short reply in the same scan is still analyzed and written"""
+        self.write_mbox([
+            make_message('m1', 'Interview invitation', 'We would like to invite you to an interview on Thursday.'),
+            make_message('m2', 'Re: Interview invitation', 'Thanks, confirmed.', date='Mon, 06 Jan 2025 12:00:00 +0000',
+                         references='m1', sender='Me <me@example.com>'),
+        ])
+        analyzed = []
+        sink = RecordingSink()
+
+        counts = self.scan(analyze=lambda text: analyzed.append(text) or fake_analyze(text), sink=sink)
+
+        self.assertEqual((counts['analyzed'], counts['threadCollapsed'], counts['interviews']), (1, 1, 1))
+        self.assertLess(analyzed[0].index('Thanks, confirmed'), analyzed[0].index('invite you to an interview'))
+        self.assertEqual(next(iter(sink.items.values()))['messageId'], '<m2@example.com>')
+        self.assertEqual(self.scan(sink=sink)['analyzed'], 0)
+
+    def test_rerun_only_handles_new_mail(self):
+        """Test the checkpoint limits a rerun to new messages and new replies"""
+        self.write_mbox([make_message(f'm{i}', 'Hello', f'Message {i}') for i in range(5)])
+        self.assertEqual(self.scan()['analyzed'], 5)
+
+        self.write_mbox([
+            make_message('m5', 'New', 'Interview next week?', date='Wed, 08 Jan 2025 10:00:00 +0000'),
+            make_message('m6', 'Re: Hello', 'Reply', date='Wed, 08 Jan 2025 11:00:00 +0000', references='m0'),
+        ])
+        counts = self.scan()
+
+        self.assertEqual(counts['alreadyScanned'], 5)
+        self.assertEqual(counts['analyzed'], 2)
+        self.assertEqual(self.scan()['analyzed'], 0)
+
+    def test_failed_analysis_is_retried_next_run(self):
+        """Test messages whose analysis raised are not checkpointed"""
+        self.write_mbox([make_message('m1', 'A', 'one'), make_message('m2', 'B', 'two')])
+
+        def flaky(text):
+            if 'two' in text:
+                raise RuntimeError('ThrottlingException')
+            return fake_analyze(text)
+
+        counts = self.scan(analyze=flaky)
+        self.assertEqual((counts['analyzed'], counts['failed']), (1, 1))
+        self.assertEqual(self.scan()['analyzed'], 1)
+
+    def test_error_fallback_is_retried_next_run(self):
+        """Test a Bedrock outage (analyzer's error fallback) leaves threads unscanned"""
+        self.write_mbox([make_message('m1', 'Interview', 'Interview on Friday')])
+
+        with patch('bedrock_integration.bedrock_runtime') as bedrock:
+            bedrock.invoke_model.side_effect = RuntimeError('ServiceUnavailableException')
+            counts = self.scan(analyze=None)
+        self.assertEqual((counts['analyzed'], counts['failed']), (0, 1))
+
+        counts = self.scan(analyze=lambda text: {'isInterview': False, 'confidence': 0, 'error': 'timeout'})
+        self.assertEqual(counts['failed'], 1)
+        self.assertEqual(self.scan()['interviews'], 1)
+
+    def test_failed_write_is_retried_next_run(self):
+        """Test a thread whose interview write failed is not checkpointed"""
+        self.write_mbox([make_message('m1', 'Interview', 'Interview on Friday')])
+        interview_id = f"user-1#{mailbox_scan._digest('<m1@example.com>')}"
+
+        counts = self.scan(sink=RecordingSink(fail=[interview_id]))
+        self.assertEqual(counts['writeErrors'], 1)
+
+        sink = RecordingSink()
+        self.assertEqual(self.scan(sink=sink)['interviews'], 1)
+        self.assertIn(interview_id, sink.items)
+
+    def test_writes_in_batches_and_checkpoints_periodically(self):
+        """Test interviews are written in bulk and the checkpoint is saved as the scan progresses"""
+        self.write_mbox([make_message(f'm{i}', 'Interview', 'Interview slot') for i in range(10)])
+        sink = RecordingSink()
+        store = MagicMock(wraps=self.store)
+
+        counts = self.scan(sink=sink, store=store, write_batch_size=4, checkpoint_every=3)
+
+        self.assertEqual(counts['interviews'], 10)
+        self.assertEqual(len(sink.items), 10)
+        self.assertLessEqual(sink.calls, 5)
+        self.assertEqual(store.save.call_count, 4)
+
+    def test_bounded_concurrency(self):
+        """Test no more than `concurrency` analyses run at once"""
+        self.write_mbox([make_message(f'm{i}', 'Hi', f'body {i}') for i in range(20)])
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def slow(text):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            time.sleep(0.005)
+            with lock:
+                active[0] -= 1
+            return fake_analyze(text)
+
+        counts = self.scan(analyze=slow, concurrency=3)
+
+        self.assertEqual(counts['analyzed'], 20)
+        self.assertLessEqual(active[1], 3)
+
+
+class TestSources(MailboxScanTestCase):
+    """Test cases for mailbox sources and message parsing"""
+
+    def test_maildir_and_raw_messages(self):
+        """Test Maildir directories and raw message batches scan like mbox files"""
+        maildir_path = os.path.join(self.tmp, 'Maildir')
+        box = mailbox.Maildir(maildir_path)
+        box.add(make_message('m1', 'Interview', 'Interview invite'))
+        box.add(make_message('m2', 'Other', 'Receipt'))
+
+        maildir_counts = scan_mailbox(open_mailbox(maildir_path), 'user-1', analyze=fake_analyze,
+                                      sink=RecordingSink())
+        raw_counts = scan_mailbox(RawMessages([('a', make_message('m1', 'Interview', 'Interview invite'))]),
+                                  'user-1', analyze=fake_analyze, sink=RecordingSink())
+
+        self.assertEqual((maildir_counts['analyzed'], maildir_counts['interviews']), (2, 1))
+        self.assertEqual((raw_counts['analyzed'], raw_counts['interviews']), (1, 1))
+
+    def test_gmail_thread_id(self):
+        """Test X-GM-THRID groups messages into one thread"""
+        messages = RawMessages([
+            ('a', make_message('m1', 'Interview', 'first', extra_headers=['X-GM-THRID: 123'])),
+            ('b', make_message('m2', 'Interview', 'second', date='Tue, 07 Jan 2025 10:00:00 +0000',
+                               extra_headers=['X-GM-THRID: 123'])),
+        ])
+        counts = scan_mailbox(messages, 'user-1', analyze=fake_analyze, sink=RecordingSink())
+        self.assertEqual((counts['analyzed'], counts['threadCollapsed']), (1, 1))
+
+    def test_email_text_strips_html(self):
+        """Test HTML-only bodies are reduced to text with the key headers"""
+        raw = (b"Subject: Interview\r\nFrom: hr@acme.com\r\nDate: Mon, 06 Jan 2025 10:00:00 +0000\r\n"
+               b"Content-Type: text/html\r\n\r\n<html><style>p{}</style><p>Join us on <b>Friday</b></p></html>")
+        text = email_text(raw)
+        self.assertTrue(text.startswith('Subject: Interview\nFrom: hr@acme.com'))
+        self.assertIn('Join us on', text)
+        self.assertNotIn('<b>', text)
+        self.assertNotIn('p{}', text)
+
+    @patch('mailbox_scan.get_client')
+    def test_s3_checkpoint_missing_object(self, mock_get_client):
+        """Test a missing S3 checkpoint starts a fresh scan"""
+        error = Exception('missing')
+        error.response = {'Error': {'Code': 'NoSuchKey'}}
+        mock_get_client.return_value.get_object.side_effect = error
+        store = S3CheckpointStore('user-1', bucket='bucket')
+
+        self.assertIsNone(store.load())
+        store.save({'version': 1})
+        self.assertEqual(mock_get_client.return_value.put_object.call_args.kwargs['Key'],
+                         'mailbox-checkpoints/user-1.json')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Test Suite for the Precomputed Market Intelligence Store
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import bedrock_integration
+import market_store
+from market_store import MarketStore, SALARY_TRENDS, MARKET_INSIGHTS, build_snapshot, count_queries
+from precompute_market_intel import carry_forward
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMarketStore(unittest.TestCase):
+    """Test cases for snapshot publishing and lookups"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.uri = self.tmp.name
+
+    def publish(self, version, trends):
+        snapshot = build_snapshot({
+            ('Data Engineer', 'Seattle'): {SALARY_TRENDS: trends, MARKET_INSIGHTS: {'demandLevel': 'high'}},
+            ('Designer', 'Remote'): {SALARY_TRENDS: {}, MARKET_INSIGHTS: {'demandLevel': 'low'}}
+        }, version)
+        return market_store.publish(snapshot, self.uri)
+
+    def test_publish_and_lookup(self):
+        """Test a published snapshot is served with folded role/location keys"""
+        self.assertEqual(self.publish('1', {'currentAverage': 150000}), 'v1.json.gz')
+        store = MarketStore(self.uri)
+
+        self.assertEqual(store.lookup(SALARY_TRENDS, 'data  engineer', 'SEATTLE'), {'currentAverage': 150000})
+        self.assertIsNone(store.lookup(SALARY_TRENDS, 'Designer', 'Remote'))
+        self.assertIsNone(store.lookup(MARKET_INSIGHTS, 'Chef', 'Paris'))
+        self.assertEqual(store.stats()['hits'], 1)
+        self.assertEqual(store.stats()['misses'], 2)
+
+    def test_refresh_picks_up_new_version(self):
+        """Test the store switches to a newer snapshot after the refresh interval"""
+        clock = FakeClock()
+        self.publish('1', {'currentAverage': 1})
+        store = MarketStore(self.uri, refresh_seconds=60, clock=clock)
+        store.lookup(SALARY_TRENDS, 'Data Engineer', 'Seattle')
+
+        self.publish('2', {'currentAverage': 2})
+        clock.now = 30
+        self.assertEqual(store.lookup(SALARY_TRENDS, 'Data Engineer', 'Seattle'), {'currentAverage': 1})
+        clock.now = 61
+        self.assertEqual(store.lookup(SALARY_TRENDS, 'Data Engineer', 'Seattle'), {'currentAverage': 2})
+        self.assertEqual(store.version, '2')
+
+    def test_missing_or_disabled_store_misses(self):
+        """Test an empty or unset store falls back to live generation"""
+        self.assertIsNone(MarketStore(self.uri).lookup(SALARY_TRENDS, 'Data Engineer', 'Seattle'))
+        self.assertIsNone(MarketStore('').lookup(SALARY_TRENDS, 'Data Engineer', 'Seattle'))
+
+    def test_count_queries_from_logs(self):
+        """Test traffic is aggregated per folded pair from structured log lines"""
+        lines = [
+            '[INFO] 2024 abc MARKET_QUERY {"kind": "salaryTrends", "role": "Data Engineer", "location": "Seattle"}',
+            '[INFO] 2024 abc MARKET_QUERY {"kind": "overview", "role": "data engineer", "location": "seattle"}',
+            '[INFO] 2024 abc MARKET_QUERY {"kind": "overview", "role": null, "location": "seattle"}',
+            '[INFO] unrelated line'
+        ]
+        counts = count_queries(lines)
+        self.assertEqual(list(counts.values()), [{'count': 2, 'role': 'Data Engineer', 'location': 'Seattle'}])
+
+
+class TestCarryForward(unittest.TestCase):
+    """Test cases for reusing the previous snapshot when generation fails"""
+
+    def test_fallback_results_are_not_published(self):
+        """Test fallback placeholders are replaced by the prior result, or dropped without one"""
+        previous = build_snapshot({('Data Engineer', 'Seattle'): {SALARY_TRENDS: {'currentAverage': 150000},
+                                                                  MARKET_INSIGHTS: {'demandLevel': 'low'}}}, 'v1')
+        entries = {
+            ('Data Engineer', 'Seattle'): {SALARY_TRENDS: dict(bedrock_integration.SALARY_TRENDS_FALLBACK),
+                                           MARKET_INSIGHTS: {}},
+            ('Designer', 'Remote'): {SALARY_TRENDS: {'currentAverage': 90000},
+                                     MARKET_INSIGHTS: dict(bedrock_integration.MARKET_INSIGHTS_FALLBACK)}
+        }
+
+        self.assertEqual(carry_forward(entries, previous), 2)
+        snapshot = build_snapshot(entries, 'v2')['entries']
+        self.assertEqual(snapshot[market_store.pair_key('Data Engineer', 'Seattle')],
+                         {SALARY_TRENDS: {'currentAverage': 150000}, MARKET_INSIGHTS: {'demandLevel': 'low'}})
+        self.assertEqual(snapshot[market_store.pair_key('Designer', 'Remote')],
+                         {SALARY_TRENDS: {'currentAverage': 90000}})
+
+
+if __name__ == '__main__':
+    unittest.main()
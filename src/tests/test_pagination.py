@@ -0,0 +1,149 @@
+"""
+Test Suite for Cursor Pagination of Application Listings
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+from pagination import (
+    PaginationError,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+    parse_page_size,
+    projection_params
+)
+import index
+
+KEYS = ('applicationId', 'userId', 'appliedAt')
+
+
+class FakeApplicationsIndex:
+    """In-memory UserIdIndex honouring Limit, ExclusiveStartKey and key conditions"""
+
+    def __init__(self, items):
+        self.items = sorted(items, key=lambda item: item['appliedAt'])
+        self.queries = []
+
+    def query(self, **kwargs):
+        self.queries.append(kwargs)
+        values = kwargs['ExpressionAttributeValues']
+        rows = [item for item in self.items if item['userId'] == values[':userId']
+                and item['appliedAt'] >= values.get(':from', '')
+                and item['appliedAt'] <= values.get(':to', '\uffff')]
+        if not kwargs.get('ScanIndexForward', True):
+            rows.reverse()
+        start = kwargs.get('ExclusiveStartKey')
+        if start:
+            index_of = [row['applicationId'] for row in rows].index(start['applicationId'])
+            rows = rows[index_of + 1:]
+        page = rows[:kwargs['Limit']]
+        if 'ProjectionExpression' in kwargs:
+            names = kwargs['ExpressionAttributeNames'].values()
+            page = [{name: row[name] for name in names if name in row} for row in page]
+        response = {'Items': page}
+        if len(rows) > kwargs['Limit']:
+            last = rows[kwargs['Limit'] - 1]
+            response['LastEvaluatedKey'] = {key: last[key] for key in KEYS}
+        return response
+
+
+class TestPaginationHelpers(unittest.TestCase):
+    """Test cases for cursor and parameter parsing"""
+
+    def test_cursor_round_trip_and_query_binding(self):
+        """Test cursors decode only for the query that issued them"""
+        key = {'applicationId': 'a1', 'userId': 'u1', 'appliedAt': '2024-01-01'}
+        token = encode_cursor(key, 'fp1')
+        self.assertEqual(decode_cursor(token, 'fp1', KEYS), key)
+        with self.assertRaises(PaginationError):
+            decode_cursor(token, 'fp2', KEYS)
+        with self.assertRaises(PaginationError):
+            decode_cursor('not-a-cursor', 'fp1', KEYS)
+        self.assertIsNone(encode_cursor(None, 'fp1'))
+
+    def test_limits_and_fields(self):
+        """Test page sizes are clamped and field names validated"""
+        self.assertEqual(parse_page_size(None), 25)
+        self.assertEqual(parse_page_size('1000'), 100)
+        with self.assertRaises(PaginationError):
+            parse_page_size('0')
+        self.assertEqual(parse_fields('status, company,status'), ['status', 'company'])
+        with self.assertRaises(PaginationError):
+            parse_fields('status; DROP')
+        self.assertEqual(projection_params(['status'])['ExpressionAttributeNames'], {'#f0': 'status'})
+
+
+class TestApplicationListing(unittest.TestCase):
+    """Test cases for GET /api/applications"""
+
+    def setUp(self):
+        items = [
+            {'applicationId': f'app{i:02d}', 'userId': 'u1', 'appliedAt': f'2024-01-{i + 1:02d}T09:00:00',
+             'status': 'applied', 'company': f'Company {i}', 'notes': 'x' * 100}
+            for i in range(12)
+        ]
+        items.append({'applicationId': 'other', 'userId': 'u2', 'appliedAt': '2024-01-05T09:00:00'})
+        self.index = FakeApplicationsIndex(items)
+        table = MagicMock()
+        table.query.side_effect = self.index.query
+        patcher = patch.object(index, 'dynamodb')
+        patcher.start().Table.return_value = table
+        self.addCleanup(patcher.stop)
+
+    def get(self, **params):
+        response = index.lambda_handler({
+            'httpMethod': 'GET',
+            'path': '/api/applications',
+            'queryStringParameters': {'userId': 'u1', **params}
+        }, None)
+        return response['statusCode'], json.loads(response['body'])
+
+    def test_pages_cover_full_history(self):
+        """Test following nextCursor returns every application exactly once"""
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {'limit': '5'}
+            if cursor:
+                params['cursor'] = cursor
+            status, page = self.get(**params)
+            self.assertEqual(status, 200)
+            seen.extend(item['applicationId'] for item in page['items'])
+            pages += 1
+            cursor = page['nextCursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, [f'app{i:02d}' for i in range(12)])
+        self.assertEqual(pages, 3)
+
+    def test_date_range_and_projection(self):
+        """Test appliedAt bounds use the sort key and fields are projected"""
+        status, page = self.get(**{'from': '2024-01-03', 'to': '2024-01-05', 'fields': 'status,company',
+                                   'order': 'desc'})
+        self.assertEqual(status, 200)
+        self.assertEqual(page['items'], [
+            {'status': 'applied', 'company': 'Company 4'},
+            {'status': 'applied', 'company': 'Company 3'},
+            {'status': 'applied', 'company': 'Company 2'}
+        ])
+        query = self.index.queries[-1]
+        self.assertIn('BETWEEN', query['KeyConditionExpression'])
+        self.assertFalse(query['ScanIndexForward'])
+
+    def test_cursor_from_other_query_rejected(self):
+        """Test a cursor cannot be replayed with different filters"""
+        _, page = self.get(limit='5')
+        status, _ = self.get(limit='5', cursor=page['nextCursor'], fields='status')
+        self.assertEqual(status, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
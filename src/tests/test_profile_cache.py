@@ -0,0 +1,76 @@
+"""
+Test Suite for the Read-Through User Profile Cache
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+from profile_cache import ProfileCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProfileCache(unittest.TestCase):
+    """Test cases for read-through caching and invalidation"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.loader = MagicMock(side_effect=lambda user_id: {'userId': user_id, 'skills': ['Python']})
+        self.cache = ProfileCache(self.loader, max_entries=2, ttl=60, enabled=True, clock=self.clock)
+
+    def test_repeated_reads_hit_cache(self):
+        """Test a hot user is loaded once"""
+        for _ in range(5):
+            self.assertEqual(self.cache.get('u1')['userId'], 'u1')
+        self.assertEqual(self.loader.call_count, 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (4, 1))
+        self.assertEqual(stats['hitRate'], 0.8)
+
+    def test_invalidate_forces_reload(self):
+        """Test a write invalidation makes the next read go to the loader"""
+        self.cache.get('u1')
+        self.cache.invalidate('u1')
+        self.cache.get('u1')
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_ttl_and_size_bounds(self):
+        """Test entries expire after the TTL and the least recently used is evicted"""
+        self.cache.get('u1')
+        self.clock.now += 61
+        self.cache.get('u1')
+        self.assertEqual(self.loader.call_count, 2)
+
+        self.cache.get('u2')
+        self.cache.get('u3')
+        self.assertEqual(self.cache.stats()['entries'], 2)
+        self.cache.get('u1')
+        self.assertEqual(self.loader.call_count, 5)
+
+    def test_returned_profiles_are_isolated(self):
+        """Test mutating a returned profile does not change the cached copy"""
+        self.cache.get('u1')['skills'].append('Go')
+        self.assertEqual(self.cache.get('u1')['skills'], ['Python'])
+
+    def test_missing_users_are_not_cached(self):
+        """Test a missing user is re-read so a later create is visible"""
+        loader = MagicMock(return_value=None)
+        cache = ProfileCache(loader, enabled=True, clock=self.clock)
+        self.assertIsNone(cache.get('ghost'))
+        self.assertIsNone(cache.get('ghost'))
+        self.assertEqual(loader.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Test Suite for Section-Aware Prompt Input Compression
+"""
+
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import prompt_compression
+from prompt_compression import compress, split_sections, terms, compression_stats, RESUME, JOB
+
+RESUME_TEXT = """Jane Doe
+jane@example.com
+
+SUMMARY
+Backend engineer focused on data platforms.
+
+Experience
+Senior Engineer, Acme (2020 - Present)
+- Built Python services on AWS Lambda and DynamoDB
+- Organized the office book club
+- Built Python services on AWS Lambda and DynamoDB
+
+Skills:
+Python, AWS, Kafka, Terraform
+
+Interests
+Hiking, chess
+
+References available upon request
+"""
+
+JOB_TEXT = """Data Engineer at Initech
+
+About us
+We are a fast-growing fintech on a mission to simplify payments.
+
+Requirements
+- 5+ years of Python
+- Experience with Kafka and AWS
+
+Benefits
+- Unlimited PTO
+
+Initech is an equal opportunity employer. All qualified applicants will receive consideration.
+"""
+
+
+class TestPromptCompression(unittest.TestCase):
+    """Test cases for section splitting, filtering and packing"""
+
+    def setUp(self):
+        compression_stats.reset()
+
+    def test_split_sections(self):
+        """Test headings in any case, with or without a colon, start sections"""
+        sections = [section for section, _, _ in split_sections(RESUME_TEXT, RESUME)]
+        self.assertEqual(sections, ['header', 'summary', 'experience', 'skills', 'interests'])
+
+    def test_drops_boilerplate_duplicates_and_zero_weight_sections(self):
+        """Test EEO text, benefits, references and repeated lines never reach the prompt"""
+        resume = compress(RESUME_TEXT, RESUME, 'tailor_resume_for_job', budget_tokens=1000).text
+        self.assertEqual(resume.count('Built Python services'), 1)
+        self.assertNotIn('References', resume)
+        self.assertNotIn('Hiking', resume)
+
+        job = compress(JOB_TEXT, JOB, 'tailor_resume_for_job', budget_tokens=1000).text
+        self.assertIn('Experience with Kafka and AWS', job)
+        self.assertNotIn('PTO', job)
+        self.assertNotIn('equal opportunity', job)
+
+    def test_budget_keeps_relevant_lines(self):
+        """Test a tight budget keeps the lines that match the job over unrelated ones"""
+        result = compress(RESUME_TEXT, RESUME, 'tailor_resume_for_job', budget_tokens=40,
+                          focus=terms('Python AWS Kafka DynamoDB'))
+
+        self.assertLessEqual(result.tokens, 40)
+        self.assertIn('Python, AWS, Kafka, Terraform', result.text)
+        self.assertNotIn('book club', result.text)
+        self.assertGreater(result.saved_tokens, 0)
+
+    def test_long_paragraphs_are_split(self):
+        """Test a single-paragraph job description is packed sentence by sentence"""
+        paragraph = ' '.join(f'Sentence {i} about distributed systems and Python.' for i in range(40))
+        result = compress(paragraph, JOB, 'generate_interview_questions', budget_tokens=50)
+
+        self.assertTrue(result.text.startswith('- Sentence 0'))
+        self.assertLessEqual(result.tokens, 50)
+
+    def test_stats_report_saved_tokens(self):
+        """Test per-function totals of original and compressed tokens"""
+        compress(JOB_TEXT, JOB, 'generate_interview_questions')
+        compress(JOB_TEXT, JOB, 'generate_interview_questions')
+
+        report = compression_stats.report()['generate_interview_questions']
+        self.assertEqual(report['calls'], 2)
+        self.assertEqual(report['savedTokens'], report['originalTokens'] - report['tokens'])
+        self.assertGreater(report['savedRate'], 0)
+
+    def test_disabled_falls_back_to_plain_cut(self):
+        """Test the kill switch restores a plain character cut at the budget"""
+        with patch.object(prompt_compression, 'COMPRESSION_ENABLED', False):
+            result = compress(JOB_TEXT, JOB, 'tailor_resume_for_job', budget_tokens=10)
+        self.assertEqual(result.text, JOB_TEXT[:40])
+
+
+if __name__ == '__main__':
+    unittest.main()
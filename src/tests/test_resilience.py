@@ -0,0 +1,205 @@
+"""
+Test Suite for the Bedrock Circuit Breaker, Latency Histograms and Hedged Calls
+"""
+
+import unittest
+import sys
+import os
+import time
+import threading
+from unittest.mock import MagicMock
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import resilience
+from resilience import CircuitBreaker, CircuitOpenError, LatencyHistogram, ResilientCaller, is_failure
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ClientError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}}
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for breaker state transitions"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker('test', failure_threshold=3, reset_seconds=10, clock=self.clock)
+
+    def test_opens_after_consecutive_failures(self):
+        """Test the breaker opens at the threshold and rejects calls"""
+        for _ in range(3):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'open')
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    def test_success_resets_failure_count(self):
+        """Test a success in between keeps the breaker closed"""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'closed')
+
+    def test_half_open_allows_single_probe(self):
+        """Test one probe passes after the reset period and its outcome decides the state"""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 11
+
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, 'half_open')
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, 'open')
+
+        self.clock.now = 22
+        self.breaker.before_call()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, 'closed')
+
+    def test_validation_errors_are_not_failures(self):
+        """Test caller errors do not count against Bedrock's health"""
+        self.assertFalse(is_failure(ClientError('ValidationException')))
+        self.assertTrue(is_failure(ClientError('ThrottlingException')))
+        self.assertTrue(is_failure(RuntimeError('read timeout')))
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test cases for percentile estimation"""
+
+    def test_percentiles_resolve_to_bucket_bounds(self):
+        """Test percentiles land on the bucket containing the sample"""
+        histogram = LatencyHistogram()
+        for _ in range(95):
+            histogram.record(100)
+        for _ in range(5):
+            histogram.record(5000)
+
+        self.assertLess(histogram.percentile(0.5), 150)
+        self.assertLess(histogram.percentile(0.95), 150)
+        self.assertGreaterEqual(histogram.percentile(0.99), 5000)
+        self.assertEqual(histogram.summary()['count'], 100)
+
+
+class TestResilientCaller(unittest.TestCase):
+    """Test cases for deadlines and hedged requests"""
+
+    def make_caller(self, **kwargs):
+        breaker = CircuitBreaker('test', failure_threshold=2, reset_seconds=60)
+        options = {'call_timeout': 2, 'hedge_min_samples': 5, 'hedge_max_ratio': 1.0, 'max_workers': 4}
+        options.update(kwargs)
+        caller = ResilientCaller(breaker, **options)
+        self.addCleanup(lambda: caller._executor and caller._executor.shutdown(wait=False))
+        return caller
+
+    def test_slow_call_is_hedged(self):
+        """Test a second request is raced once the first exceeds the latency percentile"""
+        caller = self.make_caller()
+        for _ in range(10):
+            caller.histogram('fn').record(30)
+
+        calls = []
+        lock = threading.Lock()
+
+        def attempt():
+            with lock:
+                calls.append(1)
+                first = len(calls) == 1
+            time.sleep(1.0 if first else 0.01)
+            return 'slow' if first else 'hedge'
+
+        start = time.perf_counter()
+        result = caller.call('fn', attempt)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(result, 'hedge')
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(caller.counters['hedged'], 1)
+        self.assertEqual(caller.counters['hedgeWins'], 1)
+
+    def test_no_hedge_without_samples(self):
+        """Test calls are not hedged until the function has latency history"""
+        caller = self.make_caller()
+        self.assertIsNone(caller.hedge_delay('fn'))
+        self.assertEqual(caller.call('fn', lambda: 'ok'), 'ok')
+        self.assertEqual(caller.counters['hedged'], 0)
+
+    def test_deadline_bounds_latency_and_opens_breaker(self):
+        """Test a hung call times out and repeated timeouts make later calls fail fast"""
+        caller = self.make_caller(call_timeout=0.1, hedge_enabled=False)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        for _ in range(2):
+            with self.assertRaises(FutureTimeoutError):
+                caller.call('fn', release.wait)
+
+        start = time.perf_counter()
+        with self.assertRaises(CircuitOpenError):
+            caller.call('fn', lambda: 'never called')
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertEqual(caller.report()['breaker']['state'], 'open')
+
+    def test_deadline_starts_when_a_worker_runs_the_call(self):
+        """Test time queued for a busy worker neither times the call out nor trips the breaker"""
+        caller = self.make_caller(call_timeout=0.3, hedge_enabled=False, max_workers=1)
+        caller._get_executor().submit(time.sleep, 0.2)
+        self.assertEqual(caller.call('fn', lambda: time.sleep(0.2) or 'ok'), 'ok')
+
+        caller._get_executor().submit(time.sleep, 0.5)
+        with self.assertRaises(FutureTimeoutError):
+            caller.call('fn', lambda: 'never started')
+        self.assertEqual(caller.breaker.consecutive_failures, 0)
+        self.assertEqual(caller.counters['deadlineExceeded'], 1)
+
+    def test_request_deadline_caps_the_call(self):
+        """Test calls stop at the Lambda's remaining time less the margin, without a breaker failure"""
+        caller = self.make_caller(call_timeout=5, hedge_enabled=False)
+        context = MagicMock()
+        context.get_remaining_time_in_millis.return_value = 2100
+        resilience.set_request_deadline(context, margin=2)
+        self.addCleanup(resilience.set_request_deadline, None)
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        start = time.perf_counter()
+        with self.assertRaises(FutureTimeoutError):
+            caller.call('fn', release.wait)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        with self.assertRaises(FutureTimeoutError):
+            caller.call('fn', lambda: 'no time left')
+        self.assertEqual(caller.breaker.consecutive_failures, 0)
+        self.assertEqual(caller.counters['deadlineExceeded'], 2)
+
+    def test_errors_propagate(self):
+        """Test the original exception is re-raised and counted"""
+        caller = self.make_caller()
+
+        def fail():
+            raise ClientError('ThrottlingException')
+
+        with self.assertRaises(ClientError):
+            caller.call('fn', fail)
+        self.assertEqual(caller.counters['failures'], 1)
+        self.assertEqual(caller.breaker.consecutive_failures, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
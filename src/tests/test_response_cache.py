@@ -0,0 +1,189 @@
+"""
+Test Suite for the Bedrock Response Cache
+Tests LRU/TTL behaviour, the shared tier and cache-aware model invocation
+"""
+
+import unittest
+import json
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+from response_cache import (
+    LRUCache,
+    LocalSharedTier,
+    ResponseCache,
+    make_cache_key,
+    response_cache
+)
+import bedrock_integration
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def mock_model_response(text, stop_reason='end_turn'):
+    """Build a mocked invoke_model response returning text"""
+    response = {'body': MagicMock()}
+    response['body'].read.return_value = json.dumps({'content': [{'text': text}], 'stop_reason': stop_reason}).encode()
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for the cache tiers"""
+
+    def test_cache_key_covers_all_request_fields(self):
+        """Test every request field changes the cache key"""
+        base = make_cache_key('model', 'prompt', 100, 0.7, 0.9)
+        self.assertEqual(base, make_cache_key('model', 'prompt', 100, 0.7, 0.9))
+        self.assertNotEqual(base, make_cache_key('other', 'prompt', 100, 0.7, 0.9))
+        self.assertNotEqual(base, make_cache_key('model', 'prompt ', 100, 0.7, 0.9))
+        self.assertNotEqual(base, make_cache_key('model', 'prompt', 101, 0.7, 0.9))
+        self.assertNotEqual(base, make_cache_key('model', 'prompt', 100, 0.5, 0.9))
+        self.assertNotEqual(base, make_cache_key('model', 'prompt', 100, 0.7, 1.0))
+
+    def test_lru_eviction_and_ttl(self):
+        """Test least recently used entries are evicted and expired entries dropped"""
+        clock = FakeClock()
+        cache = LRUCache(max_entries=2, clock=clock)
+        cache.set('a', 1, ttl=10)
+        cache.set('b', 2, ttl=100)
+        cache.get('a')
+        cache.set('c', 3, ttl=100)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+
+        clock.now += 11
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_shared_tier_hit_is_promoted(self):
+        """Test a shared tier hit is counted and copied into the local tier"""
+        clock = FakeClock()
+        shared = LocalSharedTier(clock=clock)
+        writer = ResponseCache(local=LRUCache(clock=clock), shared=shared, clock=clock)
+        reader = ResponseCache(local=LRUCache(clock=clock), shared=shared, clock=clock)
+
+        writer.set('key', 'value', ttl=60)
+        self.assertEqual(reader.get('key'), 'value')
+        self.assertEqual(reader.get('key'), 'value')
+        self.assertIsNone(reader.get('missing'))
+
+        stats = reader.stats()
+        self.assertEqual(stats['sharedHits'], 1)
+        self.assertEqual(stats['localHits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_get_many_batches_shared_lookups(self):
+        """Test get_many serves local hits and fetches the rest from the shared tier"""
+        clock = FakeClock()
+        shared = LocalSharedTier(clock=clock)
+        shared.set('b', 2, ttl=60)
+        cache = ResponseCache(local=LRUCache(clock=clock), shared=shared, clock=clock)
+        cache.local.set('a', 1, ttl=60)
+
+        self.assertEqual(cache.get_many(['a', 'b', 'c', 'a']), {'a': 1, 'b': 2})
+        self.assertEqual(cache.local.get('b'), 2)
+        stats = cache.stats()
+        self.assertEqual((stats['localHits'], stats['sharedHits'], stats['misses']), (1, 1, 1))
+
+
+class TestCachedInvocation(unittest.TestCase):
+    """Test cache-aware Bedrock invocation"""
+
+    def setUp(self):
+        response_cache.clear()
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_repeated_market_insights_hit_cache(self, mock_bedrock):
+        """Test identical market insight prompts invoke the model once"""
+        mock_bedrock.invoke_model.return_value = mock_model_response(
+            json.dumps({'demandLevel': 'high', 'averageSalary': 150000})
+        )
+
+        first = bedrock_integration.get_market_insights('Data Engineer', 'Seattle')
+        second = bedrock_integration.get_market_insights('Data Engineer', 'Seattle')
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_bedrock.invoke_model.call_count, 1)
+        self.assertEqual(response_cache.stats()['hits'], 1)
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_truncated_or_unparseable_responses_not_cached(self, mock_bedrock):
+        """Test responses cut off at max_tokens or without JSON are not replayed from the cache"""
+        mock_bedrock.invoke_model.side_effect = [
+            mock_model_response('{"demandLevel": "high", "insights": ["Gro', stop_reason='max_tokens'),
+            mock_model_response('Sorry, I cannot help with that.'),
+            mock_model_response(json.dumps({'demandLevel': 'high'})),
+            mock_model_response(json.dumps({'demandLevel': 'low'}))
+        ]
+
+        for _ in range(4):
+            result = bedrock_integration.get_market_insights('Data Engineer', 'Seattle')
+
+        self.assertEqual(result, {'demandLevel': 'high'})
+        self.assertEqual(mock_bedrock.invoke_model.call_count, 3)
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_numeric_job_score_is_cached(self, mock_bedrock):
+        """Test calculate_job_score's bare-number response is validated as a number and cached"""
+        mock_bedrock.invoke_model.return_value = mock_model_response('85')
+
+        first = bedrock_integration.calculate_job_score('u1', 'j1')
+        second = bedrock_integration.calculate_job_score('u1', 'j1')
+
+        self.assertEqual((first, second), (85, 85))
+        self.assertEqual(mock_bedrock.invoke_model.call_count, 1)
+        self.assertEqual(response_cache.stats()['hits'], 1)
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_uncached_function_always_invokes(self, mock_bedrock):
+        """Test functions without a TTL bypass the cache"""
+        mock_bedrock.invoke_model.return_value = mock_model_response('hello')
+
+        bedrock_integration.invoke_bedrock_model('same prompt')
+        bedrock_integration.invoke_bedrock_model('same prompt')
+
+        self.assertEqual(mock_bedrock.invoke_model.call_count, 2)
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_skill_forecast_reuses_per_skill_entries(self, mock_bedrock):
+        """Test only uncached skills are sent to the model and results keep request order"""
+        prompts = []
+
+        def respond(**kwargs):
+            prompt = json.loads(kwargs['body'])['messages'][0]['content']
+            prompts.append(prompt)
+            skills = prompt.split('these skills:')[1].strip().splitlines()[0].split(', ')
+            return mock_model_response(json.dumps(
+                [{'skill': skill, 'currentDemand': len(skill)} for skill in skills]
+            ))
+
+        mock_bedrock.invoke_model.side_effect = respond
+
+        first = bedrock_integration.get_skill_demand_forecast(['Python', 'AWS'])
+        second = bedrock_integration.get_skill_demand_forecast(['aws', 'Docker', 'Python', 'Docker'])
+
+        self.assertEqual([item['skill'] for item in first], ['Python', 'AWS'])
+        self.assertEqual([item['skill'] for item in second], ['AWS', 'Docker', 'Python'])
+        self.assertEqual(mock_bedrock.invoke_model.call_count, 2)
+        self.assertIn('Docker', prompts[1])
+        self.assertNotIn('Python', prompts[1])
+
+        bedrock_integration.get_skill_demand_forecast(['Docker', 'AWS'])
+        self.assertEqual(mock_bedrock.invoke_model.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
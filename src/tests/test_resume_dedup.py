@@ -0,0 +1,125 @@
+"""
+Test Suite for Resume Analysis Deduplication
+"""
+
+import unittest
+import sys
+import os
+import json
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import index
+import resume_dedup
+from response_cache import response_cache
+
+RESUME = """
+Jane Smith
+Data Engineer
+
+SKILLS: Python, Spark, AWS
+"""
+
+
+def model_response(payload):
+    response = {'body': MagicMock()}
+    response['body'].read.return_value = json.dumps({'content': [{'text': json.dumps(payload)}]}).encode()
+    return response
+
+
+class TestResumeDedup(unittest.TestCase):
+    """Test cases for content-hash deduplication of resume analysis and tailoring"""
+
+    def setUp(self):
+        response_cache.clear()
+        index.profile_cache.clear()
+        patcher = patch('bedrock_integration.bedrock_runtime')
+        self.bedrock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bedrock.invoke_model.return_value = model_response({'contentScore': 88, 'strengths': ['Spark']})
+
+    def test_hash_ignores_case_and_whitespace(self):
+        """Test reformatted resumes share a hash and different content does not"""
+        self.assertEqual(resume_dedup.content_hash(RESUME), resume_dedup.content_hash(RESUME.upper().replace('\n', '  ')))
+        self.assertNotEqual(resume_dedup.content_hash(RESUME), resume_dedup.content_hash(RESUME + ' Go'))
+        self.assertNotEqual(resume_dedup.content_hash('a', 'b c'), resume_dedup.content_hash('a b', 'c'))
+
+    def test_resubmission_skips_model_call(self):
+        """Test the same resume is analyzed by the model once"""
+        first, resume_hash, cached_first = resume_dedup.analyze_resume(RESUME)
+        second, _, cached_second = resume_dedup.analyze_resume('  ' + RESUME.lower())
+
+        self.assertEqual(first, second)
+        self.assertEqual((cached_first, cached_second), (False, True))
+        self.assertEqual(self.bedrock.invoke_model.call_count, 1)
+
+    def test_placeholder_results_are_not_stored(self):
+        """Test fallback results from unusable model output are regenerated next time"""
+        self.bedrock.invoke_model.return_value = {'body': MagicMock()}
+        self.bedrock.invoke_model.return_value['body'].read.return_value = json.dumps(
+            {'content': [{'text': 'no json here'}]}).encode()
+
+        resume_dedup.tailor_resume_for_job(RESUME, 'Senior Data Engineer')
+        resume_dedup.tailor_resume_for_job(RESUME, 'Senior Data Engineer')
+        self.assertEqual(self.bedrock.invoke_model.call_count, 2)
+
+    def test_handler_skips_write_for_unchanged_resume(self):
+        """Test a repeat submission by the same user neither calls the model nor writes"""
+        table = MagicMock()
+        stored = {}
+
+        def update_item(**kwargs):
+            values = kwargs['ExpressionAttributeValues']
+            stored.update({'userId': 'u1', 'resumeAnalysis': values[':analysis'], 'resumeHash': values[':hash']})
+
+        table.update_item.side_effect = update_item
+        table.get_item.side_effect = lambda Key: {'Item': dict(stored)} if stored else {}
+
+        with patch.object(index, 'dynamodb') as dynamodb:
+            dynamodb.Table.return_value = table
+            for text in (RESUME, RESUME.upper()):
+                response = index.lambda_handler({
+                    'httpMethod': 'POST',
+                    'path': '/api/resume/analyze',
+                    'body': json.dumps({'userId': 'u1', 'resumeText': text})
+                }, None)
+                self.assertEqual(json.loads(response['body'])['contentScore'], 88)
+
+        self.assertEqual(self.bedrock.invoke_model.call_count, 1)
+        self.assertEqual(table.update_item.call_count, 1)
+
+    def test_repeat_upload_returns_same_types(self):
+        """Test the stored review (Decimals from DynamoDB) is served with the same JSON types as a fresh one"""
+        table = MagicMock()
+        stored = {}
+
+        def update_item(**kwargs):
+            values = kwargs['ExpressionAttributeValues']
+            # DynamoDB returns every number as a Decimal
+            analysis = json.loads(json.dumps(values[':analysis']), parse_float=Decimal, parse_int=Decimal)
+            stored.update({'userId': 'u1', 'resumeAnalysis': analysis, 'resumeHash': values[':hash']})
+
+        table.update_item.side_effect = update_item
+        table.get_item.side_effect = lambda Key: {'Item': dict(stored)} if stored else {}
+
+        bodies = []
+        with patch.object(index, 'dynamodb') as dynamodb:
+            dynamodb.Table.return_value = table
+            for _ in range(2):
+                response = index.lambda_handler({
+                    'httpMethod': 'POST',
+                    'path': '/api/resume/analyze',
+                    'body': json.dumps({'userId': 'u1', 'resumeText': RESUME})
+                }, None)
+                bodies.append(json.loads(response['body']))
+
+        self.assertEqual(self.bedrock.invoke_model.call_count, 1)
+        self.assertEqual(bodies[0], bodies[1])
+        self.assertIsInstance(bodies[1]['contentScore'], int)
+
+
+if __name__ == '__main__':
+    unittest.main()
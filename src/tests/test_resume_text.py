@@ -0,0 +1,203 @@
+"""
+Test Suite for the Resume Text Extraction Stage
+"""
+
+import unittest
+import sys
+import os
+import io
+import json
+import zlib
+import zipfile
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import index
+import resume_text
+from resume_text import ResumeTextError, extract_text, parse_resume_url, get_resume_text, SIDECAR_SUFFIX
+
+
+def chunked(data, size=7):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+def build_pdf(font, content, extra=()):
+    """Single-page PDF with a cross-reference table; extra objects are numbered from 6"""
+    stream = zlib.compress(content)
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 5 0 R >> >> '
+        b'/Contents 4 0 R >>',
+        b'<< /Length ' + str(len(stream)).encode() + b' /Filter /FlateDecode >>\nstream\n' + stream + b'\nendstream',
+        font,
+    ] + list(extra)
+    out = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += str(number).encode() + b' 0 obj\n' + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 ' + str(len(objects) + 1).encode() + b'\n0000000000 65535 f \n'
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size ' + str(len(objects) + 1).encode() + b' /Root 1 0 R >>\nstartxref\n'
+    return out + str(xref).encode() + b'\n%%EOF\n'
+
+
+def make_pdf():
+    return build_pdf(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+                     b'BT /F1 12 Tf 72 720 Td (Jane Doe) Tj 0 -14 Td [(Senior ) -300 (Engineer)] TJ '
+                     b'0 -14 Td (Python \\(AWS\\)) Tj ET')
+
+
+def cid(text):
+    """Glyph IDs of the CID test font: space is 3, printable ASCII is offset by 29"""
+    return b''.join(b'%04X' % (3 if char == ' ' else ord(char) - 29) for char in text)
+
+
+def make_cid_pdf():
+    """PDF set in an Identity-H Type0 font, as exported by Word or Chrome"""
+    cmap = (b'/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n/CMapName /Test def\n'
+            b'1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n2 beginbfrange\n'
+            b'<0003> <0003> <0020>\n<0004> <005D> <0021>\nendbfrange\nendcmap\nend\nend')
+    font = (b'<< /Type /Font /Subtype /Type0 /BaseFont /ABCDEF+Calibri /Encoding /Identity-H '
+            b'/DescendantFonts [6 0 R] /ToUnicode 7 0 R >>')
+    descendant = (b'<< /Type /Font /Subtype /CIDFontType2 /BaseFont /ABCDEF+Calibri '
+                  b'/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> /DW 500 >>')
+    content = b'BT /F1 12 Tf 72 720 Td <' + cid('Jane Doe') + b'> Tj 0 -14 Td <' + cid('HR Manager') + b'> Tj ET'
+    return build_pdf(font, content, [descendant, b'<< /Length ' + str(len(cmap)).encode() + b' >>\nstream\n' +
+                                     cmap + b'\nendstream'])
+
+
+def make_docx():
+    document = ('<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+                '<w:p><w:r><w:t>Jane Doe</w:t></w:r></w:p>'
+                '<w:p><w:r><w:t>Python</w:t><w:tab/><w:t>AWS</w:t></w:r></w:p></w:body></w:document>')
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', document)
+    return buffer.getvalue()
+
+
+class TestExtraction(unittest.TestCase):
+    """Test cases for the format extractors"""
+
+    def test_pdf_text_from_flate_stream(self):
+        """Test page text is decoded from a compressed content stream read in small chunks"""
+        text = extract_text(chunked(make_pdf()), resume_text.PDF)
+        self.assertEqual(text, 'Jane Doe\nSenior Engineer\nPython (AWS)')
+
+    def test_pdf_cid_fonts_use_to_unicode(self):
+        """Test Identity-H glyph IDs are mapped through the font's ToUnicode CMap"""
+        self.assertEqual(extract_text(chunked(make_cid_pdf()), resume_text.PDF), 'Jane Doe\nHR Manager')
+
+    def test_unreadable_pdf(self):
+        """Test a corrupt PDF is an extraction error rather than a crash"""
+        with self.assertRaises(ResumeTextError):
+            extract_text([b'%PDF-1.4\nnot really a pdf'], resume_text.PDF)
+
+    def test_non_text_output_rejected(self):
+        """Test output that is mostly control or symbol characters is not treated as resume text"""
+        with self.assertRaises(ResumeTextError):
+            extract_text(['\x01\x02+HR \x05\x06\x07 ()#$'.encode('utf-8')], resume_text.TEXT)
+
+    def test_docx_paragraphs(self):
+        """Test DOCX paragraphs become lines and tabs are kept as spacing"""
+        self.assertEqual(extract_text(chunked(make_docx(), 100), resume_text.DOCX), 'Jane Doe\nPython AWS')
+
+    def test_plain_text_is_normalized(self):
+        """Test multi-byte characters split across chunks decode and whitespace is normalized"""
+        data = '\ufeffJane   Doe\n\n\n\nCaf\u00e9  \ufb01nance\n'.encode('utf-8')
+        self.assertEqual(extract_text(chunked(data, 3), resume_text.TEXT), 'Jane Doe\n\nCaf\u00e9 finance')
+
+    def test_unsupported_or_empty(self):
+        """Test unsupported formats and files without text are rejected"""
+        with self.assertRaises(resume_text.UnsupportedFormatError):
+            extract_text([b'data'], 'application/msword')
+        with self.assertRaises(ResumeTextError):
+            extract_text([b'   \n'], resume_text.TEXT)
+
+    def test_resume_url_must_belong_to_user(self):
+        """Test other users' keys, other buckets and sidecars are refused"""
+        bucket = resume_text.RESUMES_BUCKET
+        self.assertEqual(parse_resume_url(f's3://{bucket}/u1/cv.pdf', 'u1'), (bucket, 'u1/cv.pdf'))
+        self.assertEqual(parse_resume_url('u1/cv.pdf', 'u1'), (bucket, 'u1/cv.pdf'))
+        for url in (f's3://{bucket}/u2/cv.pdf', 's3://other/u1/cv.pdf', 'u1/cv.pdf' + SIDECAR_SUFFIX):
+            with self.assertRaises(ResumeTextError):
+                parse_resume_url(url, 'u1')
+
+
+class TestExtractionStage(unittest.TestCase):
+    """Test cases for the ETag-keyed S3 stage"""
+
+    def setUp(self):
+        resume_text.reset()
+        patcher = patch.object(resume_text, 'get_client')
+        self.s3 = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.addCleanup(resume_text.reset)
+        self.s3.head_object.return_value = {'ETag': '"e1"', 'ContentType': 'text/plain'}
+        self.sidecar = None
+
+        def get_object(Bucket, Key, **kwargs):
+            if Key.endswith(SIDECAR_SUFFIX):
+                if self.sidecar is None:
+                    error = Exception('missing')
+                    error.response = {'Error': {'Code': 'NoSuchKey'}}
+                    raise error
+                return self.sidecar
+            return {'Body': io.BytesIO(b'Jane Doe\n  Python ')}
+
+        self.s3.get_object.side_effect = get_object
+
+    def test_extracts_once_then_serves_from_memory(self):
+        """Test the first read extracts and writes the sidecar, the next is a memory hit"""
+        first = get_resume_text('u1/cv.txt', 'u1')
+        second = get_resume_text('u1/cv.txt', 'u1')
+
+        self.assertEqual((first['source'], second['source']), ('extracted', 'memory'))
+        self.assertEqual(first['text'], 'Jane Doe\nPython')
+        put = self.s3.put_object.call_args.kwargs
+        self.assertEqual(put['Key'], 'u1/cv.txt' + SIDECAR_SUFFIX)
+        self.assertEqual(put['Metadata']['source-etag'], 'e1')
+
+    def test_sidecar_used_only_for_matching_etag(self):
+        """Test a sidecar recorded for another ETag is ignored and rewritten"""
+        self.sidecar = {'Body': io.BytesIO(b'cached text'),
+                        'Metadata': {'source-etag': 'e1', 'extractor': resume_text.EXTRACTOR_VERSION}}
+        self.assertEqual(get_resume_text('u1/cv.txt', 'u1')['source'], 'sidecar')
+        self.s3.put_object.assert_not_called()
+
+        resume_text.reset()
+        self.s3.head_object.return_value = {'ETag': '"e2"', 'ContentType': 'text/plain'}
+        self.sidecar['Body'] = io.BytesIO(b'cached text')
+        result = get_resume_text('u1/cv.txt', 'u1')
+        self.assertEqual((result['source'], result['text']), ('extracted', 'Jane Doe\nPython'))
+        self.assertEqual(self.s3.put_object.call_args.kwargs['Metadata']['source-etag'], 'e2')
+
+    def test_analyze_runs_from_stored_resume_url(self):
+        """Test /api/resume/analyze uses the user's uploaded resume when no text is sent"""
+        with patch.object(index, 'profile_cache') as cache, \
+                patch.object(index, 'dynamodb'), \
+                patch('resume_dedup.analyze_resume', return_value=({'score': 80}, 'h', False)) as analyze:
+            cache.get.return_value = {'userId': 'u1', 'resumeUrl': f's3://{resume_text.RESUMES_BUCKET}/u1/cv.txt'}
+            response = index.lambda_handler({'httpMethod': 'POST', 'path': '/api/resume/analyze',
+                                             'body': json.dumps({'userId': 'u1'})}, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        analyze.assert_called_once_with('Jane Doe\nPython', None, None, None)
+
+    def test_doc_upload_is_unsupported_media_type(self):
+        """Test a legacy .doc resume is answered with a 415, not an extraction failure"""
+        self.s3.head_object.return_value = {'ETag': '"e1"', 'ContentType': 'application/msword'}
+        response = index.lambda_handler({'httpMethod': 'POST', 'path': '/api/resume/analyze',
+                                         'body': json.dumps({'userId': 'u1', 'resumeUrl': 'u1/cv.doc'})}, None)
+
+        self.assertEqual(response['statusCode'], 415)
+        self.assertIn('DOCX', json.loads(response['body'])['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Test Suite for Direct-to-S3 Resume Uploads
+"""
+
+import unittest
+import sys
+import os
+import json
+import base64
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import index
+import resume_upload
+from resume_upload import UploadError, create_upload, complete_upload, resume_key
+
+
+class TestResumeUpload(unittest.TestCase):
+    """Test cases for presigned upload issuing and completion"""
+
+    def setUp(self):
+        patcher = patch.object(resume_upload, 'get_client')
+        self.s3 = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.s3.generate_presigned_post.return_value = {'url': 'https://bucket.s3', 'fields': {'key': 'k'}}
+        self.s3.generate_presigned_url.side_effect = lambda op, Params, ExpiresIn: f"https://part/{Params['PartNumber']}"
+        self.s3.create_multipart_upload.return_value = {'UploadId': 'up-1'}
+
+    def test_resume_key_is_sanitized(self):
+        """Test path segments and unsafe characters are stripped from file names"""
+        self.assertEqual(resume_key('u1', '../../etc/My Resume (v2).pdf'), 'u1/My_Resume_v2_.pdf')
+        self.assertEqual(resume_key('u1', '...'), 'u1/resume')
+
+    def test_small_file_gets_presigned_post(self):
+        """Test files under the threshold get a POST form pinned to type and size"""
+        upload = create_upload('u1', 'cv.pdf', 'application/pdf', 200 * 1024)
+
+        self.assertEqual(upload['uploadMethod'], 'POST')
+        self.assertEqual(upload['key'], 'u1/cv.pdf')
+        conditions = self.s3.generate_presigned_post.call_args.kwargs['Conditions']
+        self.assertIn(['content-length-range', 1, resume_upload.MAX_RESUME_BYTES], conditions)
+        self.s3.create_multipart_upload.assert_not_called()
+
+    def test_large_file_gets_multipart_part_urls(self):
+        """Test files over the threshold get one presigned URL per part"""
+        size = resume_upload.MULTIPART_THRESHOLD + 1
+        upload = create_upload('u1', 'cv.pdf', 'application/pdf', size)
+
+        self.assertEqual(upload['uploadMethod'], 'MULTIPART')
+        self.assertEqual(upload['uploadId'], 'up-1')
+        expected_parts = -(-size // resume_upload.MULTIPART_PART_SIZE)
+        self.assertEqual([part['partNumber'] for part in upload['parts']], list(range(1, expected_parts + 1)))
+
+    def test_rejects_bad_type_and_size(self):
+        """Test unsupported content types and oversized files are refused before presigning"""
+        with self.assertRaises(UploadError):
+            create_upload('u1', 'cv.exe', 'application/x-msdownload', 1000)
+        with self.assertRaises(UploadError):
+            create_upload('u1', 'cv.pdf', 'application/pdf', resume_upload.MAX_RESUME_BYTES + 1)
+        with self.assertRaises(UploadError):
+            create_upload('u1', 'cv.pdf', 'application/pdf', None)
+        self.s3.generate_presigned_post.assert_not_called()
+
+    def test_complete_checks_ownership(self):
+        """Test a user cannot complete an upload under another user's prefix"""
+        with self.assertRaises(UploadError):
+            complete_upload('u1', 'u2/cv.pdf')
+        self.s3.head_object.assert_not_called()
+
+    def test_complete_multipart_orders_parts(self):
+        """Test parts are completed in part-number order"""
+        self.s3.head_object.return_value = {'ContentLength': 6 * 1024 * 1024, 'ContentType': 'application/pdf',
+                                            'ETag': '"abc-2"'}
+        stored = complete_upload('u1', 'u1/cv.pdf', 'up-1',
+                                 [{'partNumber': 2, 'eTag': 'b'}, {'partNumber': 1, 'eTag': 'a'}])
+
+        parts = self.s3.complete_multipart_upload.call_args.kwargs['MultipartUpload']['Parts']
+        self.assertEqual([part['PartNumber'] for part in parts], [1, 2])
+        self.assertEqual(stored['eTag'], 'abc-2')
+
+    def test_complete_deletes_oversized_object(self):
+        """Test an object over the limit is removed rather than recorded"""
+        self.s3.head_object.return_value = {'ContentLength': resume_upload.MAX_RESUME_BYTES + 1,
+                                            'ContentType': 'application/pdf'}
+        with self.assertRaises(UploadError):
+            complete_upload('u1', 'u1/cv.pdf')
+        self.s3.delete_object.assert_called_once()
+
+
+class TestResumeUploadRoutes(unittest.TestCase):
+    """Test cases for the upload endpoints in index"""
+
+    def setUp(self):
+        for name in ('dynamodb', 's3'):
+            patcher = patch.object(index, name)
+            setattr(self, name, patcher.start())
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(resume_upload, 'get_client')
+        self.direct_s3 = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        index.profile_cache.clear()
+
+    def call(self, path, payload):
+        response = index.lambda_handler({'httpMethod': 'POST', 'path': path, 'body': json.dumps(payload)}, None)
+        return response['statusCode'], json.loads(response['body'])
+
+    def test_upload_complete_records_resume_on_user(self):
+        """Test completion stores resumeUrl on the user and invalidates the cached profile"""
+        self.direct_s3.head_object.return_value = {'ContentLength': 1234, 'ContentType': 'application/pdf',
+                                                   'ETag': '"e1"'}
+        with patch.object(index.profile_cache, 'invalidate') as invalidate:
+            status, body = self.call('/api/resume/upload-complete', {'userId': 'u1', 'key': 'u1/cv.pdf'})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body['resumeUrl'], f"s3://{resume_upload.RESUMES_BUCKET}/u1/cv.pdf")
+        values = self.dynamodb.Table.return_value.update_item.call_args.kwargs['ExpressionAttributeValues']
+        self.assertEqual(values[':url'], body['resumeUrl'])
+        invalidate.assert_called_once_with('u1')
+
+    def test_upload_url_errors_are_400(self):
+        """Test invalid upload requests are rejected with a 400"""
+        status, body = self.call('/api/resume/upload-url', {'userId': 'u1', 'fileName': 'cv.pdf',
+                                                             'contentType': 'image/png', 'fileSize': 10})
+        self.assertEqual(status, 400)
+        self.assertIn('content type', body['error'])
+
+    def test_legacy_upload_decodes_base64(self):
+        """Test the legacy endpoint stores decoded bytes, not the base64 text"""
+        content = base64.b64encode(b'%PDF-1.4 resume').decode('ascii')
+        status, _ = self.call('/api/resume/upload', {'userId': 'u1', 'fileName': 'cv.pdf', 'fileContent': content})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(self.s3.put_object.call_args.kwargs['Body'], b'%PDF-1.4 resume')
+
+        status, _ = self.call('/api/resume/upload', {'userId': 'u1', 'fileName': 'cv.pdf', 'fileContent': '***'})
+        self.assertEqual(status, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Test Suite for the Request Router
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+import index
+from router import Router
+
+
+def handler_a(*args):
+    return 'a'
+
+
+def handler_b(*args):
+    return 'b'
+
+
+class TestRouter(unittest.TestCase):
+    """Test cases for route compilation and resolution"""
+
+    def setUp(self):
+        self.router = Router([
+            ('GET', '/api/jobs', handler_a),
+            ('POST', '/api/jobs/score', handler_b),
+            ('GET', '/api/users/{userId}', handler_a),
+            ('PUT', '/api/users/{userId}', handler_b),
+            ('GET', '/api/users/{userId}/applications', handler_b),
+            ('PUT', '/api/applications/{applicationId}', handler_a),
+        ])
+
+    def test_static_route(self):
+        """Test static paths resolve, ignoring trailing slash and query string"""
+        match = self.router.resolve('POST', '/api/jobs/score/?debug=1')
+        self.assertEqual(match.status, 200)
+        self.assertIs(match.handler, handler_b)
+        self.assertEqual(match.pattern, '/api/jobs/score')
+
+    def test_path_parameters(self):
+        """Test path parameters are extracted by name"""
+        match = self.router.resolve('GET', '/api/users/user-123')
+        self.assertEqual(match.params, {'userId': 'user-123'})
+        self.assertEqual(match.pattern, '/api/users/{userId}')
+
+        match = self.router.resolve('PUT', '/api/applications/app_1')
+        self.assertEqual(match.params, {'applicationId': 'app_1'})
+
+        match = self.router.resolve('GET', '/api/users/user-123/applications')
+        self.assertIs(match.handler, handler_b)
+
+    def test_405_versus_404(self):
+        """Test known paths with the wrong method return 405 with allowed methods"""
+        match = self.router.resolve('DELETE', '/api/users/user-123')
+        self.assertEqual(match.status, 405)
+        self.assertEqual(match.allowed_methods, ('GET', 'PUT'))
+
+        self.assertEqual(self.router.resolve('GET', '/api/jobs/score').status, 405)
+        self.assertEqual(self.router.resolve('GET', '/api/nope').status, 404)
+        # Substring look-alikes no longer match
+        self.assertEqual(self.router.resolve('POST', '/api/jobs/scores').status, 404)
+        self.assertEqual(self.router.resolve('GET', '/api/users').status, 404)
+
+    def test_duplicate_route_rejected(self):
+        """Test registering the same method and pattern twice fails"""
+        with self.assertRaises(ValueError):
+            self.router.add('GET', '/api/jobs', handler_b)
+        with self.assertRaises(ValueError):
+            self.router.add('GET', '/api/users/{id}/x', handler_b)
+
+
+class TestQueryParameters(unittest.TestCase):
+    """Test cases for query string handling in lambda_handler"""
+
+    @patch('bedrock_integration.get_skill_demand_forecast')
+    def test_comma_separated_skills_become_a_list(self, mock_forecast):
+        """Test GET ?skills=python,aws reaches the handler as a list, not a string"""
+        mock_forecast.return_value = {'demand': []}
+        response = index.lambda_handler({'httpMethod': 'GET', 'path': '/api/market-intelligence/skill-demand',
+                                         'queryStringParameters': {'skills': 'python, aws'}}, None)
+
+        self.assertEqual(response['statusCode'], 200)
+        mock_forecast.assert_called_once_with(['python', 'aws'])
+
+    def test_query_parameters_never_reach_writes(self):
+        """Test POST and PUT payloads are the JSON body only, not the query string"""
+        with patch.object(index, 'dynamodb') as dynamodb:
+            index.lambda_handler({'httpMethod': 'POST', 'path': '/api/users',
+                                  'queryStringParameters': {'isAdmin': '1', 'foo': 'bar'},
+                                  'body': json.dumps({'userId': 'u1', 'name': 'Jane'})}, None)
+            index.lambda_handler({'httpMethod': 'PUT', 'path': '/api/users/u1',
+                                  'queryStringParameters': {'isAdmin': '1'},
+                                  'body': json.dumps({'name': 'Jane'})}, None)
+
+        table = dynamodb.Table.return_value
+        self.assertEqual(set(table.put_item.call_args.kwargs['Item']), {'userId', 'name', 'updatedAt'})
+        self.assertEqual(table.update_item.call_args.kwargs['UpdateExpression'], 'SET name = :name')
+
+    def test_repeated_keys_and_scalars(self):
+        """Test repeated list keys are combined and other parameters are left as strings"""
+        params = index.query_parameters({
+            'queryStringParameters': {'skills': 'sql', 'role': 'Data Engineer, Senior'},
+            'multiValueQueryStringParameters': {'skills': ['python,aws', 'sql'], 'role': ['Data Engineer, Senior']}
+        })
+        self.assertEqual(params, {'skills': ['python', 'aws', 'sql'], 'role': 'Data Engineer, Senior'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Test Suite for Single-Flight Coalescing of AI Requests
+"""
+
+import unittest
+import sys
+import os
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+from singleflight import SingleFlight, canonical_key, coalesced, singleflight
+from response_cache import response_cache
+import async_bedrock
+import bedrock_integration
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for thread and asyncio coalescing"""
+
+    def test_canonical_key_folds_case_and_whitespace(self):
+        """Test equivalent arguments share a key and list order is kept"""
+        self.assertEqual(canonical_key('fn', 'Data  Engineer', 'Seattle '),
+                         canonical_key('fn', 'data engineer', 'seattle'))
+        self.assertNotEqual(canonical_key('fn', ['python', 'sql']), canonical_key('fn', ['sql', 'python']))
+
+    def test_keyword_arguments_are_keyed_and_passed(self):
+        """Test kwargs reach the function and distinguish keys regardless of their order"""
+        self.assertEqual(canonical_key('fn', 'a', x=1, y='Remote'), canonical_key('fn', 'a', y='remote', x=1))
+        self.assertNotEqual(canonical_key('fn', 'a', x=1), canonical_key('fn', 'a', x=2))
+        self.assertNotEqual(canonical_key('fn', 'a', x=1), canonical_key('fn', 'a'))
+
+        @coalesced('kwargs_test')
+        def echo(role, location=None):
+            return {'role': role, 'location': location}
+
+        self.assertEqual(echo('Data Engineer', location='Seattle'), {'role': 'Data Engineer', 'location': 'Seattle'})
+        self.assertEqual(echo.key_for('x', location='y'), canonical_key('kwargs_test', 'x', location='y'))
+
+    def test_concurrent_threads_share_one_call(self):
+        """Test threads calling with the same key while in flight run func once"""
+        flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def work():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return {'value': 1}
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            leader = pool.submit(flight.do, 'k', work, 'fn')
+            started.wait()
+            followers = [pool.submit(flight.do, 'k', work, 'fn') for _ in range(4)]
+            results = [leader.result()] + [f.result() for f in followers]
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == {'value': 1} for result in results))
+        self.assertIsNot(results[0], results[1])
+        self.assertEqual(flight.stats()['fn'], {'calls': 5, 'executions': 1, 'collapsed': 4, 'collapseRate': 0.8})
+
+    def test_errors_are_shared(self):
+        """Test followers receive the leader's exception"""
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.1)
+            raise ValueError('boom')
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flight.do, 'k', fail)
+            started.wait()
+            follower = pool.submit(flight.do, 'k', fail)
+            with self.assertRaises(ValueError):
+                leader.result()
+            with self.assertRaises(ValueError):
+                follower.result()
+
+    def test_async_tasks_share_one_call(self):
+        """Test tasks on one event loop awaiting the same key share the coroutine"""
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return ['a']
+
+        async def main():
+            return await asyncio.gather(*(flight.do_async('k', work, 'fn') for _ in range(3)))
+
+        results = asyncio.run(main())
+        self.assertEqual(results, [['a'], ['a'], ['a']])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.stats()['fn']['collapsed'], 2)
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_async_market_calls_are_coalesced(self, mock_bedrock):
+        """Test duplicate market insight calls in one gather make one Bedrock request"""
+        def respond(**kwargs):
+            time.sleep(0.05)
+            body = MagicMock()
+            body.read.return_value = json.dumps({'content': [{'text': '{"demandLevel": "high"}'}]})
+            return {'body': body}
+
+        mock_bedrock.invoke_model.side_effect = respond
+        singleflight.reset()
+        response_cache.clear()
+
+        results = async_bedrock.gather_ai_calls(
+            first=async_bedrock.get_market_insights_async('ML Engineer', 'Austin'),
+            second=async_bedrock.get_market_insights_async('ml engineer', 'austin')
+        )
+
+        self.assertEqual(results['first'], {'demandLevel': 'high'})
+        self.assertEqual(results['second'], {'demandLevel': 'high'})
+        self.assertEqual(mock_bedrock.invoke_model.call_count, 1)
+        self.assertEqual(singleflight.stats()['get_market_insights'],
+                         {'calls': 2, 'executions': 1, 'collapsed': 1, 'collapseRate': 0.5})
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_async_call_is_counted_once(self, mock_bedrock):
+        """Test one async request is one call in the stats, not one per coalescing layer"""
+        body = MagicMock()
+        body.read.return_value = json.dumps({'content': [{'text': '{"currentAverage": 1}'}]})
+        mock_bedrock.invoke_model.return_value = {'body': body}
+        singleflight.reset()
+        response_cache.clear()
+
+        result = asyncio.run(async_bedrock.get_salary_trends_async('Designer', 'Remote'))
+
+        self.assertEqual(result, {'currentAverage': 1})
+        self.assertEqual(singleflight.stats()['get_salary_trends'],
+                         {'calls': 1, 'executions': 1, 'collapsed': 0, 'collapseRate': 0.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Test Suite for Streaming Bedrock Responses
+Tests the iterator and async-iterator streaming APIs
+"""
+
+import unittest
+import asyncio
+import json
+import sys
+import os
+from contextlib import aclosing
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+from bedrock_integration import invoke_bedrock_model_stream, stream_career_roadmap
+from async_bedrock import invoke_bedrock_model_stream_async
+
+
+class FakeEventStream:
+    """Stand-in for the botocore EventStream returned by Bedrock"""
+
+    def __init__(self, events):
+        self.events = events
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def close(self):
+        self.closed = True
+
+
+def delta_event(text):
+    payload = {'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': text}}
+    return {'chunk': {'bytes': json.dumps(payload).encode()}}
+
+
+def stream_response(*texts):
+    events = [{'chunk': {'bytes': json.dumps({'type': 'message_start'}).encode()}}]
+    events += [delta_event(text) for text in texts]
+    events.append({'chunk': {'bytes': json.dumps({'type': 'message_stop'}).encode()}})
+    return {'body': FakeEventStream(events)}
+
+
+class TestStreaming(unittest.TestCase):
+    """Test cases for streamed completions"""
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_stream_yields_text_deltas(self, mock_bedrock):
+        """Test only text deltas are yielded, in order"""
+        mock_bedrock.invoke_model_with_response_stream.return_value = stream_response('{"time', 'line": ', '"1y"}')
+
+        chunks = list(stream_career_roadmap('Engineer', 'Senior Engineer', ['Python']))
+
+        self.assertEqual(''.join(chunks), '{"timeline": "1y"}')
+        self.assertEqual(len(chunks), 3)
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_stream_error_event_raises(self, mock_bedrock):
+        """Test modeled stream errors surface as exceptions"""
+        response = stream_response('partial')
+        response['body'].events.insert(2, {'throttlingException': {'message': 'Too many requests'}})
+        mock_bedrock.invoke_model_with_response_stream.return_value = response
+
+        with self.assertRaises(RuntimeError):
+            list(invoke_bedrock_model_stream('prompt'))
+        self.assertTrue(response['body'].closed)
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_async_stream_early_exit_closes_stream(self, mock_bedrock):
+        """Test the async iterator yields chunks and closes the stream when abandoned"""
+        response = stream_response('a', 'b', 'c', 'd')
+        mock_bedrock.invoke_model_with_response_stream.return_value = response
+
+        async def consume():
+            received = []
+            async with aclosing(invoke_bedrock_model_stream_async('prompt')) as chunks:
+                async for chunk in chunks:
+                    received.append(chunk)
+                    if len(received) == 2:
+                        break
+            return received
+
+        self.assertEqual(asyncio.run(consume()), ['a', 'b'])
+        self.assertTrue(response['body'].closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Test Suite for Adaptive Token Budgets
+"""
+
+import unittest
+import json
+import sys
+import os
+from unittest.mock import patch, MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../backend/lambda')))
+
+from token_budget import TokenBudgetTracker, JSON_END_MARKER, token_budget
+from response_cache import response_cache
+import bedrock_integration
+
+
+def mock_model_response(text, output_tokens, stop_reason='end_turn'):
+    response = {'body': MagicMock()}
+    response['body'].read.return_value = json.dumps({
+        'content': [{'text': text}],
+        'stop_reason': stop_reason,
+        'usage': {'input_tokens': 100, 'output_tokens': output_tokens}
+    }).encode()
+    return response
+
+
+class TestTokenBudgetTracker(unittest.TestCase):
+    """Test cases for budget derivation"""
+
+    def test_budget_uses_ceiling_until_enough_samples(self):
+        """Test the caller's max_tokens is used before min_samples completions"""
+        tracker = TokenBudgetTracker(min_samples=5, headroom=1.25, seeds={})
+        for _ in range(4):
+            tracker.record('get_salary_trends', 300, 'end_turn')
+        self.assertEqual(tracker.budget('get_salary_trends', 1000), 1000)
+
+        tracker.record('get_salary_trends', 320, 'end_turn')
+        self.assertEqual(tracker.budget('get_salary_trends', 1000), 400)
+
+    def test_budget_never_exceeds_ceiling_or_floor(self):
+        """Test derived budgets are clamped between the floor and the ceiling"""
+        tracker = TokenBudgetTracker(min_samples=1, headroom=2.0, seeds={})
+        tracker.record('big', 900, 'end_turn')
+        tracker.record('tiny', 2, 'end_turn')
+
+        self.assertEqual(tracker.budget('big', 1000), 1000)
+        self.assertEqual(tracker.budget('tiny', 50), 50)
+        self.assertEqual(tracker.budget('tiny', 1000), 64)
+
+    def test_report_counts_truncation(self):
+        """Test truncated completions are reported per function"""
+        tracker = TokenBudgetTracker(min_samples=1, seeds={})
+        tracker.record('analyze_resume', 3000, 'max_tokens')
+        tracker.record('analyze_resume', 1200, 'end_turn')
+
+        report = tracker.report()['analyze_resume']
+        self.assertEqual(report['requests'], 2)
+        self.assertEqual(report['truncated'], 1)
+        self.assertEqual(report['truncationRate'], 0.5)
+        self.assertEqual(report['max'], 3000)
+
+
+class TestBudgetedInvocation(unittest.TestCase):
+    """Test budgets and stop sequences are applied to model requests"""
+
+    def setUp(self):
+        response_cache.clear()
+        token_budget.reset()
+
+    def tearDown(self):
+        token_budget.reset()
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_stop_sequence_and_budget_applied(self, mock_bedrock):
+        """Test learned budgets and the JSON stop sequence reach the request body"""
+        for _ in range(token_budget.min_samples):
+            token_budget.record('analyze_email_for_interview', 100, 'end_turn')
+        mock_bedrock.invoke_model.return_value = mock_model_response('{"isInterview": false}', 12)
+
+        bedrock_integration.analyze_email_for_interview('Your order has shipped', prefilter=False)
+
+        request = json.loads(mock_bedrock.invoke_model.call_args.kwargs['body'])
+        self.assertEqual(request['stop_sequences'], [JSON_END_MARKER])
+        self.assertEqual(request['max_tokens'], 125)
+        self.assertIn(JSON_END_MARKER, request['messages'][0]['content'])
+
+    @patch('bedrock_integration.bedrock_runtime')
+    def test_truncation_at_budget_retries_at_ceiling(self, mock_bedrock):
+        """Test a completion cut off by the adaptive budget is retried once at max_tokens"""
+        for _ in range(token_budget.min_samples):
+            token_budget.record('analyze_email_for_interview', 100, 'end_turn')
+        mock_bedrock.invoke_model.side_effect = [
+            mock_model_response('{"isInterview": tr', 125, 'max_tokens'),
+            mock_model_response('{"isInterview": true, "confidence": 90}', 140)
+        ]
+
+        result = bedrock_integration.analyze_email_for_interview('Interview invitation for Tuesday')
+
+        self.assertTrue(result['isInterview'])
+        retry_request = json.loads(mock_bedrock.invoke_model.call_args.kwargs['body'])
+        self.assertEqual(retry_request['max_tokens'], 1000)
+        self.assertEqual(token_budget.report()['analyze_email_for_interview']['budgetRetries'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()